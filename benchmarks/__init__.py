@@ -0,0 +1 @@
+"""Benchmarks for the mlpy package"""
@@ -0,0 +1,120 @@
+"""Compare node expansions per second of search algorithms using the
+lock-free frontiers against the thread-synchronized ``queue`` classes
+
+Run with ``python -m benchmarks.frontiers``
+"""
+
+from queue import Queue, PriorityQueue
+from time import perf_counter
+from typing import Any
+
+import numpy as np
+
+from mlpy.search import Grid, BreadthFirst, AStar
+from mlpy.search.frontiers import FifoFrontier, PriorityFrontier
+
+
+# ----------------------------------------------------------- Legacy Frontiers
+class LegacyFifoFrontier:
+    """Frontier interface around the synchronized ``queue.Queue``"""
+
+    def __init__(self) -> None:
+        self._queue = Queue()
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+    def put(self, node: Any) -> None:
+        """Add a node to the frontier"""
+        self._queue.put(node)
+
+    def get(self) -> Any:
+        """Remove and return the oldest node"""
+        return self._queue.get()
+
+    def empty(self) -> bool:
+        """Return whether the frontier is empty"""
+        return self._queue.empty()
+
+
+class LegacyPriorityFrontier:
+    """Frontier interface around the synchronized ``queue.PriorityQueue``"""
+
+    def __init__(self) -> None:
+        self._queue = PriorityQueue()
+        self._tiebreak = 0
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+    def put(self, node: Any, priority: float) -> None:
+        """Add a node with the given priority to the frontier"""
+        self._tiebreak += 1
+        self._queue.put((priority, self._tiebreak, node))
+
+    def get(self) -> Any:
+        """Remove and return the node with the lowest priority"""
+        return self._queue.get()[2]
+
+    def empty(self) -> bool:
+        """Return whether the frontier is empty"""
+        return self._queue.empty()
+
+
+def counting(frontier_type: type) -> type:
+    """Return a subclass of a frontier counting its ``get`` calls"""
+
+    class Counting(frontier_type):
+        """Frontier counting the number of expanded nodes"""
+        expansions = 0
+
+        def get(self) -> Any:
+            Counting.expansions += 1
+            return super().get()
+
+    return Counting
+
+
+# ------------------------------------------------------------------ Benchmark
+def benchmark(search, frontier_type, start, end, repeats=5) -> float:
+    """Return node expansions per second of a search using a frontier type"""
+
+    counter = counting(frontier_type)
+    search.queue_type = counter
+    search.find(start, end, max_iters=search.structure.blocked.size)
+    expansions = counter.expansions
+
+    search.queue_type = frontier_type
+    best = float('inf')
+    for _ in range(repeats):
+        tic = perf_counter()
+        search.find(start, end, max_iters=search.structure.blocked.size)
+        best = min(best, perf_counter() - tic)
+
+    return expansions / best
+
+
+def main(size: int=300, seed: int=0) -> None:
+    """Run all frontier benchmarks on a random compact grid"""
+
+    blocked = np.random.default_rng(seed).random((size, size)) < 0.2
+    blocked[0, 0] = blocked[-1, -1] = False
+    grid = Grid((size, size), diagonal=True, blocked=blocked, compact=True)
+    start, end = grid[0, 0], grid[size - 1, size - 1]
+
+    cases = [
+        ('BreadthFirst', BreadthFirst, LegacyFifoFrontier, FifoFrontier),
+        ('AStar', AStar, LegacyPriorityFrontier, PriorityFrontier)
+    ]
+
+    print(f"{'algorithm':<14}{'queue [exp/s]':>16}{'frontier [exp/s]':>19}"
+          f"{'speedup':>10}")
+    for name, algorithm, legacy, frontier in cases:
+        search = algorithm(structure=grid)
+        old = benchmark(search, legacy, start, end)
+        new = benchmark(search, frontier, start, end)
+        print(f"{name:<14}{old:>16,.0f}{new:>19,.0f}{new / old:>9.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+"""Seeded problem generators for search benchmarks
+
+Every generator returns a structure with a start and a goal node, and the
+same seed always yields the same problem
+"""
+
+from typing import List
+
+import numpy as np
+
+from mlpy.types import Node
+from mlpy.search import Graph, Tree, Grid, heuristic_field
+
+
+# movement between maze cells: up, right, down, left
+DIRECTIONS = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+
+
+# ---------------------------------------------------------------------- Grids
+def maze(size: int, seed: int=0) -> tuple[Grid, int, int]:
+    """Perfect maze carved by a randomized depth first search, corridors are
+    one cell wide and every free cell is reachable on exactly one path
+
+    Args:
+        ``size``: Side length of the compact grid (rounded down to odd)
+
+        ``seed``: Seed of the random number generator
+
+    Returns:
+        tuple: grid with a heuristic field towards the goal, start index in
+            the upper left and goal index in the lower right corner
+    """
+
+    rng = np.random.default_rng(seed)
+    cells = max(1, (size - 1) // 2)
+    side = 2 * cells + 1
+    blocked = np.ones((side, side), dtype=bool)
+
+    # carve from cell to unvisited neighbor cell, backtracking at dead ends
+    visited = np.zeros((cells, cells), dtype=bool)
+    visited[0, 0] = True
+    blocked[1, 1] = False
+    stack = [(0, 0)]
+    while stack:
+        row, col = stack[-1]
+        options = [(row + dr, col + dc) for dr, dc in DIRECTIONS
+                   if 0 <= row + dr < cells and 0 <= col + dc < cells
+                   and not visited[row + dr, col + dc]]
+        if not options:
+            stack.pop()
+            continue
+
+        nxt = options[rng.integers(len(options))]
+        visited[nxt] = True
+        blocked[row + nxt[0] + 1, col + nxt[1] + 1] = False
+        blocked[2 * nxt[0] + 1, 2 * nxt[1] + 1] = False
+        stack.append(nxt)
+
+    return _grid(blocked, (1, 1), (side - 2, side - 2))
+
+
+def obstacles(size: int,
+    seed: int=0,
+    density: float=0.25
+) -> tuple[Grid, int, int]:
+    """Grid of randomly blocked cells, start and goal may be disconnected
+
+    Args:
+        ``size``: Side length of the compact grid
+
+        ``seed``: Seed of the random number generator
+
+        ``density``: Probability of a cell being blocked (default: 0.25)
+
+    Returns:
+        tuple: grid with a heuristic field towards the goal, start index in
+            the upper left and goal index in the lower right corner
+    """
+
+    blocked = np.random.default_rng(seed).random((size, size)) < density
+
+    return _grid(blocked, (0, 0), (size - 1, size - 1))
+
+
+def _grid(blocked: np.ndarray,
+    start: tuple[int, int],
+    end: tuple[int, int]
+) -> tuple[Grid, int, int]:
+    """Compact grid of a mask with free start and goal cells"""
+
+    blocked[start] = blocked[end] = False
+    grid = Grid(blocked.shape, blocked=blocked, compact=True)
+    grid.set_array('heuristic', heuristic_field(grid, end))
+
+    return grid, grid[start], grid[end]
+
+
+# ---------------------------------------------------------------------- Graph
+def random_graph(size: int,
+    seed: int=0,
+    degree: float=4.0
+) -> tuple[Graph, Node, Node]:
+    """Random undirected graph of a spanning tree and additional random
+    edges, so all nodes are connected
+
+    Args:
+        ``size``: Number of nodes
+
+        ``seed``: Seed of the random number generator
+
+        ``degree``: Average number of neighbors of a node (default: 4)
+
+    Returns:
+        tuple: graph, first node as start and last node as goal
+    """
+
+    rng = np.random.default_rng(seed)
+    nodes = _nodes(size)
+
+    # every node connects to an earlier one, the rest are random pairs
+    parents = (rng.random(size - 1) * np.arange(1, size)).astype(np.int64)
+    pairs = list(zip(parents.tolist(), range(1, size)))
+    extra = max(0, int(size * degree / 2) - len(pairs))
+    pairs += rng.integers(size, size=(extra, 2)).tolist()
+
+    edges = [(nodes[a], nodes[b]) for a, b in pairs if a != b]
+    for a, b in edges:
+        a.neighbors.append(b)
+        b.neighbors.append(a)
+
+    return Graph(nodes, edges, directed=False), nodes[0], nodes[-1]
+
+
+# ----------------------------------------------------------------------- Tree
+def deep_tree(size: int,
+    seed: int=0,
+    window: int=4
+) -> tuple[Tree, Node, Node]:
+    """Random tree growing mostly in depth, every node is attached to one of
+    the most recently added nodes
+
+    Args:
+        ``size``: Number of nodes
+
+        ``seed``: Seed of the random number generator
+
+        ``window``: Number of most recent nodes a new node may attach to,
+            smaller windows grow deeper trees (default: 4)
+
+    Returns:
+        tuple: tree, its root as start and its deepest node as goal
+    """
+
+    rng = np.random.default_rng(seed)
+    nodes = _nodes(size)
+    offsets = rng.integers(1, window + 1, size=size).tolist()
+
+    deepest = nodes[0]
+    for i in range(1, size):
+        parent = nodes[max(0, i - offsets[i])]
+        nodes[i].depth = parent.depth + 1
+        parent.neighbors.append(nodes[i])
+        if nodes[i].depth > deepest.depth:
+            deepest = nodes[i]
+
+    return Tree(nodes[0]), nodes[0], deepest
+
+
+def _nodes(size: int) -> List[Node]:
+    """New nodes without heuristic information"""
+
+    nodes = [Node() for _ in range(size)]
+    for node in nodes:
+        node.heuristic = 0
+
+    return nodes
+
+
+GENERATORS = {
+    'maze': maze,
+    'obstacles': obstacles,
+    'graph': random_graph,
+    'tree': deep_tree
+}
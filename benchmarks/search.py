@@ -0,0 +1,202 @@
+"""Compare wall time, node expansions and peak memory of the uninformed and
+informed search algorithms on seeded mazes, obstacle grids, random graphs
+and deep trees of several sizes
+
+Run with ``python -m benchmarks.search [--output results.json]``, the
+results of two runs (e.g. two releases) can be compared record by record
+"""
+
+import json
+import platform
+import tracemalloc
+from argparse import ArgumentParser
+from time import perf_counter
+from typing import Dict, List
+
+import numpy as np
+
+import mlpy
+from mlpy.search import BreadthFirst, UniformCost, GreedyBestFirst, \
+    DepthFirst, IterativeDeepening, AStar
+from benchmarks.generators import GENERATORS
+
+
+ALGORITHMS = {
+    'BreadthFirst': BreadthFirst,
+    'UniformCost': UniformCost,
+    'GreedyBestFirst': GreedyBestFirst,
+    'DepthFirst': DepthFirst,
+    'IterativeDeepening': IterativeDeepening,
+    'AStar': AStar
+}
+
+# side lengths of grids and numbers of nodes of graphs and trees
+SIZES = {
+    'maze': [33, 129, 257],
+    'obstacles': [32, 128, 256],
+    'graph': [1000, 10000, 50000],
+    'tree': [1000, 10000, 50000]
+}
+
+
+# ------------------------------------------------------------------ Benchmark
+def measure(search, start, end, max_iters: int, repeats: int=3) -> Dict:
+    """Search a path several times, recording the fastest wall time and the
+    peak memory allocated by one additional traced search
+
+    Args:
+        ``search``: Search algorithm instance
+
+        ``start``: Initial node (or index)
+
+        ``end``: Goal node (or index)
+
+        ``max_iters``: Maximum number of nodes to be visited
+
+        ``repeats``: Number of timed searches (default: 3)
+
+    Returns:
+        dict: whether a path was found or the search ran out of its budget,
+            the length of the path, the statistics of the search, the
+            fastest time and the peak memory in bytes
+    """
+
+    best = float('inf')
+    for _ in range(repeats):
+        tic = perf_counter()
+        path = search.find(start, end, max_iters)
+        best = min(best, perf_counter() - tic)
+    stats = search.stats
+
+    # tracing slows allocations down, so it is not timed
+    tracemalloc.start()
+    try:
+        search.find(start, end, max_iters)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'found': bool(path),
+        'budget_limited': not path and stats['expanded'] >= max_iters,
+        'budget': max_iters,
+        'path_length': len(path),
+        'expanded': stats['expanded'],
+        'generated': stats['generated'],
+        'frontier_peak': stats['frontier_peak'],
+        'time': best,
+        'expansions_per_second': stats['expanded'] / best if best else 0.0,
+        'peak_memory': peak
+    }
+
+
+def run(structures: List[str] | None=None,
+    algorithms: List[str] | None=None,
+    sizes: Dict[str, List[int]] | None=None,
+    seed: int=0,
+    repeats: int=3,
+    max_iters: int | None=None
+) -> List[Dict]:
+    """Benchmark search algorithms on generated problems
+
+    Args:
+        ``structures``: Names of problem generators (default: all of
+            ``GENERATORS``)
+
+        ``algorithms``: Names of search algorithms (default: all of
+            ``ALGORITHMS``)
+
+        ``sizes``: Problem sizes per generator (default: ``SIZES``)
+
+        ``seed``: Seed of all problem generators (default: 0)
+
+        ``repeats``: Number of timed searches per problem (default: 3)
+
+        ``max_iters``: Maximum number of visited nodes per search (default:
+            number of nodes of the problem)
+
+    Returns:
+        list: one record per structure, size and algorithm
+    """
+
+    structures = list(GENERATORS) if structures is None else structures
+    algorithms = list(ALGORITHMS) if algorithms is None else algorithms
+    sizes = SIZES if sizes is None else sizes
+
+    records = []
+    for name in structures:
+        for size in sizes[name]:
+            structure, start, end = GENERATORS[name](size, seed)
+            nodes = _count(structure)
+            grid = structure if name in ('maze', 'obstacles') else None
+
+            for algorithm in algorithms:
+                search = ALGORITHMS[algorithm](structure=grid)
+                result = measure(search, start, end,
+                                 nodes if max_iters is None else max_iters,
+                                 repeats)
+                records.append({'structure': name, 'size': size,
+                                'nodes': nodes, 'seed': seed,
+                                'algorithm': algorithm, **result})
+
+    return records
+
+
+def environment() -> Dict[str, str]:
+    """Versions of the interpreter and packages the benchmark ran with"""
+
+    return {
+        'mlpy': mlpy.__version__,
+        'numpy': np.__version__,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'system': platform.system()
+    }
+
+
+def _count(structure) -> int:
+    """Number of nodes of a grid, graph or tree"""
+
+    if hasattr(structure, 'blocked'):
+        return int(structure.blocked.size)
+    if hasattr(structure, 'nodes'):
+        return len(structure.nodes)
+
+    return sum(1 for _ in structure.level_order())
+
+
+def main() -> None:
+    """Run the benchmarks, print a table and optionally write all records
+    with the environment as JSON
+    """
+
+    parser = ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--output', help="JSON file to write results to")
+    parser.add_argument('--structures', nargs='+', choices=list(GENERATORS))
+    parser.add_argument('--algorithms', nargs='+', choices=list(ALGORITHMS))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--max-iters', type=int)
+    args = parser.parse_args()
+
+    records = run(args.structures, args.algorithms, seed=args.seed,
+                  repeats=args.repeats, max_iters=args.max_iters)
+
+    # searches stopped by their budget are marked instead of not found
+    print(f"{'structure':<10}{'size':>7}{'algorithm':>20}{'found':>7}"
+          f"{'expanded':>10}{'time [ms]':>11}{'exp/s':>12}{'peak [kB]':>11}")
+    for r in records:
+        found = 'budget' if r['budget_limited'] else str(r['found'])
+        print(f"{r['structure']:<10}{r['size']:>7}{r['algorithm']:>20}"
+              f"{found:>7}{r['expanded']:>10}"
+              f"{r['time'] * 1000:>11.2f}{r['expansions_per_second']:>12,.0f}"
+              f"{r['peak_memory'] / 1024:>11.1f}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump({'environment': environment(), 'seed': args.seed,
+                       'results': records}, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,15 @@
 """TODO"""
 
-from .nodes import Graph, Tree, Grid
+from .nodes import Graph, Tree, Grid, ImplicitGraph
+from .frontiers import FifoFrontier, LifoFrontier, PriorityFrontier
 from .pathfinding import BreadthFirst, UniformCost, GreedyBestFirst, \
-    DepthFirst, IterativeDeepening, AStar
+    DepthFirst, IterativeDeepening, IDAStar, AStar, AnytimeAStar, SMAStar, \
+    JumpPoint, DStarLite
+from .batch import find_many
+from .service import SearchService, find_async
+from .cache import PathCache
+from .hierarchical import HierarchicalAStar
+from .heuristics import heuristic_field, Landmarks
+from .fields import FlowField
+from .animation import animate, show_search
+from .contraction import ContractionHierarchy
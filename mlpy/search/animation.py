@@ -0,0 +1,120 @@
+"""Animated visualization of node expansions of search algorithms"""
+
+from typing import List
+
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.animation import FuncAnimation
+
+from mlpy.types import Node, Search
+from mlpy.search.nodes import Grid, COLORS
+
+
+def animate(search: Search,
+    start: Node | int,
+    end: Node | int,
+    max_iters: int=10000,
+    grid: Grid | None=None,
+    frames: int=200,
+    interval: int=20
+) -> tuple[List[Node | int], FuncAnimation]:
+    """Search a path in a grid and animate the expanded nodes in order,
+    only redrawing the grid image on each frame (blitting)
+
+    The search runs completely before the animation, which then colors
+    several expansions per frame, so large searches stay interactive.
+
+    Args:
+        ``search``: Search algorithm to find the path with
+
+        ``start``: Initial node (or index) to start the search from
+
+        ``end``: Goal node (or index) to be searched for
+
+        ``max_iters``: Maximum number of nodes to be visited (default:
+            10000)
+
+        ``grid``: Grid the nodes belong to (default: the structure of the
+            search)
+
+        ``frames``: Maximum number of frames to show the expansions in
+            (default: 200)
+
+        ``interval``: Delay between frames in milliseconds (default: 20)
+
+    Returns:
+        tuple: found path (or an empty list) and the animation ending with it
+    """
+
+    grid = search.structure if grid is None else grid
+    if not isinstance(grid, Grid):
+        raise TypeError("Animations require a grid, pass it as 'grid'")
+
+    # record expansions without slowing down the search itself
+    expanded: List[Node | int] = []
+    callback = search.callback
+    search.callback = lambda _, node: expanded.append(node)
+    try:
+        path = search.find(start, end, max_iters)
+    finally:
+        search.callback = callback
+
+    order = np.array([grid.index(node) for node in expanded], dtype=np.int64)
+    steps = max(1, -(-len(order) // frames))
+    chunks = -(-len(order) // steps)
+
+    base = grid.raster()
+    final = grid.raster(path)
+    shown = base.copy()
+    free = base.ravel() == list(COLORS).index('')
+    color = list(COLORS).index('expanded')
+
+    fig, ax = plt.subplots()
+    image = grid.draw(ax, shown)
+
+    def update(frame: int) -> tuple:
+        if frame < chunks:
+            cells = order[frame * steps:(frame + 1) * steps]
+            shown.flat[cells[free[cells]]] = color
+        else:
+            np.copyto(shown, final, where=final != base)
+        image.set_data(shown)
+        return (image,)
+
+    animation = FuncAnimation(fig, update, frames=chunks + 1,
+                              interval=interval, blit=True, repeat=False)
+
+    return path, animation
+
+
+def show_search(search: Search,
+    start: Node | int,
+    end: Node | int,
+    max_iters: int=10000,
+    grid: Grid | None=None
+) -> List[Node | int]:
+    """Search a path in a grid and show the animated node expansions
+
+    Args:
+        ``search``: Search algorithm to find the path with
+
+        ``start``: Initial node (or index) to start the search from
+
+        ``end``: Goal node (or index) to be searched for
+
+        ``max_iters``: Maximum number of nodes to be visited (default:
+            10000)
+
+        ``grid``: Grid the nodes belong to (default: the structure of the
+            search)
+
+    Returns:
+        list: path to goal node or an empty list if goal was not reached
+    """
+
+    # the animation has to be referenced until the window is closed
+    path, animation = animate(search, start, end, max_iters, grid)
+    plt.show()
+    del animation
+
+    return path
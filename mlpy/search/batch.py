@@ -0,0 +1,153 @@
+"""Batch pathfinding of many queries over a shared grid"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List
+
+import numpy as np
+
+from mlpy.types import Node, Search
+from mlpy.search.nodes import Grid
+from mlpy.search.pathfinding import AStar
+
+
+# search instance of a worker process, created once by the pool initializer
+_WORKER: Dict[str, Any] = {}
+
+
+def find_many(
+    grid: Grid,
+    pairs: List[tuple[Node | int, Node | int]],
+    algorithm: type=AStar,
+    workers: int | None=None,
+    max_iters: int=10000,
+    chunksize: int=64,
+    **kwargs
+) -> tuple[List[List[Node | int]], List[Dict]]:
+    """Find paths for many start and goal pairs on the same grid using a pool
+    of processes, the grid arrays are placed in shared memory once and read
+    by all workers instead of being pickled
+
+    Args:
+        ``grid``: Grid (node-based or compact) to search in
+
+        ``pairs``: Start and goal nodes (or indices) of all queries
+
+        ``algorithm``: Search algorithm class (default: AStar)
+
+        ``workers``: Number of processes, a single worker searches in this
+            process (default: number of cpus)
+
+        ``max_iters``: Maximum number of nodes to be visited per query
+            (default: 10000)
+
+        ``chunksize``: Number of queries sent to a worker at once
+
+        ``kwargs``: Additional arguments of the search algorithm
+
+    Returns:
+        tuple: paths in the order of the queries and the statistics (path
+            length and search statistics, see ``Search.stats``) of each query
+    """
+
+    workers = workers or os.cpu_count()
+    queries = [(grid.index(start), grid.index(end)) for start, end in pairs]
+    arrays = _grid_arrays(grid)
+
+    if workers == 1:
+        compact = Grid.from_arrays(diagonal=grid.diagonal, **arrays)
+        search = algorithm(structure=compact, **kwargs)
+        results = [_solve(query, max_iters, search) for query in queries]
+
+    else:
+        blocks, spec = _share(arrays)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(spec, grid.diagonal, algorithm, kwargs)
+            ) as pool:
+                results = list(pool.map(
+                    _solve, queries, repeat(max_iters), chunksize=chunksize
+                ))
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    paths = [[grid.cell(i) for i in path] for path, _ in results]
+    stats = [query_stats for _, query_stats in results]
+
+    return paths, stats
+
+
+def _grid_arrays(grid: Grid) -> Dict[str, np.ndarray]:
+    """Collect all arrays describing a grid, gathering cell values from the
+    nodes of node-based grids
+    """
+
+    arrays = {
+        'blocked': grid.blocked,
+        'indptr': grid.indptr,
+        'indices': grid.indices,
+        'cost': grid.as_array('cost'),
+        'heuristic': grid.as_array('heuristic')
+    }
+    if grid.weights is not None:
+        arrays['weights'] = grid.weights
+
+    return arrays
+
+
+def _share(arrays: Dict[str, np.ndarray]) -> tuple[List, Dict]:
+    """Copy arrays into shared memory blocks and return the blocks along with
+    the information needed to attach to them
+    """
+
+    blocks, spec = [], {}
+    for name, array in arrays.items():
+        block = SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, array.dtype, block.buf)[...] = array
+        blocks.append(block)
+        spec[name] = (block.name, array.shape, array.dtype.str)
+
+    return blocks, spec
+
+
+def _init_worker(
+    spec: Dict,
+    diagonal: bool,
+    algorithm: type,
+    kwargs: Dict
+) -> None:
+    """Attach to the shared grid and create the search instance of this
+    process
+    """
+
+    arrays = {}
+    for name, (block_name, shape, dtype) in spec.items():
+        block = SharedMemory(name=block_name)
+        _WORKER.setdefault('blocks', []).append(block)
+        arrays[name] = np.ndarray(shape, dtype, block.buf)
+        arrays[name].flags.writeable = False
+
+    grid = Grid.from_arrays(diagonal=diagonal, **arrays)
+    _WORKER['search'] = algorithm(structure=grid, **kwargs)
+
+
+def _solve(
+    query: tuple[int, int],
+    max_iters: int,
+    search: Search | None=None
+) -> tuple[List[int], Dict]:
+    """Answer a single query with the given search or the search instance of
+    this process
+    """
+
+    search = search or _WORKER['search']
+    start, end = query
+    path = search.find(start, end, max_iters)
+
+    return path, {'length': len(path), **search.stats}
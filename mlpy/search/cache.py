@@ -0,0 +1,102 @@
+"""Least recently used cache of search results"""
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, List
+
+from mlpy.types import Node, Search
+
+
+# ----------------------------------------------------------------- Path Cache
+class PathCache:
+    """Bounded least recently used cache of paths found in a structure"""
+
+    def __init__(self, structure: Any, maxsize: int=1024) -> None:
+        """Cache paths found by search algorithms in a grid or graph, cached
+        paths are dropped as soon as the version of the structure changes,
+        e.g. when cells are blocked or edges are added
+
+        Args:
+            ``structure``: Grid or graph with a ``version`` counter
+
+            ``maxsize``: Maximum number of cached paths (default: 1024)
+        """
+
+        self.structure = structure
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._paths: OrderedDict = OrderedDict()
+        self._version = structure.version
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Return hits, misses and current size of this cache"""
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._paths),
+            'maxsize': self.maxsize
+        }
+
+    def find(self,
+        search: Search,
+        start: Node | int,
+        end: Node | int,
+        max_iters: int=10000
+    ) -> List[Node | int]:
+        """Return the cached path from start to goal node found by the class
+        of the given search, or use the search to find and cache it
+
+        Only found paths are cached, as an empty result may be caused by the
+        maximum number of iterations. The cache may be shared by threads.
+
+        Args:
+            ``search``: Search algorithm used on a cache miss
+
+            ``start``: Initial node (or index) to start the search from
+
+            ``end``: Goal node (or index) to be searched for
+
+            ``max_iters``: Maximum number of nodes to be visited on a cache
+                miss (default: 10000)
+
+        Returns:
+            list: path to goal node or an empty list if goal was not reached
+        """
+
+        with self._lock:
+            # invalidate all paths when the structure changed
+            if self._version != self.structure.version:
+                self._paths.clear()
+                self._version = self.structure.version
+
+            key = (self._version, start, end, type(search))
+            if key in self._paths:
+                self.hits += 1
+                self._paths.move_to_end(key)
+                return list(self._paths[key])
+
+            self.misses += 1
+
+        # search without holding the lock
+        path = search.find(start, end, max_iters)
+
+        if path:
+            with self._lock:
+                self._paths[key] = list(path)
+                if len(self._paths) > self.maxsize:
+                    self._paths.popitem(last=False)
+
+        return path
+
+    def clear(self) -> None:
+        """Remove all cached paths"""
+
+        with self._lock:
+            self._paths.clear()
@@ -0,0 +1,371 @@
+"""Contraction hierarchies for repeated queries on static graphs"""
+
+from heapq import heappush, heappop
+from typing import Dict, List
+
+import numpy as np
+
+from mlpy.types import Node, Search, instrumented, MAX_FLOAT
+from mlpy.search.frontiers import PriorityFrontier
+from mlpy.search.animation import show_search
+
+
+# ----------------------------------------------------- Contraction Hierarchy
+class ContractionHierarchy(Search):
+    """Contraction Hierarchy (CH) Algorithm"""
+
+    def __init__(self, structure, witness_limit: int=64) -> None:
+        """Instance of the contraction hierarchy algorithm for static graphs,
+        contracting all nodes one after another in order of importance and
+        adding shortcut edges that preserve the path costs between the
+        remaining nodes
+
+        Queries search upwards in this order from both the start and the goal
+        node, only expanding a small fraction of the graph, and unpack the
+        shortcuts of the cheapest path found. Edges cost their weight (or the
+        cost of the node they lead to), the graph must not change after
+        preprocessing.
+
+        Args:
+            ``structure``: Graph to search in
+
+            ``witness_limit``: Maximum number of nodes settled when looking
+                for a path avoiding a contracted node, lower limits speed up
+                preprocessing at the cost of unnecessary shortcuts
+        """
+
+        super().__init__(queue_type=PriorityFrontier, structure=structure)
+        self.witness_limit = witness_limit
+        self.version = structure.version
+
+        size = len(structure.nodes)
+        indptr, indices = structure.indptr.tolist(), structure.indices.tolist()
+        if structure.weights is None:
+            cost = [float(node.cost) for node in structure.nodes]
+            weights = [cost[child] for child in indices]
+        else:
+            weights = structure.weights.tolist()
+
+        # remaining edges with their weight and contracted middle node,
+        # keeping the cheapest of parallel edges
+        out_edges: List[Dict[int, tuple[float, int]]] = \
+            [{} for _ in range(size)]
+        in_edges: List[Dict[int, tuple[float, int]]] = \
+            [{} for _ in range(size)]
+        for node in range(size):
+            for i in range(indptr[node], indptr[node + 1]):
+                child, weight = indices[i], weights[i]
+                if child != node \
+                    and weight < out_edges[node].get(child, (MAX_FLOAT,))[0]:
+                    out_edges[node][child] = (weight, -1)
+                    in_edges[child][node] = (weight, -1)
+
+        self.rank = np.zeros(size, dtype=np.int64)
+        upward: List[List[tuple[int, float, int]]] = [[] for _ in range(size)]
+        downward: List[List[tuple[int, float, int]]] = \
+            [[] for _ in range(size)]
+        contracted = [0] * size
+
+        queue = [(self._priority(node, out_edges, in_edges, contracted)[0],
+                  node) for node in range(size)]
+        queue.sort()
+
+        for rank in range(size):
+            # lazily update the priority of the least important node
+            while True:
+                _, node = heappop(queue)
+                priority, shortcuts = self._priority(node, out_edges,
+                                                     in_edges, contracted)
+                if not queue or priority <= queue[0][0]:
+                    break
+                heappush(queue, (priority, node))
+
+            self.rank[node] = rank
+            for parent, (weight, via) in in_edges[node].items():
+                downward[node].append((parent, weight, via))
+            for child, (weight, via) in out_edges[node].items():
+                upward[node].append((child, weight, via))
+
+            for source, target, weight in shortcuts:
+                out_edges[source][target] = (weight, node)
+                in_edges[target][source] = (weight, node)
+
+            # remove the node from the remaining graph
+            for parent in in_edges[node]:
+                del out_edges[parent][node]
+                contracted[parent] += 1
+            for child in out_edges[node]:
+                del in_edges[child][node]
+                contracted[child] += 1
+            out_edges[node], in_edges[node] = {}, {}
+
+        self.up = _pack(upward)
+        self.down = _pack(downward)
+        self._index_shortcuts()
+
+    @classmethod
+    def load(cls, file, structure) -> 'ContractionHierarchy':
+        """Load a contraction hierarchy saved by ``save`` for the same graph
+
+        Args:
+            ``file``: File name or file object to load from
+
+            ``structure``: Graph the hierarchy was built for
+
+        Returns:
+            ContractionHierarchy: hierarchy ready for queries
+        """
+
+        hierarchy = cls.__new__(cls)
+        Search.__init__(hierarchy, queue_type=PriorityFrontier,
+                        structure=structure)
+
+        with np.load(file) as data:
+            hierarchy.witness_limit = int(data['witness_limit'])
+            hierarchy.rank = data['rank']
+            hierarchy.up = tuple(data[f'up_{k}'] for k in _ARRAYS)
+            hierarchy.down = tuple(data[f'down_{k}'] for k in _ARRAYS)
+
+        if len(hierarchy.rank) != len(structure.nodes):
+            raise ValueError(f"Hierarchy of {len(hierarchy.rank)} nodes does "
+                             f"not match graph of {len(structure.nodes)}")
+
+        hierarchy.version = structure.version
+        hierarchy._index_shortcuts()
+
+        return hierarchy
+
+    def save(self, file) -> None:
+        """Save the order and upward edges of this hierarchy as ``.npz``
+        archive
+
+        Args:
+            ``file``: File name or file object to save to
+        """
+
+        arrays = {f'up_{k}': a for k, a in zip(_ARRAYS, self.up)}
+        arrays.update({f'down_{k}': a for k, a in zip(_ARRAYS, self.down)})
+        np.savez(file, rank=self.rank, witness_limit=self.witness_limit,
+                 **arrays)
+
+    @instrumented
+    def find(self,
+        start: Node | int,
+        end: Node | int,
+        max_iters: int=10000
+    ) -> List[Node]:
+        """Search upwards from the start node and (along reversed edges) from
+        the goal node until no cheaper meeting node can be found, limited by
+        a maximum number of nodes to check
+
+        Args:
+            ``start``: Initial node (or index) to start the search from
+
+            ``end``: Goal node (or index) to be searched for
+
+            ``max_iters``: Maximum number of nodes to be visited (default:
+                10000)
+
+        Returns:
+            list: path to goal node or an empty list if goal was not reached
+        """
+
+        graph = self.structure
+        source, goal = graph.index(start), graph.index(end)
+
+        # start node is goal node
+        if source == goal:
+            return [start]
+
+        state = self._reset()
+        frontiers = (state.frontier, PriorityFrontier())
+        parents = (state.visited, state.backward)
+        costs: tuple[Dict[int, float], Dict[int, float]] = ({source: 0.0},
+                                                            {goal: 0.0})
+        edges = (self._up, self._down)
+        frontiers[0].put(source, 0.0)
+        frontiers[1].put(goal, 0.0)
+        parents[0][source] = None
+        parents[1][goal] = None
+        best, meet = MAX_FLOAT, None
+
+        # stop if no cheaper meeting node can be found
+        while True:
+            keys = [f.peek()[1] if not f.empty() else MAX_FLOAT
+                    for f in frontiers]
+            if min(keys) >= best:
+                break
+
+            # limit number of nodes explored
+            if max_iters < 1:
+                return []
+
+            side = 0 if keys[0] <= keys[1] else 1
+            frontier, parent, cost = frontiers[side], parents[side], \
+                costs[side]
+            node = frontier.get()
+            max_iters -= 1
+            self._step_callback(node, len(frontiers[0]) + len(frontiers[1]))
+
+            # both searches met at this node
+            other = costs[1 - side].get(node)
+            if other is not None and cost[node] + other < best:
+                best, meet = cost[node] + other, node
+
+            for child, weight in edges[side](node):
+                new_cost = cost[node] + weight
+                if new_cost < cost.get(child, MAX_FLOAT):
+                    cost[child] = new_cost
+                    parent[child] = node
+                    frontier.put(child, new_cost)
+                    state.generated += 1
+
+        # no path to the goal node
+        if meet is None:
+            return []
+
+        return [graph.cell(i) for i in self._unpack(parents, meet)]
+
+    def show(self, start, end, max_iters=10000, grid=None) -> List:
+        """Find a path from start to end, animating the expanded nodes in a
+        grid (see ``show_search``)
+        """
+
+        return show_search(self, start, end, max_iters, grid)
+
+    def _priority(self,
+        node: int,
+        out_edges: List[Dict],
+        in_edges: List[Dict],
+        contracted: List[int]
+    ) -> tuple[int, List[tuple[int, int, float]]]:
+        """Importance of a node and the shortcuts its contraction needs,
+        contracting nodes adding few shortcuts and with few contracted
+        neighbors first
+        """
+
+        shortcuts = self._shortcuts(node, out_edges, in_edges)
+        removed = len(out_edges[node]) + len(in_edges[node])
+
+        return len(shortcuts) - removed + contracted[node], shortcuts
+
+    def _shortcuts(self,
+        node: int,
+        out_edges: List[Dict],
+        in_edges: List[Dict]
+    ) -> List[tuple[int, int, float]]:
+        """Edges needed to preserve all cheapest paths through a node when it
+        is removed from the remaining graph
+        """
+
+        shortcuts = []
+        targets = out_edges[node]
+        if not targets:
+            return shortcuts
+
+        longest = max(weight for weight, _ in targets.values())
+        for source, (in_weight, _) in in_edges[node].items():
+            witness = self._witness(source, node, in_weight + longest,
+                                    out_edges)
+            for target, (out_weight, _) in targets.items():
+                weight = in_weight + out_weight
+                if target != source \
+                    and witness.get(target, MAX_FLOAT) > weight:
+                    shortcuts.append((source, target, weight))
+
+        return shortcuts
+
+    def _witness(self,
+        source: int,
+        ignored: int,
+        limit: float,
+        out_edges: List[Dict]
+    ) -> Dict[int, float]:
+        """Path costs from a node in the remaining graph without a node, up to
+        a cost limit and a number of settled nodes
+        """
+
+        cost = {source: 0.0}
+        heap = [(0.0, source)]
+        settled = 0
+
+        while heap and settled < self.witness_limit:
+            node_cost, node = heappop(heap)
+            if node_cost > cost[node]:
+                continue
+            if node_cost > limit:
+                break
+            settled += 1
+
+            for child, (weight, _) in out_edges[node].items():
+                new_cost = node_cost + weight
+                if child != ignored and new_cost < cost.get(child, MAX_FLOAT):
+                    cost[child] = new_cost
+                    heappush(heap, (new_cost, child))
+
+        return cost
+
+    def _index_shortcuts(self) -> None:
+        """Cache upward edges as lists and map shortcuts to their middle node
+        for unpacking
+        """
+
+        self._via: Dict[tuple[int, int], int] = {}
+        lists = []
+        for reverse, (indptr, indices, weights, via) in enumerate((self.up,
+                                                                   self.down)):
+            indptr, indices = indptr.tolist(), indices.tolist()
+            weights, via = weights.tolist(), via.tolist()
+            lists.append([list(zip(indices[a:b], weights[a:b]))
+                          for a, b in zip(indptr, indptr[1:])])
+
+            for node in range(len(indptr) - 1):
+                for i in range(indptr[node], indptr[node + 1]):
+                    if via[i] >= 0:
+                        edge = (indices[i], node) if reverse \
+                            else (node, indices[i])
+                        self._via[edge] = via[i]
+
+        self._up = lists[0].__getitem__
+        self._down = lists[1].__getitem__
+
+    def _unpack(self, parents: tuple[Dict, Dict], meet: int) -> List[int]:
+        """Path of original edges through the meeting node of both searches,
+        replacing shortcuts by the edges they were made of
+        """
+
+        path = [meet]
+        while parents[0][path[-1]] is not None:
+            path.append(parents[0][path[-1]])
+        path.reverse()
+        while parents[1][path[-1]] is not None:
+            path.append(parents[1][path[-1]])
+
+        result = [path[0]]
+        for edge in zip(path, path[1:]):
+            stack = [edge]
+            while stack:
+                source, target = stack.pop()
+                via = self._via.get((source, target))
+                if via is None:
+                    result.append(target)
+                else:
+                    stack += [(via, target), (source, via)]
+
+        return result
+
+
+# -------------------------------------------------------------------- Helpers
+_ARRAYS = ('indptr', 'indices', 'weights', 'via')
+
+
+def _pack(edges: List[List[tuple[int, float, int]]]) -> tuple[np.ndarray, ...]:
+    """Compressed sparse rows of target nodes, weights and middle nodes"""
+
+    flat = [edge for node_edges in edges for edge in node_edges]
+    indptr = np.cumsum([0] + [len(node_edges) for node_edges in edges])
+
+    return (indptr,
+            np.array([e[0] for e in flat], dtype=np.int64),
+            np.array([e[1] for e in flat], dtype=np.float64),
+            np.array([e[2] for e in flat], dtype=np.int64))
@@ -0,0 +1,231 @@
+"""Distance and flow fields towards a single goal shared by many agents"""
+
+from heapq import heappush, heappop
+from typing import List
+
+import numpy as np
+
+from mlpy.types import Node
+from mlpy.search.nodes import Grid, DIRECTIONS
+from mlpy.search.heuristics import _layers, _transpose
+
+
+# ----------------------------------------------------------------- Flow Field
+class FlowField:
+    """Path costs of all nodes to a goal node and the next node on a cheapest
+    path to it, computed by a single search from the goal
+    """
+
+    def __init__(self, structure: Grid | object, goal: Node | int) -> None:
+        """Search backwards from a goal node through a grid or graph once,
+        so any number of agents can follow the cheapest path to it from
+        their node without searching
+
+        Args:
+            ``structure``: Grid (node-based or compact) or graph to compute
+                the field in
+
+            ``goal``: Goal node (or index or grid coordinates)
+        """
+
+        self.structure = structure
+        self.version = structure.version
+
+        indptr, indices, weights = self._adjacency()
+        self.goal = self.structure.index(goal)
+
+        distance = _distances(*_transpose(indptr, indices, weights),
+                              self.goal)
+        parent = _parents(indptr, indices, weights, distance)
+        parent[self.goal] = -1
+
+        shape = structure.size if isinstance(structure, Grid) else (-1,)
+        self.distance: np.ndarray = distance.reshape(shape)
+        self.parent: np.ndarray = parent.reshape(shape)
+
+    @classmethod
+    def load(cls, file, structure: Grid | object) -> 'FlowField':
+        """Load a flow field saved by ``save`` for the same grid or graph
+
+        Args:
+            ``file``: File name or file object to load from
+
+            ``structure``: Grid or graph the field was computed in
+
+        Returns:
+            FlowField: field towards the saved goal node
+        """
+
+        with np.load(file) as data:
+            field = cls.__new__(cls)
+            field.structure = structure
+            field.version = structure.version
+            field.goal = int(data['goal'])
+            field.distance = data['distance']
+            field.parent = data['parent']
+
+        size = structure.size if isinstance(structure, Grid) \
+            else (len(structure.nodes),)
+        if field.distance.shape != tuple(size):
+            raise ValueError(f"Field of shape {field.distance.shape} does not "
+                             f"match structure of size {tuple(size)}")
+
+        return field
+
+    def save(self, file) -> None:
+        """Save the distances and parents of this field as ``.npz`` archive
+
+        Args:
+            ``file``: File name or file object to save to
+        """
+
+        np.savez(file, distance=self.distance, parent=self.parent,
+                 goal=self.goal)
+
+    @property
+    def is_current(self) -> bool:
+        """Return whether the structure did not change since the field was
+        computed
+        """
+
+        return self.version == self.structure.version
+
+    @property
+    def direction(self) -> np.ndarray:
+        """Return the index of the movement direction (in ``DIRECTIONS``)
+        towards the next cell of every grid cell, -1 if there is none
+        """
+
+        if not isinstance(self.structure, Grid):
+            raise TypeError("Directions are only defined for grids")
+
+        cols = self.structure.size[1]
+        cells = np.arange(self.parent.size).reshape(self.parent.shape)
+
+        # cells without parent do not move
+        parent = np.where(self.parent < 0, cells, self.parent)
+        d_row = parent // cols - cells // cols
+        d_col = parent % cols - cells % cols
+
+        # lookup table of all row and column offsets
+        table = np.full((3, 3), -1, dtype=np.int8)
+        for i, (row, col) in enumerate(DIRECTIONS):
+            table[row + 1, col + 1] = i
+
+        return table[d_row + 1, d_col + 1]
+
+    def cost(self, start: Node | int) -> float:
+        """Return the path cost from a node to the goal node (infinite if the
+        goal is unreachable)
+
+        Args:
+            ``start``: Node (or index or grid coordinates) of the agent
+        """
+
+        return float(self.distance.flat[self.structure.index(start)])
+
+    def next(self, start: Node | int) -> Node | int | None:
+        """Return the next node on the cheapest path to the goal node or
+        ``None`` at the goal or if it is unreachable
+
+        Args:
+            ``start``: Node (or index or grid coordinates) of the agent
+        """
+
+        parent = int(self.parent.flat[self.structure.index(start)])
+
+        return self.structure.cell(parent) if parent >= 0 else None
+
+    def path(self, start: Node | int) -> List[Node | int]:
+        """Return the cheapest path from a node to the goal node by following
+        the parents of the field
+
+        Args:
+            ``start``: Node (or index or grid coordinates) of the agent
+
+        Returns:
+            list: path to goal node or an empty list if it is unreachable
+        """
+
+        index = self.structure.index(start)
+        if not np.isfinite(self.distance.flat[index]):
+            return []
+
+        parent, path = self.parent.ravel(), [index]
+        while path[-1] != self.goal:
+            path.append(int(parent[path[-1]]))
+
+        return [self.structure.cell(i) for i in path]
+
+    def _adjacency(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Outgoing edges as compressed sparse rows and their weights"""
+
+        structure = self.structure
+        if structure.weights is not None:
+            weights = structure.weights
+        elif isinstance(structure, Grid):
+            weights = structure.as_array('cost').ravel()[structure.indices]
+        else:
+            cost = np.array([node.cost for node in structure.nodes],
+                            dtype=np.float64)
+            weights = cost[structure.indices]
+
+        return structure.indptr, structure.indices, \
+            weights.astype(np.float64)
+
+
+# -------------------------------------------------------------------- Helpers
+def _distances(indptr: np.ndarray,
+    indices: np.ndarray,
+    weights: np.ndarray,
+    goal: int
+) -> np.ndarray:
+    """Path costs from all nodes to a goal node along reversed edges"""
+
+    # equal weights: breadth first layers of all nodes at once
+    if len(weights) and weights[0] > 0 and np.all(weights == weights[0]):
+        return _layers(indptr, indices, goal).astype(np.float64) \
+            * weights[0]
+
+    indptr, indices = indptr.tolist(), indices.tolist()
+    weights = weights.tolist()
+    distance = [float('inf')] * (len(indptr) - 1)
+    distance[goal] = 0.0
+    heap = [(0.0, goal)]
+
+    while heap:
+        node_cost, node = heappop(heap)
+        if node_cost > distance[node]:
+            continue
+
+        for i in range(indptr[node], indptr[node + 1]):
+            child, new_cost = indices[i], node_cost + weights[i]
+            if new_cost < distance[child]:
+                distance[child] = new_cost
+                heappush(heap, (new_cost, child))
+
+    return np.array(distance, dtype=np.float64)
+
+
+def _parents(indptr: np.ndarray,
+    indices: np.ndarray,
+    weights: np.ndarray,
+    distance: np.ndarray
+) -> np.ndarray:
+    """Cheapest outgoing edge of every node towards the goal node, -1 if the
+    goal is unreachable
+    """
+
+    counts = np.diff(indptr)
+    rows = np.repeat(np.arange(len(counts)), counts)
+    values = distance[indices] + weights
+
+    # sort the edges of each row by their cost to the goal, ties keep the
+    # neighbor order
+    order = np.lexsort((values, rows))
+    parent = np.full(len(counts), -1, dtype=np.int64)
+    edges = counts > 0
+    parent[edges] = indices[order[indptr[:-1][edges]]]
+    parent[~np.isfinite(distance)] = -1
+
+    return parent
@@ -0,0 +1,140 @@
+"""Lock-free frontiers for single-threaded search algorithms"""
+
+from collections import deque
+from heapq import heapify, heappush, heappop
+from itertools import count
+from typing import Any, Dict, Iterator
+
+
+# -------------------------------------------------------------- FIFO Frontier
+class FifoFrontier:
+    """First-in-first-out frontier backed by a deque"""
+
+    def __init__(self) -> None:
+        """Create an empty first-in-first-out frontier"""
+
+        self._queue = deque()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def put(self, node: Any) -> None:
+        """Add a node to the back of the frontier
+
+        Args:
+            ``node``: Node (or node index) to be added
+        """
+
+        self._queue.append(node)
+
+    def get(self) -> Any:
+        """Remove and return the oldest node in the frontier"""
+
+        return self._queue.popleft()
+
+    def empty(self) -> bool:
+        """Return whether the frontier contains no more nodes"""
+
+        return not self._queue
+
+
+# -------------------------------------------------------------- LIFO Frontier
+class LifoFrontier(FifoFrontier):
+    """Last-in-first-out frontier backed by a deque"""
+
+    def get(self) -> Any:
+        """Remove and return the newest node in the frontier"""
+
+        return self._queue.pop()
+
+
+# ---------------------------------------------------------- Priority Frontier
+class PriorityFrontier:
+    """Min-priority frontier backed by a binary heap of
+    ``(priority, tiebreak, node)`` entries with lazy deletion
+    """
+
+    def __init__(self) -> None:
+        """Create an empty priority frontier, nodes with equal priority are
+        returned in insertion order
+        """
+
+        self._heap = []
+        self._priority: Dict[Any, float] = {}
+        self._tiebreak = count()
+
+    def __len__(self) -> int:
+        return len(self._priority)
+
+    def __contains__(self, node: Any) -> bool:
+        return node in self._priority
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._priority)
+
+    def put(self, node: Any, priority: float) -> None:
+        """Add a node to the frontier or decrease its priority if it is
+        already contained with a higher one
+
+        Args:
+            ``node``: Node (or node index) to be added
+
+            ``priority``: Priority of the node, lower values are returned
+                first
+        """
+
+        current = self._priority.get(node)
+        if current is not None and current <= priority:
+            return
+
+        # an outdated entry of this node stays in the heap and is skipped
+        self._priority[node] = priority
+        heappush(self._heap, (priority, next(self._tiebreak), node))
+
+    def remove(self, node: Any) -> None:
+        """Remove a node from the frontier if it is contained
+
+        Args:
+            ``node``: Node (or node index) to be removed
+        """
+
+        # its heap entry stays and is skipped
+        self._priority.pop(node, None)
+
+    def get(self) -> Any:
+        """Remove and return the node with the lowest priority"""
+
+        while True:
+            priority, _, node = heappop(self._heap)
+
+            # skip entries replaced by a decreased priority
+            if self._priority.get(node) == priority:
+                del self._priority[node]
+                return node
+
+    def peek(self) -> tuple[Any, float]:
+        """Return the node with the lowest priority and its priority without
+        removing it
+        """
+
+        while True:
+            priority, _, node = self._heap[0]
+
+            # drop entries replaced by a decreased priority
+            if self._priority.get(node) == priority:
+                return node, priority
+            heappop(self._heap)
+
+    def empty(self) -> bool:
+        """Return whether the frontier contains no more nodes"""
+
+        return not self._priority
+
+    def compact(self) -> None:
+        """Drop all outdated heap entries of removed nodes or decreased
+        priorities, bounding the memory to the number of contained nodes
+        """
+
+        self._heap = [entry for entry in self._heap
+                      if self._priority.get(entry[2]) == entry[0]]
+        heapify(self._heap)
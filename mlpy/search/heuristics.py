@@ -0,0 +1,290 @@
+"""Heuristic fields and landmark distances for grids"""
+
+from heapq import heappush, heappop
+from typing import List
+
+import numpy as np
+
+from mlpy.types import Node
+
+
+METRICS = ['auto', 'manhattan', 'chebyshev', 'octile', 'euclidean']
+
+
+# ------------------------------------------------------------ Heuristic Field
+def heuristic_field(grid,
+    goal: Node | int | tuple[int, int],
+    metric: str='auto',
+    scale: float | None=None
+) -> np.ndarray:
+    """Compute the distance of every cell of a grid to a goal cell at once,
+    to be used as heuristic, e.g. ``grid.set_array('heuristic', field)``
+
+    Every move enters one cell, so ``manhattan`` (4-connected grids) and
+    ``chebyshev`` (8-connected grids) never overestimate the path cost.
+    ``octile`` and ``euclidean`` assume diagonal moves to be longer and may
+    overestimate it on 8-connected grids.
+
+    Args:
+        ``grid``: Grid (node-based or compact) to compute the field for
+
+        ``goal``: Goal node (or index or coordinates)
+
+        ``metric``: One of ``'manhattan'``, ``'chebyshev'``, ``'octile'``,
+            ``'euclidean'`` or ``'auto'`` choosing the first or second one
+            depending on diagonal movement (default: ``'auto'``)
+
+        ``scale``: Cost of a single move (default: lowest edge weight of
+            weighted grids, else lowest cost of all free cells)
+
+    Returns:
+        np.ndarray: distances to the goal cell in the shape of the grid
+    """
+
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric '{metric}', use one of {METRICS}")
+
+    if metric == 'auto':
+        metric = 'chebyshev' if grid.diagonal else 'manhattan'
+
+    if scale is None:
+        scale = _lowest_cost(grid)
+
+    # distances along both axes by broadcasting a column and a row
+    rows, cols = grid.size
+    goal_row, goal_col = divmod(grid.index(goal), cols)
+    d_row = np.abs(np.arange(rows, dtype=np.float64) - goal_row)[:, None]
+    d_col = np.abs(np.arange(cols, dtype=np.float64) - goal_col)[None, :]
+
+    if metric == 'manhattan':
+        field = d_row + d_col
+    elif metric == 'chebyshev':
+        field = np.maximum(d_row, d_col)
+    elif metric == 'octile':
+        field = np.maximum(d_row, d_col) \
+            + (np.sqrt(2) - 1) * np.minimum(d_row, d_col)
+    else:
+        field = np.sqrt(d_row ** 2 + d_col ** 2)
+
+    return field * scale
+
+
+# ------------------------------------------------------------------ Landmarks
+class Landmarks:
+    """Precomputed distances between landmark cells and all cells of a grid
+    for the ALT heuristic (A star, landmarks and triangle inequality)
+    """
+
+    def __init__(self,
+        grid,
+        count: int=4,
+        landmarks: List | None=None
+    ) -> None:
+        """Select landmarks spread over a grid and compute the path cost from
+        each landmark to every cell, stored as ``float32`` arrays, using the
+        edge weights of weighted grids
+
+        Landmarks are chosen one after another as the free cell farthest
+        from all previous ones, starting from the cell farthest from the
+        first free cell.
+
+        Args:
+            ``grid``: Grid (node-based or compact) to precompute distances in
+
+            ``count``: Number of landmarks to select (default: 4)
+
+            ``landmarks``: Optional nodes (or indices) to use as landmarks
+                instead of selecting them
+        """
+
+        self.grid = grid
+        self.version = grid.version
+        self._cost = grid.as_array('cost').ravel()
+        edges = _edge_costs(grid)
+
+        # edge weights need path costs towards the landmarks along reversed
+        # edges, cell costs give them from the path costs of the landmarks
+        self.reverse: np.ndarray | None = None
+
+        if landmarks is not None:
+            self.landmarks = [grid.index(node) for node in landmarks]
+            self.distances = np.stack(
+                [self._distances(i, edges) for i in self.landmarks]
+            )
+            self._reverse_distances(edges)
+            return
+
+        free = np.flatnonzero(~grid.blocked.ravel())
+        self.landmarks, distances = [], []
+        nearest = self._distances(int(free[0]), edges) if len(free) \
+            else None
+
+        for _ in range(min(count, len(free))):
+            # farthest reachable cell from all previous landmarks
+            reachable = np.where(np.isfinite(nearest), nearest, -1)
+            landmark = int(np.argmax(reachable))
+            self.landmarks.append(landmark)
+            distances.append(self._distances(landmark, edges))
+            nearest = np.minimum(nearest, distances[-1]) \
+                if len(distances) > 1 else distances[-1]
+
+        self.distances = np.stack(distances) if distances \
+            else np.zeros((0, grid.blocked.size), dtype=np.float32)
+        self._reverse_distances(edges)
+
+    def heuristic(self, goal: Node | int | tuple[int, int]) -> np.ndarray:
+        """Compute lower bounds of the path cost from every cell to a goal
+        cell at once, to be used as heuristic, e.g.
+        ``grid.set_array('heuristic', landmarks.heuristic(goal))``
+
+        Args:
+            ``goal``: Goal node (or index or coordinates)
+
+        Returns:
+            np.ndarray: lower bounds of the path costs to the goal cell in the
+                shape of the grid, zero for cells not connected to a landmark
+        """
+
+        goal = self.grid.index(goal)
+        to_goal = self.distances[:, goal][:, None]
+
+        # moves enter cells: from a landmark L, a reversed path v -> L costs
+        # d(L, v) - cost(v) + cost(L)
+        if self.reverse is None:
+            cost = self._cost.astype(np.float32)
+            from_cells = self.distances - cost[None, :] \
+                + cost[self.landmarks][:, None]
+        else:
+            from_cells = self.reverse
+        from_goal = from_cells[:, goal][:, None]
+
+        # d(v, t) >= d(L, t) - d(L, v) and d(v, t) >= d(v, L) - d(t, L),
+        # no bound across separate components to keep values finite
+        with np.errstate(invalid='ignore'):
+            bounds = np.maximum(to_goal - self.distances, from_cells - from_goal)
+        bounds = np.where(np.isfinite(bounds), bounds, 0)
+
+        field = np.max(bounds, axis=0, initial=0)
+
+        return field.astype(np.float64).reshape(self.grid.size)
+
+    @staticmethod
+    def _distances(source: int,
+        edges: tuple[np.ndarray, np.ndarray, np.ndarray]
+    ) -> np.ndarray:
+        """Path costs from a cell to all cells along weighted edges given as
+        compressed sparse rows (infinite if unreachable)
+        """
+
+        indptr, indices, weights = edges
+
+        # equal weights: breadth first layers of all cells at once
+        if len(weights) and weights[0] > 0 and np.all(weights == weights[0]):
+            return _layers(indptr, indices, source) * np.float32(weights[0])
+
+        return _dijkstra(indptr, indices, weights, source)
+
+    def _reverse_distances(self,
+        edges: tuple[np.ndarray, np.ndarray, np.ndarray]
+    ) -> None:
+        """Path costs from all cells to each landmark of a weighted grid"""
+
+        if self.grid.weights is None:
+            return
+
+        edges = _transpose(*edges)
+        self.reverse = np.stack(
+            [self._distances(i, edges) for i in self.landmarks]
+        ) if self.landmarks else np.zeros_like(self.distances)
+
+
+# -------------------------------------------------------------------- Helpers
+def _lowest_cost(grid) -> float:
+    """Lowest cost of a move, i.e. the lowest edge weight of weighted grids
+    or the lowest cost of all free cells
+    """
+
+    if grid.weights is not None:
+        return float(grid.weights.min()) if grid.weights.size else 1.0
+
+    cost = grid.as_array('cost')[~grid.blocked]
+
+    return float(cost.min()) if cost.size else 1.0
+
+
+def _edge_costs(grid) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Compressed sparse rows of a grid with the cost of every edge, its
+    weight or else the cost of the cell it enters
+    """
+
+    weights = grid.weights
+    if weights is None:
+        weights = grid.as_array('cost').ravel()[grid.indices]
+
+    return grid.indptr, grid.indices, np.asarray(weights, dtype=np.float64)
+
+
+def _transpose(indptr: np.ndarray,
+    indices: np.ndarray,
+    weights: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Reverse all edges given as compressed sparse rows"""
+
+    nodes = len(indptr) - 1
+    rows = np.repeat(np.arange(nodes), np.diff(indptr))
+    order = np.argsort(indices, kind='stable')
+    counts = np.bincount(indices, minlength=nodes)
+
+    return np.concatenate([[0], np.cumsum(counts)]), rows[order], \
+        weights[order]
+
+
+def _layers(indptr: np.ndarray, indices: np.ndarray, source: int) -> np.ndarray:
+    """Number of moves from a cell to all cells by expanding whole breadth
+    first layers with numpy
+    """
+
+    depth = np.full(len(indptr) - 1, np.inf, dtype=np.float32)
+    depth[source] = 0
+    layer, level = np.array([source]), 0
+
+    while layer.size:
+        level += 1
+
+        # gather all neighbors of the layer from the adjacency
+        starts, stops = indptr[layer], indptr[layer + 1]
+        counts = stops - starts
+        offsets = np.repeat(stops - counts.cumsum(), counts)
+        children = indices[offsets + np.arange(counts.sum())]
+
+        layer = np.unique(children[np.isinf(depth[children])])
+        depth[layer] = level
+
+    return depth
+
+
+def _dijkstra(indptr: np.ndarray,
+    indices: np.ndarray,
+    weights: np.ndarray,
+    source: int
+) -> np.ndarray:
+    """Path costs from a cell to all cells along weighted edges"""
+
+    indptr, indices = indptr.tolist(), indices.tolist()
+    weights = weights.tolist()
+    distance = [float('inf')] * (len(indptr) - 1)
+    distance[source] = 0.0
+    heap = [(0.0, source)]
+
+    while heap:
+        node_cost, node = heappop(heap)
+        if node_cost > distance[node]:
+            continue
+
+        for i in range(indptr[node], indptr[node + 1]):
+            child, new_cost = indices[i], node_cost + weights[i]
+            if new_cost < distance[child]:
+                distance[child] = new_cost
+                heappush(heap, (new_cost, child))
+
+    return np.array(distance, dtype=np.float32)
@@ -0,0 +1,491 @@
+"""Hierarchical pathfinding on large grids"""
+
+from heapq import heappush, heappop
+from typing import Dict, List, Set
+
+import numpy as np
+
+from mlpy.types import Node, Search, instrumented, MAX_FLOAT
+from mlpy.search.frontiers import PriorityFrontier
+from mlpy.search.heuristics import _lowest_cost
+from mlpy.search.animation import show_search
+
+
+# ----------------------------------------------------------------------- HPA*
+class HierarchicalAStar(Search):
+    """Hierarchical Path-Finding A* (HPA*) Algorithm"""
+
+    def __init__(self,
+        structure,
+        cluster_size: int=16,
+        threshold: int=6
+    ) -> None:
+        """Instance of the hierarchical pathfinding algorithm for large grids,
+        splitting the grid into square clusters connected by entrances and
+        precomputing the path costs between all entrances of a cluster once,
+        along the edge weights of weighted grids
+
+        Queries search the small abstract graph of entrances and refine the
+        result within each cluster, resulting in near-optimal paths.
+
+        Args:
+            ``structure``: Grid (node-based or compact) to search in
+
+            ``cluster_size``: Side length of a cluster in cells
+
+            ``threshold``: Minimum width of an entrance to be represented by
+                transitions at both of its ends instead of its middle only
+        """
+
+        super().__init__(queue_type=PriorityFrontier, structure=structure)
+        self.cluster_size = cluster_size
+        self.threshold = threshold
+        self.entrances: Dict[tuple[int, int], List[tuple[int, int]]] = {}
+        self.edges: Dict[int, Dict[int, float]] = {}
+        self._pairs: Dict[int, Set[tuple[int, int]]] = {}
+        self._cost = np.zeros(0)
+        self._min_cost = 0.0
+
+        rows, cols = structure.size
+        self._clusters_per_row = -(-cols // cluster_size)
+        row_ids = np.arange(rows)[:, None] // cluster_size
+        col_ids = np.arange(cols)[None, :] // cluster_size
+        self._cluster = (row_ids * self._clusters_per_row + col_ids).ravel()
+        self._build(None)
+
+    @instrumented
+    def find(self,
+        start: Node | int,
+        end: Node | int,
+        max_iters: int=10000
+    ) -> List[Node | int]:
+        """Use hierarchical pathfinding to find a path from a start node to
+        the goal node, searching the abstract graph of cluster entrances and
+        limited by a maximum number of abstract nodes to check
+
+        Args:
+            ``start``: Initial node (or index) to start the search from
+
+            ``end``: Goal node (or index) to be searched for
+
+            ``max_iters``: Maximum number of abstract nodes to be visited
+                (default: 10000)
+
+        Returns:
+            list: path to goal node or an empty list if goal was not reached
+        """
+
+        grid = self.structure
+        source, goal = grid.index(start), grid.index(end)
+
+        # start node is goal node
+        if source == goal:
+            return [start]
+
+        if grid.blocked.flat[source] or grid.blocked.flat[goal]:
+            return []
+
+        # connect start and goal node to the entrances of their clusters
+        edges = self._connect(source, goal)
+
+        # admissible estimate of the remaining cost to the goal node
+        cols = grid.size[1]
+        goal_row, goal_col = divmod(goal, cols)
+        min_cost = self._min_cost
+
+        def heuristic(node: int) -> float:
+            d_row, d_col = divmod(node, cols)
+            d_row, d_col = abs(d_row - goal_row), abs(d_col - goal_col)
+            steps = max(d_row, d_col) if grid.diagonal else d_row + d_col
+            return min_cost * steps
+
+        state = self._reset()
+        frontier, visited = state.frontier, state.visited
+        cost = {source: 0.0}
+        frontier.put(source, heuristic(source))
+        visited[source] = None
+
+        # limit loops and stop if no more nodes available
+        while not frontier.empty():
+            max_iters -= 1
+            node = frontier.get()
+            self._step_callback(node, len(frontier) + 1)
+
+            # goal node found
+            if node == goal:
+                return self._refine(goal)
+
+            # check abstract neighbors
+            for child, step_cost in edges(node):
+                new_cost = cost[node] + step_cost
+                if new_cost >= cost.get(child, MAX_FLOAT):
+                    continue
+
+                cost[child] = new_cost
+                visited[child] = node
+
+                # extend search
+                frontier.put(child, new_cost + heuristic(child))
+                state.generated += 1
+
+            # limit number of nodes explored
+            if max_iters < 1:
+                break
+
+        # no goal found (within maximum iterations)
+        return []
+
+    def update(self, changed: List) -> None:
+        """Rebuild the abstraction of all clusters touched by changed cells,
+        e.g. as returned by ``Grid.block``, must not run concurrently with
+        ``find``
+
+        Args:
+            ``changed``: nodes (or indices) of cells whose movement options
+                changed
+        """
+
+        grid = self.structure
+        clusters = {int(self._cluster[grid.index(c)]) for c in changed}
+        if clusters:
+            self._build(clusters)
+
+    def show(self, start, end, max_iters=10000, grid=None) -> List:
+        """Find a path from start to end, animating the expanded nodes in a
+        grid (see ``show_search``)
+        """
+
+        return show_search(self, start, end, max_iters, grid)
+
+    def _build(self, clusters: Set[int] | None) -> None:
+        """Compute entrances and abstract edges of the given clusters (or all
+        clusters) and update their neighboring clusters accordingly
+        """
+
+        grid = self.structure
+        self._cost = grid.as_array('cost').ravel()
+        self._min_cost = max(_lowest_cost(grid), 0.0)
+        cluster = self._cluster
+
+        # edges between different clusters, all of them or only those of
+        # cells in the given clusters (grid moves are symmetric)
+        if clusters is None:
+            sources = np.repeat(np.arange(grid.blocked.size),
+                                np.diff(grid.indptr))
+            targets = grid.indices
+        else:
+            cells = np.concatenate([self._cells(c) for c in clusters])
+            sources, targets, _ = self._edges(cells)
+        crossing = cluster[sources] != cluster[targets]
+        sources, targets = sources[crossing], targets[crossing]
+
+        # each edge once, from the lower to the higher cluster
+        flip = cluster[sources] > cluster[targets]
+        sources, targets = np.where(flip, targets, sources), \
+            np.where(flip, sources, targets)
+        if clusters is not None:
+            edges = np.unique(np.stack([sources, targets], axis=1), axis=0)
+            sources, targets = edges[:, 0], edges[:, 1]
+
+        # clusters whose abstract nodes may change
+        if clusters is None:
+            affected = set(np.unique(cluster).tolist())
+            pairs = set(self.entrances)
+        else:
+            affected = {n for c in clusters for n in self._neighborhood(c)}
+            pairs = {p for c in clusters for p in self._pairs.get(c, ())}
+
+        # forget all edges of affected abstract nodes and old entrances
+        for node in [n for c in affected for n in self._nodes_of(c)]:
+            for other in self.edges.pop(node, {}):
+                self.edges.get(other, {}).pop(node, None)
+
+        for pair in pairs:
+            for c in pair:
+                self._pairs[c].discard(pair)
+            del self.entrances[pair]
+
+        # group crossing edges into entrances
+        for pair, transitions in self._entrances(
+            sources.tolist(), targets.tolist()
+        ).items():
+            self.entrances[pair] = transitions
+            for c in pair:
+                self._pairs.setdefault(c, set()).add(pair)
+
+        # connect entrances within and between affected clusters
+        costs = self._cost
+        weighted = grid.weights is not None
+        for c in affected:
+            nodes = self._nodes_of(c)
+            adjacency = self._adjacency(c)
+            for i, node in enumerate(nodes):
+                self.edges.setdefault(node, {})
+                others = nodes[:i] + nodes[i + 1:] if weighted \
+                    else nodes[i + 1:]
+                if not others:
+                    continue
+
+                # grid moves are symmetric, only the entered cells differ
+                # unless edges are weighted
+                local, _ = self._local(node, c, targets=others,
+                                       adjacency=adjacency)
+                for other in others:
+                    if other not in local:
+                        continue
+                    self.edges[node][other] = local[other]
+                    if not weighted:
+                        self.edges.setdefault(other, {})[node] = \
+                            local[other] - costs.item(other) + costs.item(node)
+
+            for pair in self._pairs.get(c, ()):
+                for a, b in self.entrances[pair]:
+                    self.edges.setdefault(a, {})[b] = self._step(a, b)
+                    self.edges.setdefault(b, {})[a] = self._step(b, a)
+
+    def _cells(self, cluster: int) -> np.ndarray:
+        """Flat indices of all cells of a cluster"""
+
+        rows, cols = self.structure.size
+        size = self.cluster_size
+        row, col = divmod(cluster, self._clusters_per_row)
+        row_ids = np.arange(row * size, min((row + 1) * size, rows))
+        col_ids = np.arange(col * size, min((col + 1) * size, cols))
+
+        return (row_ids[:, None] * cols + col_ids[None, :]).ravel()
+
+    def _edges(self,
+        cells: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Sources, targets and costs of all edges leaving some cells, sliced
+        from the adjacency of the grid
+        """
+
+        grid = self.structure
+        starts, stops = grid.indptr[cells], grid.indptr[cells + 1]
+        counts = stops - starts
+        offsets = np.repeat(stops - counts.cumsum(), counts) \
+            + np.arange(counts.sum())
+        targets = grid.indices[offsets]
+
+        costs = self._cost[targets] if grid.weights is None \
+            else grid.weights[offsets]
+
+        return np.repeat(cells, counts), targets, costs
+
+    def _step(self, a: int, b: int) -> float:
+        """Cost of the move between two neighboring cells"""
+
+        grid = self.structure
+        if grid.weights is None:
+            return self._cost.item(b)
+
+        start, stop = grid.indptr[a:a + 2].tolist()
+        row = grid.indices[start:stop].tolist()
+
+        return grid.weights.item(start + row.index(b))
+
+    def _adjacency(self,
+        cluster: int,
+        reverse: bool=False
+    ) -> Dict[int, List[tuple[int, float]]]:
+        """Neighbors of the cells of a cluster within the cluster and the
+        cost of moving to them (or from them if reversed)
+        """
+
+        sources, targets, costs = self._edges(self._cells(cluster))
+        inside = self._cluster[targets] == cluster
+        sources, targets, costs = sources[inside], targets[inside], \
+            costs[inside]
+        if reverse:
+            sources, targets = targets, sources
+
+        adjacency: Dict[int, List[tuple[int, float]]] = {}
+        for a, b, cost in zip(sources.tolist(), targets.tolist(),
+                              costs.tolist()):
+            adjacency.setdefault(a, []).append((b, cost))
+
+        return adjacency
+
+    def _entrances(self,
+        sources: List[int],
+        targets: List[int]
+    ) -> Dict[tuple[int, int], List[tuple[int, int]]]:
+        """Group crossing edges of each pair of clusters into entrances of
+        neighboring cells and pick transitions representing each entrance
+        """
+
+        cols = self.structure.size[1]
+        owners = self._cluster
+        by_pair: Dict[tuple[int, int], List[tuple[int, int, int, int]]] = {}
+        for a, b, pair in zip(sources, targets,
+                              zip(owners[sources].tolist(),
+                                  owners[targets].tolist())):
+
+            # position along the border shared by both clusters
+            if pair[1] - pair[0] == 1 and pair[1] % self._clusters_per_row:
+                key = (a // cols, b // cols, a, b)
+            else:
+                key = (a % cols, b % cols, a, b)
+            by_pair.setdefault(pair, []).append(key)
+
+        entrances = {}
+        for pair, crossings in by_pair.items():
+            transitions = []
+            for entrance in _group(sorted(crossings)):
+                width = len({position for position, *_ in entrance})
+                ends = [entrance[0], entrance[-1]] \
+                    if width >= self.threshold \
+                    else [entrance[len(entrance) // 2]]
+                transitions += [(a, b) for *_, a, b in ends]
+
+            entrances[pair] = transitions
+
+        return entrances
+
+    def _neighborhood(self, cluster: int) -> List[int]:
+        """A cluster and all clusters surrounding it"""
+
+        rows = -(-self.structure.size[0] // self.cluster_size)
+        cols = self._clusters_per_row
+        row, col = divmod(cluster, cols)
+
+        return [i * cols + j
+                for i in range(max(row - 1, 0), min(row + 2, rows))
+                for j in range(max(col - 1, 0), min(col + 2, cols))]
+
+    def _nodes_of(self, cluster: int) -> List[int]:
+        """Abstract nodes (entrance cells) inside a cluster"""
+
+        nodes = {}
+        for pair in self._pairs.get(cluster, ()):
+            # transitions lead from the lower to the higher cluster
+            side = 0 if pair[0] == cluster else 1
+            for transition in self.entrances[pair]:
+                nodes[transition[side]] = None
+
+        return list(nodes)
+
+    def _local(self,
+        source: int,
+        cluster: int,
+        targets: List[int] | None=None,
+        reverse: bool=False,
+        adjacency: Dict[int, List[tuple[int, float]]] | None=None
+    ) -> tuple[Dict[int, float], Dict[int, int | None]]:
+        """Path costs and parents from a cell (or towards it if reversed) to
+        cells of the same cluster, stopping early once all targets are found
+        """
+
+        if adjacency is None:
+            adjacency = self._adjacency(cluster, reverse)
+        remaining = set(targets) if targets is not None else None
+        cost, parents = {source: 0.0}, {source: None}
+        heap = [(0.0, source)]
+
+        # plain heap of cells, only a small part of the grid is searched
+        while heap:
+            node_cost, node = heappop(heap)
+            if node_cost > cost[node]:
+                continue
+
+            if remaining is not None:
+                remaining.discard(node)
+                if not remaining:
+                    break
+
+            for child, step_cost in adjacency.get(node, ()):
+                new_cost = node_cost + step_cost
+                if new_cost < cost.get(child, MAX_FLOAT):
+                    cost[child] = new_cost
+                    parents[child] = node
+                    heappush(heap, (new_cost, child))
+
+        return cost, parents
+
+    def _connect(self, source: int, goal: int):
+        """Return the abstract neighbors of a node, extended by temporary
+        edges from the start node and to the goal node
+        """
+
+        start_cluster = int(self._cluster[source])
+        goal_cluster = int(self._cluster[goal])
+        start_nodes = self._nodes_of(start_cluster)
+        goal_nodes = self._nodes_of(goal_cluster)
+
+        start_costs, _ = self._local(source, start_cluster,
+                                     targets=start_nodes + [goal])
+        goal_costs, _ = self._local(goal, goal_cluster,
+                                    targets=goal_nodes, reverse=True)
+
+        start_edges = {n: start_costs[n] for n in start_nodes
+                       if n in start_costs}
+        if start_cluster == goal_cluster and goal in start_costs:
+            start_edges[goal] = start_costs[goal]
+
+        goal_edges = {n: goal_costs[n] for n in goal_nodes if n in goal_costs}
+
+        def edges(node: int) -> List[tuple[int, float]]:
+            result = list(self.edges.get(node, {}).items())
+            if node == source:
+                result += list(start_edges.items())
+            if node in goal_edges:
+                result.append((goal, goal_edges[node]))
+            return result
+
+        return edges
+
+    def _refine(self, goal: int) -> List[Node | int]:
+        """Backtrack the abstract path and replace each step inside a
+        cluster by its local shortest path
+        """
+
+        abstract = [goal]
+        while self.visited[abstract[-1]] is not None:
+            abstract.append(self.visited[abstract[-1]])
+        abstract.reverse()
+
+        owners = self._cluster[abstract].tolist()
+        cells = [abstract[0]]
+        for a, b, cluster, other in zip(abstract, abstract[1:], owners,
+                                        owners[1:]):
+            # neighboring cells of different clusters
+            if other != cluster:
+                cells.append(b)
+                continue
+
+            _, parents = self._local(a, cluster, targets=[b])
+            segment = [b]
+            while parents[segment[-1]] != a:
+                segment.append(parents[segment[-1]])
+            cells += segment[::-1]
+
+        self.path = [self.structure.cell(c) for c in cells]
+        return self.path
+
+
+def _group(crossings: List[tuple[int, int, int, int]]) -> List[List]:
+    """Group sorted crossing edges ``(position, position, cell, cell)`` into
+    entrances, joining edges whose cells are neighbors on both sides
+    """
+
+    group = list(range(len(crossings)))
+
+    def root(i: int) -> int:
+        while group[i] != i:
+            group[i] = group[group[i]]
+            i = group[i]
+        return i
+
+    for i, (pos_a, pos_b, _, _) in enumerate(crossings):
+        for j in range(i + 1, len(crossings)):
+            if crossings[j][0] - pos_a > 1:
+                break
+            if abs(crossings[j][1] - pos_b) <= 1:
+                group[root(j)] = root(i)
+
+    entrances: Dict[int, List] = {}
+    for i, crossing in enumerate(crossings):
+        entrances.setdefault(root(i), []).append(crossing)
+
+    return list(entrances.values())
@@ -1,12 +1,18 @@
 """TODO"""
 
-from typing import List
+import json
+from collections import OrderedDict, deque
+from itertools import chain
+from pathlib import Path
+from threading import Lock
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List
 
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.patches import Rectangle
+from matplotlib.colors import ListedColormap
+from matplotlib.image import AxesImage
 
-from mlpy.types import Node
+from mlpy.types import Node, SlotNode
 
 
 COLORS = {
@@ -16,59 +22,635 @@ COLORS = {
     'end': 'tab:red',
     'path_end': 'tab:purple',
     'path_': 'tab:cyan',
-    'blocked': 'tab:gray'
+    'blocked': 'tab:gray',
+    'expanded': 'tab:orange'
 }
 
+# -------------------------------------------------------------------- Storage
+# saved structures are directories of one ``.npy`` file per array and a
+# ``header.json``, so every array can be memory-mapped on its own
+FORMAT = 1
+
+
+def _save(path: str | Path,
+    kind: str,
+    arrays: Dict[str, np.ndarray | None],
+    header: Dict
+) -> None:
+    """Write arrays (skipping ``None``) and a header into a directory"""
+
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    for name, array in arrays.items():
+        if array is not None:
+            np.save(path / f'{name}.npy', np.ascontiguousarray(array))
+
+    header = dict(header, kind=kind, format=FORMAT,
+                  arrays=[k for k, a in arrays.items() if a is not None])
+    (path / 'header.json').write_text(json.dumps(header))
+
+
+def _load(path: str | Path,
+    kind: str,
+    mmap_mode: str | None
+) -> tuple[Dict[str, np.ndarray], Dict]:
+    """Read the header and (memory-mapped) arrays of a saved structure"""
+
+    path = Path(path)
+    header = json.loads((path / 'header.json').read_text())
+
+    if header.get('kind') != kind:
+        raise ValueError(f"{path} contains a {header.get('kind')}, "
+                         f"not a {kind}")
+    if header.get('format') != FORMAT:
+        raise ValueError(f"Unsupported format {header.get('format')} "
+                         f"of {path}")
+
+    arrays = {name: np.load(path / f'{name}.npy', mmap_mode=mmap_mode)
+              for name in header['arrays']}
+
+    return arrays, header
+
+
+# ---------------------------------------------------------------------- Nodes
+class _CellNode(SlotNode):
+    """Slotted node of a structure that reads its neighbors from the CSR
+    adjacency of the structure instead of storing a list of them
+    """
+
+    __slots__ = ('structure',)
+
+    def __init__(self, index: int, structure) -> None:
+        """Node at an index of a structure with a ``neighbors`` method and
+        a ``_cells`` sequence of its nodes
+
+        Args:
+            ``index``: Index of this node in the structure
+
+            ``structure``: Structure this node belongs to
+        """
+
+        # pylint: disable=super-init-not-called
+        # SlotNode.__init__ would assign the read-only neighbors, so the
+        # neighbors slot stays empty and they are looked up on access
+        self.id: int = index
+        self.depth: int = 0
+        self.cost: float = 1
+        self.heuristic: float = 1
+        self._info: Dict | None = None
+        self.structure = structure
+
+    @property
+    def neighbors(self) -> List:
+        """Return the neighboring nodes of this node"""
+
+        cells = self.structure._cells # pylint: disable=protected-access
+
+        return [cells[i] for i in self.structure.neighbors(self.id)]
+
+
+class _MappedNode(_CellNode):
+    """Slotted node of a loaded structure that also reads its cost and
+    heuristic from the (memory-mapped) arrays of the structure
+    """
+
+    __slots__ = ()
+
+    def __init__(self, index: int, structure, depth: int=0) -> None:
+        # pylint: disable=super-init-not-called
+        # neighbors, cost and heuristic are properties reading the structure
+        self.id: int = index
+        self.depth: int = depth
+        self._info: Dict | None = None
+        self.structure = structure
+
+    @property
+    def cost(self) -> float:
+        """Return the cost of this node"""
+
+        return self.structure.cost.item(self.id)
+
+    @cost.setter
+    def cost(self, value: float) -> None:
+        self.structure.cost[self.id] = value
+
+    @property
+    def heuristic(self) -> float:
+        """Return the heuristic value of this node"""
+
+        return self.structure.heuristic.item(self.id)
+
+    @heuristic.setter
+    def heuristic(self, value: float) -> None:
+        self.structure.heuristic[self.id] = value
+
+
+class _MappedNodes:
+    """Nodes of a loaded structure by index, each created on first access
+    so loading does not create an object per node
+    """
+
+    def __init__(self,
+        structure,
+        count: int,
+        depth: np.ndarray | None=None
+    ) -> None:
+        self.structure = structure
+        self.depth = depth
+        self._count = count
+        self._nodes: Dict[int, _MappedNode] = {}
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> _MappedNode:
+        index = int(index)
+        node = self._nodes.get(index)
+        if node is not None:
+            return node
+
+        if index < 0:
+            return self[index + self._count]
+        if index >= self._count:
+            raise IndexError(f"Node {index} out of range")
+
+        depth = 0 if self.depth is None else self.depth.item(index)
+        node = self._nodes[index] = _MappedNode(index, self.structure, depth)
+
+        return node
+
+    def __iter__(self) -> Iterator[_MappedNode]:
+        return map(self.__getitem__, range(self._count))
+
+
 # ---------------------------------------------------------------------- Graph
 class Graph:
     """Node-based graph structure"""
 
     def __init__(self,
         nodes: List[Node],
-        edges: List[tuple[Node, Node]], # TODO check: references / extra nodes
-        directed: bool=True
+        edges: List[tuple[Node, Node]],
+        directed: bool=True,
+        edge_weights: List[float] | None=None
     ) -> None:
         """A collection of nodes, connected by (un-)directed edges
         
         Args:
             ``nodes``: Collection of nodes in this graph
 
-            ``edges``: Collection of connected pairs of nodes 
+            ``edges``: Collection of connected pairs of nodes, undirected
+                edges are stored once and apply in both directions
 
             ``directed``: Whether edges in this graph are directed
+
+            ``edge_weights``: Optional cost of each edge (default: cost of
+                the node an edge leads to), used by searches given this graph
+                as structure
         """
 
+        self._saved: tuple | None = None
         self.nodes = nodes
-        self.edges = edges
+        self._edges = edges
+        self.directed = directed
+        self._edge_weights = None if edge_weights is None \
+            else list(edge_weights)
+        self.version = 0
+        self._ids: Dict[Node, int] | None = None
+        self._csr: tuple | None = None
+        self._reverse: tuple | None = None
+
+        # node values by index, read by searches through this structure
+        self.cost = _Values(lambda index: self.nodes[index].cost)
+        self.heuristic = _Values(lambda index: self.nodes[index].heuristic)
+
+        if self.edge_weights is not None \
+            and len(self.edge_weights) != len(edges):
+            raise ValueError(f"{len(self.edge_weights)} weights do not match "
+                             f"{len(edges)} edges")
+
+    @classmethod
+    def load(cls, path: str | Path, mmap_mode: str | None='r') -> 'Graph':
+        """Load a graph saved by ``save`` without creating an object per node
+        or edge, searches given the graph as structure run on the stored
+        arrays
+
+        Nodes are created on first access and read their neighbors, cost and
+        heuristic from the arrays, edge tuples are only created once
+        ``edges`` or ``edge_weights`` are used (e.g. by edge changes).
+
+        Args:
+            ``path``: Directory the graph was saved to
+
+            ``mmap_mode``: Memory-map the arrays (shared between processes
+                loading the same graph) with this ``np.load`` mode or read
+                them into memory if ``None`` (default: ``'r'``, node values
+                are then read-only)
+
+        Returns:
+            Graph: graph with the saved costs, heuristics and edges (node
+                info is not saved)
+        """
+
+        arrays, header = _load(path, 'Graph', mmap_mode)
+
+        graph = cls([], [], header['directed'])
+        graph.nodes = _MappedNodes(graph, header['nodes'])
+        graph.cost, graph.heuristic = arrays['cost'], arrays['heuristic']
+        graph._saved = (arrays['edges'], arrays.get('edge_weights'))
+        graph._csr = (graph.version, arrays['indptr'], arrays['indices'],
+                      arrays.get('weights'))
+
+        return graph
+
+    @property
+    def edges(self) -> List[tuple[Node, Node]]:
+        """Return the connected pairs of nodes of this graph"""
+
+        self._unpack()
+
+        return self._edges
+
+    @edges.setter
+    def edges(self, edges: List[tuple[Node, Node]]) -> None:
+        self._unpack()
+        self._edges = edges
+        self.version += 1
+
+    @property
+    def edge_weights(self) -> List[float] | None:
+        """Return the cost of each edge or ``None`` without edge weights"""
+
+        self._unpack()
+
+        return self._edge_weights
+
+    @edge_weights.setter
+    def edge_weights(self, edge_weights: List[float] | None) -> None:
+        self._unpack()
+        self._edge_weights = None if edge_weights is None \
+            else list(edge_weights)
+        self.version += 1
+
+    def save(self, path: str | Path) -> None:
+        """Save the nodes and edges of this graph into a directory of
+        ``.npy`` arrays, which ``load`` can memory-map
+
+        Args:
+            ``path``: Directory to save to (created if missing)
+        """
+
+        indptr, indices = self._adjacency()
+        cost = np.array([node.cost for node in self.nodes], dtype=np.float64)
+        heuristic = np.array([node.heuristic for node in self.nodes],
+                             dtype=np.float64)
+        ends = chain.from_iterable(self.edges)
+        edges = np.fromiter(map(self.index, ends), dtype=np.int64,
+                            count=2 * len(self.edges)).reshape(-1, 2)
+        edge_weights = None if self.edge_weights is None \
+            else np.array(self.edge_weights, dtype=np.float64)
+
+        _save(path, 'Graph', {
+            'cost': cost, 'heuristic': heuristic, 'edges': edges,
+            'edge_weights': edge_weights, 'indptr': indptr,
+            'indices': indices, 'weights': self.weights
+        }, {'nodes': len(self.nodes), 'directed': self.directed})
+
+    def add_edge(self,
+        start: Node,
+        end: Node,
+        weight: float | None=None
+    ) -> List[Node]:
+        """Connect two nodes (in both directions if undirected)
+
+        Args:
+            ``start``: Node the edge starts from
+
+            ``end``: Node the edge leads to
+
+            ``weight``: Optional cost of the edge (default: cost of the node
+                it leads to)
+
+        Returns:
+            list: nodes whose outgoing edges changed
+        """
+
+        pairs = [(start, end)]
+        if not self.directed:
+            pairs.append((end, start))
+
+        # the first weighted edge gives all edges weights
+        if weight is not None and self.edge_weights is None:
+            self.edge_weights = [b.cost for _, b in self.edges]
+        if self.edge_weights is not None:
+            self.edge_weights.append(end.cost if weight is None else weight)
+
+        self.edges.append((start, end))
+        for a, b in pairs:
+            a.neighbors.append(b)
+
+        self.version += 1
+
+        return [a for a, _ in pairs]
+
+    def remove_edge(self, start: Node, end: Node) -> List[Node]:
+        """Disconnect two nodes (in both directions if undirected)
+
+        Args:
+            ``start``: Node the edge starts from
+
+            ``end``: Node the edge leads to
+
+        Returns:
+            list: nodes whose outgoing edges changed
+        """
+
+        pairs = [(start, end)]
+        if not self.directed:
+            pairs.append((end, start))
+
+        for a, b in pairs:
+            if (a, b) in self.edges:
+                i = self.edges.index((a, b))
+                del self.edges[i]
+                if self.edge_weights is not None:
+                    del self.edge_weights[i]
+            if b in a.neighbors:
+                a.neighbors.remove(b)
+
+        self.version += 1
+
+        return [a for a, _ in pairs]
+
+    @property
+    def indptr(self) -> np.ndarray:
+        """Return the offsets of the outgoing edges of all nodes into
+        ``indices`` (compressed sparse rows, rebuilt after edge changes)
+        """
+
+        return self._adjacency()[0]
+
+    @property
+    def indices(self) -> np.ndarray:
+        """Return the target node indices of all outgoing edges, grouped by
+        their start node (compressed sparse rows, rebuilt after edge changes)
+        """
 
-        # add all edges connecting from end to start aswell
-        if not directed:
-            self.edges += list(map(lambda x: (x[1], x[0]), self.edges))
+        return self._adjacency()[1]
+
+    @property
+    def weights(self) -> np.ndarray | None:
+        """Return the cost of all outgoing edges aligned with ``indices``, or
+        ``None`` if this graph has no edge weights
+        """
+
+        self._adjacency()
+
+        return self._csr[3]
+
+    @property
+    def _cells(self) -> List[Node]:
+        """Nodes by index, for the neighbors of loaded nodes"""
+
+        return self.nodes
+
+    def neighbors(self, index: int) -> List[int]:
+        """Return the indices of all nodes reachable from a node
+
+        Args:
+            ``index``: index of the node
+        """
+
+        indptr, indices = self._adjacency()
+
+        return indices[indptr[index]:indptr[index + 1]].tolist()
+
+    def predecessors(self, index: int) -> List[int]:
+        """Return the indices of all nodes with an edge to a node, e.g. for
+        searching backwards from a goal node
+
+        Args:
+            ``index``: index of the node
+        """
+
+        if not self.directed:
+            return self.neighbors(index)
+
+        # reversed edges as compressed sparse rows, built once per version
+        if self._reverse is None or self._reverse[0] != self.version:
+            indptr, indices = self._adjacency()
+            rows = np.repeat(np.arange(len(self.nodes)), np.diff(indptr))
+            counts = np.bincount(indices, minlength=len(self.nodes))
+            self._reverse = (self.version,
+                             np.concatenate([[0], np.cumsum(counts)]),
+                             rows[np.argsort(indices, kind='stable')])
+
+        _, indptr, indices = self._reverse
+
+        return indices[indptr[index]:indptr[index + 1]].tolist()
+
+    def index(self, key: int | Node) -> int:
+        """Return the index of a node in ``nodes``
+
+        Args:
+            ``key``: an index or a reference to the node itself
+        """
+
+        if isinstance(key, SlotNode) and key.id < len(self.nodes) \
+            and self.nodes[key.id] is key:
+            return key.id
+
+        if isinstance(key, Node):
+            if self._ids is None:
+                self._ids = {n: i for i, n in enumerate(self.nodes)}
+            return self._ids[key]
+
+        return int(key)
+
+    def cell(self, index: int) -> Node:
+        """Return the node at an index as used by search algorithms
+
+        Args:
+            ``index``: index of the node
+        """
+
+        return self.nodes[index]
+
+    def connected_components(self) -> np.ndarray:
+        """Return the component label of every node, labels are numbered in
+        order of the first node of each component and directed edges are
+        treated as undirected
+        """
+
+        indptr, indices = self._adjacency()
+        rows = np.repeat(np.arange(len(self.nodes)), np.diff(indptr))
+        labels = _union(len(self.nodes), rows, indices)
+
+        # relabel in order of first occurrence
+        _, first, inverse = np.unique(labels, return_index=True,
+                                      return_inverse=True)
+
+        return np.argsort(np.argsort(first))[inverse]
 
     @property
     def is_connected(self) -> bool:
-        """Return whether this graph contains more than one subgraph"""
+        """Return whether all nodes of this graph are (weakly) connected"""
+
+        labels = self.connected_components()
 
-        return False # TODO
+        return not labels.size or labels.max() == 0
 
     @property
     def is_loop_free(self) -> bool:
-        """Return whether this graph contains atleast one loop"""
+        """Return whether this graph contains no cycle, i.e. is a forest if
+        undirected (an edge given in both directions counts once) or acyclic
+        if directed
+        """
 
-        visited = []
-        for start, end in self.edges:
-            if start in visited:
-                return False
-            visited.append(end)
-        return True
+        indptr, indices = self._adjacency()
+        nodes = len(self.nodes)
+        rows = np.repeat(np.arange(nodes), np.diff(indptr))
 
-    def as_tree(self) -> None:
-        """Return this graph as tree if valid"""
+        if np.any(rows == indices):
+            return False
 
-        if not self.is_loop_free:
+        # forests have one edge less than nodes per component
+        if not self.directed:
+            edges = np.unique(rows * nodes + indices).size // 2
+            components = np.unique(_union(nodes, rows, indices)).size
+            return edges == nodes - components
+
+        # topological order covers all nodes of acyclic graphs
+        indptr, indices = indptr.tolist(), indices.tolist()
+        degree = np.bincount(indices, minlength=nodes).tolist()
+        stack = [i for i, d in enumerate(degree) if d == 0]
+        ordered = 0
+
+        while stack:
+            node = stack.pop()
+            ordered += 1
+            for child in indices[indptr[node]:indptr[node + 1]]:
+                degree[child] -= 1
+                if degree[child] == 0:
+                    stack.append(child)
+
+        return ordered == nodes
+
+    def as_tree(self, root: Node | None=None) -> 'Tree | None':
+        """Return this graph as tree of new nodes (copying cost, heuristic and
+        info of the graph nodes) if it is a connected and loop free graph
+
+        Args:
+            ``root``: Node to become the root of the tree (default: the only
+                node without incoming edges if directed, else the first node)
+        """
+
+        if not self.nodes or not self.is_connected or not self.is_loop_free:
             return None
 
-        return None # TODO
+        indptr, indices = self._adjacency()
+        degree = np.bincount(indices, minlength=len(self.nodes))
+
+        if self.directed:
+            # every node but the root has exactly one parent
+            roots = np.flatnonzero(degree == 0)
+            if len(roots) != 1 or np.any(degree > 1):
+                return None
+            if root is not None and self.index(root) != roots[0]:
+                return None
+            root = int(roots[0])
+        else:
+            root = 0 if root is None else self.index(root)
+
+        copies = []
+        for node in self.nodes:
+            copy = Node()
+            copy.cost, copy.heuristic = node.cost, node.heuristic
+            copy.info = dict(node.info)
+            copies.append(copy)
+
+        # orient edges away from the root
+        indptr, indices = indptr.tolist(), indices.tolist()
+        stack, seen = [root], {root}
+        while stack:
+            node = stack.pop()
+            for child in indices[indptr[node]:indptr[node + 1]]:
+                if child not in seen:
+                    seen.add(child)
+                    copies[child].depth = copies[node].depth + 1
+                    copies[node].neighbors.append(copies[child])
+                    stack.append(child)
+
+        return Tree(copies[root])
+
+    def _unpack(self) -> None:
+        """Create the edge tuples and weights of a loaded graph"""
+
+        if self._saved is None:
+            return
+
+        pairs, weights = self._saved
+        self._saved = None
+        nodes = self.nodes
+        self._edges = [(nodes[a], nodes[b]) for a, b in pairs.tolist()]
+        self._edge_weights = None if weights is None else weights.tolist()
+
+    def _adjacency(self) -> tuple[np.ndarray, np.ndarray]:
+        """Compressed sparse rows of all edges, built once per version"""
+
+        if self._csr is not None and self._csr[0] == self.version:
+            return self._csr[1], self._csr[2]
+
+        self._ids = {n: i for i, n in enumerate(self.nodes)}
+        ends = chain.from_iterable(self.edges)
+        try:
+            pairs = np.fromiter(map(self._ids.__getitem__, ends),
+                                dtype=np.int64, count=2 * len(self.edges))
+        except KeyError as error:
+            raise ValueError("Edge to a node not contained in the graph") \
+                from error
+        pairs = pairs.reshape(-1, 2)
+
+        weights = None if self.edge_weights is None \
+            else np.array(self.edge_weights, dtype=np.float64)
+
+        # undirected edges in both directions, in order of the edges
+        if not self.directed:
+            pairs = np.stack([pairs, pairs[:, ::-1]], axis=1).reshape(-1, 2)
+            weights = None if weights is None else np.repeat(weights, 2)
+
+        order = np.argsort(pairs[:, 0], kind='stable')
+        counts = np.bincount(pairs[:, 0], minlength=len(self.nodes))
+        indptr = np.concatenate([[0], np.cumsum(counts)])
+        indices = pairs[order, 1]
+        weights = None if weights is None else weights[order]
+        self._csr = (self.version, indptr, indices, weights)
+
+        return indptr, indices
+
+
+def _union(nodes: int, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    """Smallest node index of the component of every node, by hooking
+    components along edges and halving paths with numpy
+    """
+
+    labels = np.arange(nodes)
+
+    while rows.size:
+        low, high = labels[rows], labels[cols]
+        pending = low != high
+        rows, cols = rows[pending], cols[pending]
+        low, high = np.minimum(low, high)[pending], np.maximum(low, high)[pending]
+
+        # hook larger onto smaller labels, then point all nodes to roots
+        np.minimum.at(labels, high, low)
+        while True:
+            roots = labels[labels]
+            if np.array_equal(roots, labels):
+                break
+            labels = roots
+
+    return labels
 
 
 # ----------------------------------------------------------------------- Tree
@@ -84,47 +666,407 @@ class Tree:
 
         self.root: Node = root
 
+    @classmethod
+    def load(cls, path: str | Path, mmap_mode: str | None='r') -> 'Tree':
+        """Load a tree saved by ``save``, creating its nodes on first access
+        with their children, cost and heuristic read from the stored arrays
+
+        Args:
+            ``path``: Directory the tree was saved to
+
+            ``mmap_mode``: Memory-map the arrays with this ``np.load`` mode
+                or read them into memory if ``None`` (default: ``'r'``, node
+                values are then read-only)
+
+        Returns:
+            Tree: tree with the saved costs, heuristics and depths (node info
+                is not saved)
+        """
+
+        arrays, header = _load(path, 'Tree', mmap_mode)
+
+        return cls(_SavedTree(arrays, header['nodes'])._cells[0])
+
+    def save(self, path: str | Path) -> None:
+        """Save this tree as parent indices of its nodes in level order into
+        a directory of ``.npy`` arrays
+
+        Args:
+            ``path``: Directory to save to (created if missing)
+        """
+
+        ids: Dict[Node, int] = {}
+        parent, cost, heuristic, depth = [], [], [], []
+        for node, level in self._levels():
+            ids[node] = len(ids)
+            cost.append(node.cost)
+            heuristic.append(node.heuristic)
+            depth.append(level)
+        for node in ids:
+            parent.extend(ids[node] for _ in node.neighbors)
+
+        # children follow their parents, so every parent is known
+        parent = np.array([-1] + parent, dtype=np.int64)
+
+        _save(path, 'Tree', {
+            'parent': parent,
+            'cost': np.array(cost, dtype=np.float64),
+            'heuristic': np.array(heuristic, dtype=np.float64),
+            'depth': np.array(depth, dtype=np.int64)
+        }, {'nodes': len(ids)})
+
     @property
     def effective_branching_factor(self) -> float:
-        """Return the average number of children in this tree"""
+        """Return the branching factor a uniform tree of the same depth would
+        need to contain as many nodes as this tree
+        """
 
-        nodes = []
-        self._get_all_nodes(self.root, nodes)
+        nodes, depth = 0, 0
+        for _, depth in self._levels():
+            nodes += 1
 
-        return np.mean([len(n.neighbors) for n in nodes])
+        if depth == 0:
+            return 0.0
+
+        # nodes = 1 + b + b^2 + ... + b^depth grows with b, bisect for b
+        low, high = 0.0, float(nodes)
+        for _ in range(100):
+            factor = (low + high) / 2
+            if _geometric_sum(factor, depth) < nodes:
+                low = factor
+            else:
+                high = factor
+
+        return (low + high) / 2
 
     @property
     def max_depth(self) -> int:
         """Return depth of deepest node in this tree"""
 
-        return max([t.max_depth for t in self.root.neighbors]) + 1
+        depth = 0
+        for _, depth in self._levels():
+            pass
+
+        return depth
+
+    def preorder(self) -> Iterator[Node]:
+        """Yield all nodes of this tree depth first, each node before its
+        children, keeping one iterator per level of the current branch
+        """
+
+        yield self.root
+        stack = [iter(self.root.neighbors)]
+
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+                continue
+
+            yield child
+            stack.append(iter(child.neighbors))
+
+    def level_order(self) -> Iterator[Node]:
+        """Yield all nodes of this tree breadth first, level by level"""
+
+        for node, _ in self._levels():
+            yield node
 
     def as_graph(self) -> Graph:
-        """Return this tree represented as a graph"""
+        """Return this tree represented as a directed graph of its nodes"""
 
         nodes, edges = [], []
-        self._get_all_nodes(self.root, nodes)
-
-        for node in nodes:
-            for n in node.neighbors:
-                edges.append((node, n))
+        for node in self.level_order():
+            nodes.append(node)
+            edges.extend((node, child) for child in node.neighbors)
 
         return Graph(nodes, edges)
 
-    def _get_all_nodes(self, node, storage):
-        for child in node.neighbors:
-            storage.append(child)
-            self._get_all_nodes(child, storage)
+    def _levels(self) -> Iterator[tuple[Node, int]]:
+        """Yield all nodes with their depth breadth first, only keeping the
+        nodes of at most two levels
+        """
+
+        queue = deque([(self.root, 0)])
+        while queue:
+            node, depth = queue.popleft()
+            yield node, depth
+            queue.extend((child, depth + 1) for child in node.neighbors)
+
+
+class _SavedTree:
+    """Arrays of a loaded tree, read by its nodes"""
+
+    def __init__(self, arrays: Dict[str, np.ndarray], count: int) -> None:
+        self.parent = arrays['parent']
+        self.cost, self.heuristic = arrays['cost'], arrays['heuristic']
+        self._cells = _MappedNodes(self, count, arrays['depth'])
+
+    def neighbors(self, index: int) -> List[int]:
+        """Return the indices of the children of a node, which follow each
+        other in level order
+        """
+
+        start, stop = np.searchsorted(self.parent, [index, index + 1])
+
+        return list(range(start, stop))
+
+
+def _geometric_sum(factor: float, depth: int) -> float:
+    """Number of nodes of a uniform tree, 1 + b + b^2 + ... + b^depth"""
+
+    if factor == 1:
+        return depth + 1.0
+
+    try:
+        return (factor ** (depth + 1) - 1) / (factor - 1)
+    except OverflowError:
+        return float('inf')
+
+
+# ------------------------------------------------------------- Implicit Graph
+class ImplicitGraph:
+    """Graph of hashable states whose edges are generated on demand"""
+
+    def __init__(self,
+        successors: Callable[[Hashable], Iterable[Hashable]],
+        cost: Callable[[Hashable, Hashable], float] | None=None,
+        heuristic: Callable[[Hashable], float] | None=None,
+        predecessors: Callable[[Hashable], Iterable[Hashable]] | None=None,
+        maxsize: int | None=100000
+    ) -> None:
+        """A graph given by a function generating the successors of a state,
+        e.g. the moves of a puzzle, so searches only create the states they
+        actually reach instead of a materialized graph
+
+        Generated successors are kept in a transposition table of the most
+        recently used states, so states expanded again (e.g. by iterative
+        deepening) are not generated twice. Searches refer to states
+        directly, any hashable value (e.g. a tuple) can be a state.
+
+        Args:
+            ``successors``: Function returning all states reachable from a
+                state in one move
+
+            ``cost``: Optional cost ``cost(state, successor)`` of a move
+                (default: one)
+
+            ``heuristic``: Optional estimate of the path cost from a state to
+                the goal (default: zero)
+
+            ``predecessors``: Optional function returning all states with a
+                move to a state, required by bidirectional and incremental
+                searches (pass ``successors`` if all moves are reversible)
+
+            ``maxsize``: Maximum number of states in the transposition table,
+                ``None`` for no limit and zero to disable it (default:
+                100000)
+        """
+
+        self.expand = successors
+        self.move_cost = cost
+        self.heuristic = _Values(heuristic or (lambda state: 0))
+        self.reverse = predecessors
+        self.maxsize = maxsize
+        self.weights = None
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._table: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Return hits, misses and current size of the transposition table"""
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._table),
+            'maxsize': self.maxsize
+        }
+
+    def successors(self, state: Hashable) -> List[tuple[Hashable, float]]:
+        """Return all successors of a state with the cost of moving to them,
+        generated once while the state stays in the transposition table
+
+        Args:
+            ``state``: State to expand
+        """
+
+        with self._lock:
+            pairs = self._table.get(state)
+            if pairs is not None:
+                self._table.move_to_end(state)
+                self.hits += 1
+                return pairs
+            self.misses += 1
+
+        # generate outside of the lock, other threads may expand meanwhile
+        cost = self.move_cost
+        children = list(self.expand(state))
+        pairs = [(child, 1.0) for child in children] if cost is None \
+            else [(child, float(cost(state, child))) for child in children]
+
+        if self.maxsize != 0:
+            with self._lock:
+                self._table[state] = pairs
+                if self.maxsize is not None \
+                    and len(self._table) > self.maxsize:
+                    self._table.popitem(last=False)
+
+        return pairs
+
+    def neighbors(self, state: Hashable) -> List[Hashable]:
+        """Return all states reachable from a state in one move
+
+        Args:
+            ``state``: State to expand
+        """
+
+        return [child for child, _ in self.successors(state)]
+
+    def predecessors(self, state: Hashable) -> List[Hashable]:
+        """Return all states with a move to a state
+
+        Args:
+            ``state``: State to expand backwards
+
+        Raises:
+            ValueError: if this graph has no predecessor function
+        """
+
+        if self.reverse is None:
+            raise ValueError("Searching backwards needs a predecessors "
+                             "function of the implicit graph")
+
+        return list(self.reverse(state))
+
+    def clear(self) -> None:
+        """Empty the transposition table, e.g. after the successor function
+        changed, and increase the version of this graph
+        """
+
+        with self._lock:
+            self._table.clear()
+        self.version += 1
+
+
+class _Values:
+    """Values of states computed on demand, read with ``item`` like the cell
+    arrays of compact grids
+    """
+
+    def __init__(self, function: Callable[[Hashable], float]) -> None:
+        self.item = function
 
 
 # ----------------------------------------------------------------------- Grid
+# movement directions in neighbor order: up, right, down, left followed by
+# upper right, lower right, lower left, upper left
+DIRECTIONS = [
+    (-1, 0), (0, 1), (1, 0), (0, -1), (-1, 1), (1, 1), (1, -1), (-1, -1)
+]
+
+
+def _grid_adjacency(
+    blocked: np.ndarray,
+    diagonal: bool=False
+) -> tuple[np.ndarray, np.ndarray]:
+    """Compute the adjacency of a 2D grid in CSR format from its mask of
+    blocked cells using shifted masks for all movement directions at once
+
+    Args:
+        ``blocked``: Mask of blocked cells
+
+        ``diagonal``: Whether diagonal movement is allowed
+
+    Returns:
+        tuple: row pointers and flat neighbor indices of all cells
+    """
+
+    rows, cols = blocked.shape
+    directions = DIRECTIONS if diagonal else DIRECTIONS[:4]
+    free = ~blocked
+
+    # valid[i, j, d]: cell (i, j) is free and its neighbor in direction d is
+    # inside the grid and free
+    valid = np.zeros((rows, cols, len(directions)), dtype=bool)
+    for d, (di, dj) in enumerate(directions):
+        src_i = slice(max(-di, 0), rows - max(di, 0))
+        src_j = slice(max(-dj, 0), cols - max(dj, 0))
+        dst_i = slice(max(di, 0), rows - max(-di, 0))
+        dst_j = slice(max(dj, 0), cols - max(-dj, 0))
+        valid[src_i, src_j, d] = free[src_i, src_j] & free[dst_i, dst_j]
+
+    valid = valid.reshape(rows * cols, len(directions))
+    offsets = np.array([di * cols + dj for di, dj in directions], np.int32)
+    ids = np.arange(rows * cols, dtype=np.int32)
+
+    indptr = np.zeros(rows * cols + 1, dtype=np.int64)
+    np.cumsum(valid.sum(axis=1), out=indptr[1:])
+    # boolean indexing keeps row-major order, i.e. cell by cell, direction by
+    # direction
+    indices = (ids[:, None] + offsets[None, :])[valid]
+
+    return indptr, indices
+
+
+def _grid_rows(
+    blocked: np.ndarray,
+    cells: np.ndarray,
+    diagonal: bool=False
+) -> tuple[np.ndarray, np.ndarray]:
+    """Compute the adjacency rows of some cells of a 2D grid, in the same
+    order as ``_grid_adjacency``
+
+    Args:
+        ``blocked``: Mask of blocked cells
+
+        ``cells``: Sorted flat indices of the cells
+
+        ``diagonal``: Whether diagonal movement is allowed
+
+    Returns:
+        tuple: number of neighbors of each cell and their flat indices
+    """
+
+    rows, cols = blocked.shape
+    directions = np.array(DIRECTIONS if diagonal else DIRECTIONS[:4])
+    free = ~blocked.ravel()
+
+    # neighbors in all directions, valid if inside the grid and both free
+    row, col = np.divmod(cells, cols)
+    n_row = row[:, None] + directions[None, :, 0]
+    n_col = col[:, None] + directions[None, :, 1]
+    valid = (n_row >= 0) & (n_row < rows) & (n_col >= 0) & (n_col < cols)
+    targets = np.where(valid, n_row * cols + n_col, 0)
+    valid &= free[targets] & free[cells][:, None]
+
+    return valid.sum(axis=1), targets[valid]
+
+
+def _node_type(node: Node) -> str:
+    """Type of a node, without creating the info of slotted nodes"""
+
+    if isinstance(node, SlotNode) and not node.has_info:
+        return ''
+
+    return node.info.get('type', '')
+
+
 class Grid:
     """Node-based 2D grid structure"""
 
     def __init__(self,
         size: tuple[int, int],
         diagonal: bool=False,
-        blocked: np.ndarray | None=None
+        blocked: np.ndarray | None=None,
+        compact: bool=False,
+        slots: bool=False
     ) -> None:
         """Create a 2D grid with the given dimension initialized with empty
         nodes and movement along given directions
@@ -135,51 +1077,189 @@ class Grid:
             ``diagonal``: Whether diagonal movement is allowed
             
             ``blocked``: Optional mask of blocked cells
+
+            ``compact``: Whether to store the grid as flat arrays instead of
+                node objects (cells are then referred to by integer index)
+
+            ``slots``: Whether to create ``SlotNode`` objects with their flat
+                index as id, which read their neighbors from the adjacency
+                arrays and take less than half of the memory of ``Node``
+                objects
         """
 
-        w, h = range(size[0]), range(size[1])
-        self.nodes: np.ndarray = np.array([[Node() for _ in w] for _ in h])
-        if blocked is None:
-            blocked = np.zeros_like(self.nodes, dtype=bool)
-
-        for i in range(size[0]):
-            for j in range(size[1]):
-                # blocked cells
-                if blocked[i, j]:
-                    self.nodes[i, j].info['type'] = 'blocked'
-                    continue
-
-                # add upper neighbor
-                if i > 0 and not blocked[i-1, j]:
-                    self.nodes[i, j].neighbors.append(self.nodes[i-1, j])
-                # add right neighbor
-                if j < size[1]-1 and not blocked[i, j+1]:
-                    self.nodes[i, j].neighbors.append(self.nodes[i, j+1])
-                # add lower neighbor
-                if i < size[0]-1 and not blocked[i+1, j]:
-                    self.nodes[i, j].neighbors.append(self.nodes[i+1, j])
-                # add left neighbor
-                if j > 0 and not blocked[i, j-1]:
-                    self.nodes[i, j].neighbors.append(self.nodes[i, j-1])
-
-                if not diagonal:
-                    continue
-
-                # add upper right neighbor
-                if i > 0 and j < size[1]-1 and not blocked[i-1, j+1]:
-                    self.nodes[i, j].neighbors.append(self.nodes[i-1, j+1])
-                # add lower right neighbor
-                if i < size[0]-1 and j < size[1]-1 and not blocked[i+1, j+1]:
-                    self.nodes[i, j].neighbors.append(self.nodes[i+1, j+1])
-                # add lower left neighbor
-                if i < size[0]-1 and j > 0 and not blocked[i+1, j-1]:
-                    self.nodes[i, j].neighbors.append(self.nodes[i+1, j-1])
-                # add top left neighbor
-                if i > 0 and j > 0 and not blocked[i-1, j-1]:
-                    self.nodes[i, j].neighbors.append(self.nodes[i-1, j-1])
-
-    def __getitem__(self, key: int | tuple[int, int]) -> Node:
-        """Return the node at the given coordinates
+        blocked = np.zeros(size, dtype=bool) if blocked is None \
+            else np.ascontiguousarray(blocked, dtype=bool)
+
+        if blocked.shape != tuple(size):
+            raise ValueError(f"Blocked mask of shape {blocked.shape} " +
+                             f"does not match grid size {tuple(size)}")
+
+        indptr, indices = _grid_adjacency(blocked, diagonal)
+        self._setup(blocked, indptr, indices, diagonal, compact,
+                    slots=slots)
+
+    @classmethod
+    def from_arrays(cls,
+        blocked: np.ndarray,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        diagonal: bool=False,
+        cost: np.ndarray | None=None,
+        heuristic: np.ndarray | None=None,
+        weights: np.ndarray | None=None
+    ) -> 'Grid':
+        """Create a compact grid from precomputed arrays without copying them,
+        e.g. arrays in shared memory
+
+        Args:
+            ``blocked``: Mask of blocked cells
+
+            ``indptr``: Row pointers of the adjacency in CSR format
+
+            ``indices``: Flat neighbor indices of the adjacency in CSR format
+
+            ``diagonal``: Whether diagonal movement is allowed
+
+            ``cost``: Optional cost of each cell (default: ones)
+
+            ``heuristic``: Optional heuristic of each cell (default: ones)
+
+            ``weights``: Optional cost of each edge aligned with ``indices``
+                (default: cost of the entered cell)
+        """
+
+        grid = cls.__new__(cls)
+        grid._setup(blocked, indptr, indices, diagonal, True, cost, heuristic)
+        grid.weights = weights
+
+        return grid
+
+    @classmethod
+    def load(cls,
+        path: str | Path,
+        mmap_mode: str | None='r',
+        compact: bool | None=None
+    ) -> 'Grid':
+        """Load a grid saved by ``save`` without recomputing its adjacency
+
+        Compact grids use the memory-mapped arrays directly, so a new process
+        can answer queries right away and processes loading the same grid
+        share its pages. Use ``mmap_mode='c'`` to change cells of a mapped
+        grid without writing to the file, or ``'r+'`` to write through.
+
+        Args:
+            ``path``: Directory the grid was saved to
+
+            ``mmap_mode``: Memory-map the arrays with this ``np.load`` mode
+                or read them into memory if ``None`` (default: ``'r'``)
+
+            ``compact``: Whether to load as compact grid (default: the mode
+                the grid was saved in)
+
+        Returns:
+            Grid: grid with the saved cells, adjacency and types
+        """
+
+        arrays, header = _load(path, 'Grid', mmap_mode)
+        compact = header['compact'] if compact is None else compact
+        types = {int(i): t for i, t in header['types'].items()}
+
+        if compact:
+            grid = cls.from_arrays(arrays['blocked'], arrays['indptr'],
+                                   arrays['indices'], header['diagonal'],
+                                   arrays['cost'], arrays['heuristic'],
+                                   arrays.get('weights'))
+            grid.types = types
+            return grid
+
+        grid = cls.__new__(cls)
+        grid._setup(np.array(arrays['blocked']), arrays['indptr'],
+                    arrays['indices'], header['diagonal'], False)
+        grid.weights = arrays.get('weights')
+        grid.set_array('cost', arrays['cost'])
+        grid.set_array('heuristic', arrays['heuristic'])
+        grid.version = 0
+        for index, node_type in types.items():
+            grid.nodes.flat[index].info['type'] = node_type
+
+        return grid
+
+    def save(self, path: str | Path) -> None:
+        """Save the cells and adjacency of this grid into a directory of
+        ``.npy`` arrays, which ``load`` can memory-map
+
+        Args:
+            ``path``: Directory to save to (created if missing)
+        """
+
+        if self.compact:
+            types = dict(self.types)
+        else:
+            types = {i: node.info['type']
+                     for i, node in enumerate(self.nodes.flat)
+                     if _node_type(node) not in ('', 'blocked')}
+
+        _save(path, 'Grid', {
+            'blocked': self.blocked, 'indptr': self.indptr,
+            'indices': self.indices, 'cost': self.as_array('cost'),
+            'heuristic': self.as_array('heuristic'), 'weights': self.weights
+        }, {'diagonal': self.diagonal, 'compact': self.compact,
+            'types': {str(i): t for i, t in types.items()}})
+
+    def _setup(self,
+        blocked: np.ndarray,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        diagonal: bool,
+        compact: bool,
+        cost: np.ndarray | None=None,
+        heuristic: np.ndarray | None=None,
+        slots: bool=False
+    ) -> None:
+        """Store grid arrays and create connected nodes if not compact"""
+
+        self.compact = compact
+        self.slots = slots and not compact
+        self.diagonal = diagonal
+        self.blocked: np.ndarray = blocked
+        self.indptr, self.indices = indptr, indices
+        self.weights: np.ndarray | None = None
+        self.version = 0
+        self._ids: Dict[Node, int] | None = None
+
+        # compact mode: cell values in contiguous arrays, no node objects
+        if compact:
+            self.nodes = None
+            self.cost = np.ones(blocked.shape, dtype=np.float64) \
+                if cost is None else cost
+            self.heuristic = np.ones(blocked.shape, dtype=np.float64) \
+                if heuristic is None else heuristic
+            self.types: Dict[int, str] = {}
+            return
+
+        nodes = [_CellNode(i, self) for i in range(blocked.size)] if slots \
+            else [Node() for _ in range(blocked.size)]
+        flat = np.array(nodes, dtype=object)
+        self.nodes: np.ndarray = flat.reshape(blocked.shape)
+        self._cells = nodes if slots else None
+        self.cost = _Values(lambda index: flat[index].cost)
+        self.heuristic = _Values(lambda index: flat[index].heuristic)
+
+        for node in flat[blocked.ravel()]:
+            node.info['type'] = 'blocked'
+
+        # slotted nodes look their neighbors up in the adjacency
+        if slots:
+            return
+
+        # connect nodes according to the precomputed adjacency
+        targets = flat[indices].tolist()
+        for node, i, j in zip(flat, indptr[:-1], indptr[1:]):
+            node.neighbors = targets[i:j]
+
+    def __getitem__(self, key: int | tuple[int, int]) -> Node | int:
+        """Return the node at the given coordinates (or its flat index in
+        compact mode)
         
         Args:
             ``key``: grid coordinates
@@ -187,14 +1267,244 @@ class Grid:
 
         idx = key if isinstance(key, tuple) else (key, key)
 
+        if self.compact:
+            return idx[0] * self.size[1] + idx[1]
+
         return self.nodes[idx]
 
     @property
     def size(self) -> tuple[int, int]:
         """Return the size of this grid"""
 
+        if self.compact:
+            return self.blocked.shape
+
         return self.nodes.shape
 
+    def neighbors(self, index: int) -> List[int]:
+        """Return the flat indices of all cells reachable from a cell
+
+        Args:
+            ``index``: flat index of the cell
+        """
+
+        start, stop = self.indptr[index], self.indptr[index + 1]
+
+        return self.indices[start:stop].tolist()
+
+    def predecessors(self, index: int) -> List[int]:
+        """Return the flat indices of all cells with a move to a cell, the
+        same as its neighbors since grid moves are symmetric
+
+        Args:
+            ``index``: flat index of the cell
+        """
+
+        return self.neighbors(index)
+
+    def index(self, key: int | tuple[int, int] | Node) -> int:
+        """Return the flat index of a cell
+
+        Args:
+            ``key``: grid coordinates, a flat index or a reference to the node
+                itself
+        """
+
+        if isinstance(key, tuple):
+            return key[0] * self.size[1] + key[1]
+
+        # slotted nodes of this grid know their index
+        if isinstance(key, SlotNode) and key.id < self.nodes.size \
+            and self.nodes.flat[key.id] is key:
+            return key.id
+
+        if isinstance(key, Node):
+            if self._ids is None:
+                self._ids = {n: i for i, n in enumerate(self.nodes.flat)}
+            return self._ids[key]
+
+        return int(key)
+
+    def cell(self, index: int) -> Node | int:
+        """Return the reference to a cell as used by search algorithms, i.e.
+        its node (or the flat index itself in compact mode)
+
+        Args:
+            ``index``: flat index of the cell
+        """
+
+        if self.compact:
+            return index
+
+        return self.nodes.flat[index]
+
+    def as_array(self, attribute: str) -> np.ndarray:
+        """Return a cell attribute of all cells as an array of the grid shape,
+        gathered from the nodes of node-based grids
+
+        Args:
+            ``attribute``: either ``'cost'`` or ``'heuristic'``
+        """
+
+        if self.compact:
+            return getattr(self, attribute)
+
+        values = [getattr(node, attribute) for node in self.nodes.flat]
+
+        return np.array(values, dtype=np.float64).reshape(self.size)
+
+    def set_array(self, attribute: str, values: np.ndarray) -> None:
+        """Set a cell attribute of all cells from an array of the grid shape,
+        e.g. a heuristic field towards a goal node, and increase the version
+        of this grid
+
+        Args:
+            ``attribute``: either ``'cost'`` or ``'heuristic'``
+
+            ``values``: new values of all cells
+        """
+
+        values = np.broadcast_to(values, self.size)
+        self.version += 1
+
+        # in place, the arrays may be shared with other processes
+        if self.compact:
+            np.copyto(getattr(self, attribute), values)
+            return
+
+        for node, value in zip(self.nodes.flat, values.ravel().tolist()):
+            setattr(node, attribute, value)
+
+    def set_weights(self, weights: np.ndarray | None) -> None:
+        """Set the cost of every edge, used by searches on compact grids
+        instead of the cost of the entered cell, e.g. for terrain maps or
+        longer diagonal moves
+
+        Args:
+            ``weights``: Cost of each edge aligned with ``indices``, i.e. the
+                cost of moving from cell ``i`` to cell ``indices[k]`` for
+                ``indptr[i] <= k < indptr[i + 1]``, or ``None`` to use the
+                cost of the entered cell again
+        """
+
+        if weights is not None:
+            weights = np.ascontiguousarray(weights, dtype=np.float64)
+            if weights.shape != self.indices.shape:
+                raise ValueError(f"Weights of shape {weights.shape} do not "
+                                 f"match {len(self.indices)} edges")
+
+        self.weights = weights
+        self.version += 1
+
+    def block(self, keys: int | tuple[int, int] | Node | List) -> List:
+        """Block one or more cells, removing all movement from and to them
+
+        Args:
+            ``keys``: grid coordinates, flat indices or references to nodes
+
+        Returns:
+            list: nodes (or indices) whose movement options changed, i.e. the
+                given cells and their surrounding cells
+        """
+
+        return self._update_blocked(keys, True)
+
+    def unblock(self, keys: int | tuple[int, int] | Node | List) -> List:
+        """Unblock one or more cells, allowing movement from and to them
+
+        Args:
+            ``keys``: grid coordinates, flat indices or references to nodes
+
+        Returns:
+            list: nodes (or indices) whose movement options changed, i.e. the
+                given cells and their surrounding cells
+        """
+
+        return self._update_blocked(keys, False)
+
+    def _update_blocked(self,
+        keys: int | tuple[int, int] | Node | List,
+        blocked: bool
+    ) -> List:
+        """Change the blocked mask, patch the adjacency rows of the changed
+        cells and increase the version of this grid
+        """
+
+        keys = keys if isinstance(keys, list) else [keys]
+        cells = [self.index(key) for key in keys]
+
+        # the mask may be shared (e.g. memory-mapped), change a copy
+        self.blocked = self.blocked.copy()
+        self.blocked.flat[cells] = blocked
+
+        # changed cells and their surrounding cells
+        rows, cols = self.size
+        changed = {}
+        for cell in cells:
+            row, col = divmod(cell, cols)
+            for d_row, d_col in [(0, 0)] + DIRECTIONS:
+                i, j = row + d_row, col + d_col
+                if 0 <= i < rows and 0 <= j < cols:
+                    changed[i * cols + j] = None
+
+        self._patch_rows(np.array(sorted(changed), dtype=np.int64))
+        self.version += 1
+
+        if self.compact:
+            return list(changed)
+
+        # reconnect all changed nodes (slotted nodes use the new adjacency)
+        flat = self.nodes.ravel()
+        for cell in cells:
+            flat[cell].info['type'] = 'blocked' if blocked else ''
+        if not self.slots:
+            for cell in changed:
+                flat[cell].neighbors = flat[self.neighbors(cell)].tolist()
+
+        return flat[list(changed)].tolist()
+
+    def _patch_rows(self, cells: np.ndarray) -> None:
+        """Recompute the adjacency rows of some cells and splice them into new
+        arrays (the current ones may be shared), edge weights stay with their
+        edges and new edges cost their entered cell
+        """
+
+        indptr, indices, weights = self.indptr, self.indices, self.weights
+        counts, targets = _grid_rows(self.blocked, cells, self.diagonal)
+        starts, stops = indptr[cells].tolist(), indptr[cells + 1].tolist()
+        offsets = np.concatenate([[0], np.cumsum(counts)]).tolist()
+
+        # unchanged rows between the changed ones are copied as blocks
+        pieces, weight_pieces = [], []
+        previous = 0
+        for k, (start, stop) in enumerate(zip(starts, stops)):
+            row = targets[offsets[k]:offsets[k + 1]]
+            pieces += [indices[previous:start], row]
+            if weights is not None:
+                old = dict(zip(indices[start:stop].tolist(),
+                               weights[start:stop].tolist()))
+                cost = self.cost.item
+                weight_pieces += [weights[previous:start], np.array(
+                    [old.get(t, cost(t)) for t in row.tolist()],
+                    dtype=np.float64)]
+            previous = stop
+        pieces.append(indices[previous:])
+
+        # shift the row pointers behind each changed row
+        indptr = indptr.copy()
+        cells, shift = cells.tolist(), 0
+        for k, cell in enumerate(cells):
+            shift += counts[k] - (stops[k] - starts[k])
+            end = cells[k + 1] + 1 if k + 1 < len(cells) else len(indptr)
+            indptr[cell + 1:end] += shift
+
+        self.indptr = indptr
+        self.indices = np.concatenate(pieces).astype(indices.dtype,
+                                                      copy=False)
+        if weights is not None:
+            weight_pieces.append(weights[previous:])
+            self.weights = np.concatenate(weight_pieces)
+
     def set_start(self, key: int | tuple[int, int] | Node) -> None:
         """Set a node as start node
         
@@ -202,8 +1512,7 @@ class Grid:
             ``key``: grid coordinates or a reference to the node itself
         """
 
-        node = key if isinstance(key, Node) else self[key]
-        node.info['type'] = 'start'
+        self._set_type(key, 'start')
 
     def set_end(self, key: int | tuple[int, int] | Node) -> None:
         """Set a node as goal node
@@ -212,31 +1521,89 @@ class Grid:
             ``key``: grid coordinates or a reference to the node itself
         """
 
+        self._set_type(key, 'end')
+
+    def _set_type(self, key: int | tuple[int, int] | Node, node_type: str):
+        if self.compact:
+            self.types[self.index(key)] = node_type
+            return
+
         node = key if isinstance(key, Node) else self[key]
-        node.info['type'] = 'end'
+        node.info['type'] = node_type
+
+    def _get_type(self, i: int, j: int) -> str:
+        if self.compact:
+            if self.blocked[i, j]:
+                return 'blocked'
+            return self.types.get(self[i, j], '')
+
+        return _node_type(self[i, j])
+
+    def raster(self, path: List[Node | int] | None=None) -> np.ndarray:
+        """Return the color index (into ``COLORS``) of every cell
+
+        Args:
+            ``path``: Optional nodes (or indices) to be marked as path
+        """
+
+        codes = {node_type: i for i, node_type in enumerate(COLORS)}
 
-    def show(self, path: List[Node] | None=None) -> None:
+        if self.compact:
+            raster = np.zeros(self.size, dtype=np.int8)
+            for index, node_type in self.types.items():
+                raster.flat[index] = codes[node_type]
+        else:
+            types = [_node_type(node) for node in self.nodes.flat]
+            raster = np.array([codes[t] for t in types], dtype=np.int8) \
+                .reshape(self.size)
+        raster[self.blocked] = codes['blocked']
+
+        if path:
+            # path cells keep their type as far as it has a path color
+            mask = np.zeros(raster.size, dtype=bool)
+            mask[[self.index(node) for node in path]] = True
+            shift = np.array([codes.get('path_' + t, i)
+                              for i, t in enumerate(COLORS)], dtype=np.int8)
+            raster.flat[mask] = shift[raster.flat[mask]]
+
+        return raster
+
+    def show(self, path: List[Node | int] | None=None) -> None:
         """Plot this 2D grid with additional informations as specified in each
         node
+
+        Args:
+            ``path``: Optional nodes (or indices) to be marked as path
         """
 
-        width, height = self.size
-        kwargs = {'linewidth': 2, 'edgecolor': 'k'}
         _, ax = plt.subplots()
+        self.draw(ax, self.raster(path))
+        plt.show()
 
-        for i in range(width):
-            for j in range(height):
-                # assign correct colors
-                node_type = self[i, j].info.get('type', '')
-                if path and self[i, j] in path:
-                    node_type = 'path_' + node_type
+    def draw(self, ax: plt.Axes, raster: np.ndarray) -> AxesImage:
+        """Draw color indices of all cells as a single image
 
-                kwargs['facecolor'] = COLORS[node_type]
-                ax.add_patch(Rectangle((i, j), 1, 1, **kwargs))
+        Args:
+            ``ax``: Axes to draw in
 
-        plt.xticks(range(width+1), range(width+1))
-        plt.yticks(range(height+1), range(height+1))
-        plt.show()
+            ``raster``: Color indices as returned by ``raster``
+
+        Returns:
+            AxesImage: image to be updated by ``set_data``
+        """
+
+        colors = ListedColormap(list(COLORS.values()))
+        image = ax.imshow(raster, cmap=colors, vmin=-0.5,
+                          vmax=len(COLORS) - 0.5, interpolation='nearest')
+
+        # cell borders only where cells are large enough to be seen
+        if max(self.size) <= 64:
+            ax.set_xticks(np.arange(self.size[1] + 1) - 0.5, minor=True)
+            ax.set_yticks(np.arange(self.size[0] + 1) - 0.5, minor=True)
+            ax.grid(which='minor', color='k', linewidth=1)
+            ax.tick_params(which='minor', length=0)
+
+        return image
 
 
 # ------------------------------------------------ Some Continuous Environment
@@ -1,22 +1,41 @@
 """Pathfinding TODO"""
 
-from typing import List
+from heapq import heapify, heappush, heappop
+from itertools import chain, count
+from time import perf_counter
+from typing import Callable, Dict, List
 
-from queue import Queue, LifoQueue, PriorityQueue
-from mlpy.types import Node, Search, MAX_INT
+import numpy as np
+
+from mlpy.types import Node, Search, instrumented, MAX_INT, MAX_FLOAT
+from mlpy.search.nodes import DIRECTIONS
+from mlpy.search.animation import show_search
+from mlpy.search.frontiers import FifoFrontier, LifoFrontier, \
+    PriorityFrontier
 
 
 # ------------------------------------------------------- Breadth First Search
 class BreadthFirst(Search):
     """Breadth First Search Algorithm"""
 
-    def __init__(self) -> None:
+    def __init__(self, structure=None, bidirectional: bool=False) -> None:
         """Instance of the breadth first search algorithm for pathfinding in
         node based environments
+
+        Args:
+            ``structure``: Optional array-backed structure to search in
+
+            ``bidirectional``: Whether to search from start and goal node
+                simultaneously until both searches meet, searching backwards
+                needs a structure providing predecessors (e.g. a graph, grid
+                or implicit graph with a predecessors function) or node
+                objects connected in both directions
         """
 
-        super().__init__(queue_type=Queue())
+        super().__init__(queue_type=FifoFrontier, structure=structure)
+        self.bidirectional = bidirectional
 
+    @instrumented
     def find(self,
         start: Node,
         end: Node,
@@ -38,32 +57,39 @@ class BreadthFirst(Search):
             list: path to goal node or an empty list if goal was not reached
         """
 
-        self.frontier.put(start)
-        self.visited[start] = None
+        if self.bidirectional:
+            return self._find_bidirectional(start, end, max_iters)
+
+        state = self._reset()
+        frontier, visited = state.frontier, state.visited
+        frontier.put(start)
+        visited[start] = None
 
         # start node is goal node
         if start == end:
             return [start]
 
         # limit loops and stop if no more nodes available
-        while not self.frontier.empty():
+        while not frontier.empty():
             max_iters -= 1
-            node = self.frontier.get()
+            node = frontier.get()
+            self._step_callback(node, len(frontier) + 1)
 
             # check neighbors
-            for child in node.neighbors:
+            for child in self._neighbors(node):
                 # avoid infinite loops
-                if child in self.visited:
+                if child in visited:
                     continue
 
-                self.visited[child] = node
+                visited[child] = node
 
                 # goal node found
                 if child == end:
                     return self._backtrack(start, end)
 
                 # extend search
-                self.frontier.put(child)
+                frontier.put(child)
+                state.generated += 1
 
             # limit number of nodes explored
             if max_iters < 1:
@@ -72,21 +98,99 @@ class BreadthFirst(Search):
         # no goal found (within maximum iterations)
         return []
 
-    def show(self, start, end, max_iters=10000) -> None:
-        """TODO"""
+    def _find_bidirectional(self,
+        start: Node,
+        end: Node,
+        max_iters: int
+    ) -> List[Node]:
+        """Expand whole layers alternately from start and goal node, always
+        growing the smaller side (the less explored one on ties), until both
+        searches meet
+        """
+
+        state = self._reset()
+        forward, backward = {start: None}, {end: None}
+        depths = ({start: 0}, {end: 0})
+        layers = ([start], [end])
+        state.visited, state.backward = forward, backward
+
+        # start node is goal node
+        if start == end:
+            return [start]
+
+        # stop if one side runs out of nodes
+        while layers[0] and layers[1]:
+            sizes = [(len(layers[i]), len(depths[i])) for i in (0, 1)]
+            side = 0 if sizes[0] <= sizes[1] else 1
+            depth, other_depth = depths[side], depths[1 - side]
+            if side == 0:
+                parents, others, expand = forward, backward, self._neighbors
+            else:
+                parents, others, expand = backward, forward, self._predecessors
+
+            meet, best, layer = None, MAX_INT, []
+            for node in layers[side]:
+                max_iters -= 1
+                frontier_size = len(layers[0]) + len(layers[1]) + len(layer)
+                self._step_callback(node, frontier_size)
+
+                # check neighbors (predecessors when searching backwards)
+                for child in expand(node):
+                    # avoid infinite loops
+                    if child in parents:
+                        continue
+
+                    parents[child] = node
+                    depth[child] = depth[node] + 1
+
+                    # both searches met, keep shortest connection of layer
+                    if child in others:
+                        length = depth[child] + other_depth[child]
+                        if length < best:
+                            meet, best = child, length
+
+                    # extend search
+                    layer.append(child)
+                    state.generated += 1
+
+                # limit number of nodes explored
+                if max_iters < 1:
+                    break
+
+            if meet is not None:
+                return self._join(forward, backward, meet)
+
+            if max_iters < 1:
+                break
+
+            layers = (layer, layers[1]) if side == 0 else (layers[0], layer)
+
+        # no goal found (within maximum iterations)
+        return []
+
+    def show(self, start, end, max_iters=10000, grid=None) -> List:
+        """Find a path from start to end, animating the expanded nodes in a
+        grid (see ``show_search``)
+        """
+
+        return show_search(self, start, end, max_iters, grid)
 
 
 # -------------------------------------------------------- Uniform Cost Search
 class UniformCost(Search):
     """Uniform Cost Search Algorithm"""
 
-    def __init__(self) -> None:
+    def __init__(self, structure=None) -> None:
         """Instance of the uniform cost search algorithm for pathfinding in
         node based environments
+
+        Args:
+            ``structure``: Optional array-backed structure to search in
         """
 
-        super().__init__(queue_type=PriorityQueue())
+        super().__init__(queue_type=PriorityFrontier, structure=structure)
 
+    @instrumented
     def find(self,
         start: Node,
         end: Node,
@@ -108,34 +212,40 @@ class UniformCost(Search):
             list: path to goal node or an empty list if goal was not reached
         """
 
-        start.info['priority'] = start.cost
-        self.frontier.put(start)
-        self.visited[start] = None
+        state = self._reset()
+        frontier, visited = state.frontier, state.visited
+        cost = {start: 0.0}
+        frontier.put(start, 0.0)
+        visited[start] = None
 
         # start node is goal node
         if start == end:
             return [start]
 
         # limit loops and stop if no more nodes available
-        while not self.frontier.empty():
+        while not frontier.empty():
             max_iters -= 1
-            node = self.frontier.get()
+            node = frontier.get()
+            self._step_callback(node, len(frontier) + 1)
+
+            # goal node found, no cheaper path can remain
+            if node == end:
+                return self._backtrack(start, end)
 
             # check neighbors
-            for child in node.neighbors:
-                # avoid infinite loops
-                if child in self.visited:
+            node_cost = cost[node]
+            for child, step_cost in self._successors(node):
+                # only keep the cheapest known way to each node
+                new_cost = node_cost + step_cost
+                if new_cost >= cost.get(child, MAX_FLOAT):
                     continue
 
-                self.visited[child] = node
-
-                # goal node found
-                if child == end:
-                    return self._backtrack(start, end)
+                cost[child] = new_cost
+                visited[child] = node
 
                 # extend search
-                child.info['priority'] = child.cost
-                self.frontier.put(child)
+                frontier.put(child, new_cost)
+                state.generated += 1
 
             # limit number of nodes explored
             if max_iters < 1:
@@ -144,21 +254,29 @@ class UniformCost(Search):
         # no goal found (within maximum iterations)
         return []
 
-    def show(self, start, end, max_iters=10000) -> None:
-        """TODO"""
+    def show(self, start, end, max_iters=10000, grid=None) -> List:
+        """Find a path from start to end, animating the expanded nodes in a
+        grid (see ``show_search``)
+        """
+
+        return show_search(self, start, end, max_iters, grid)
 
 
 # --------------------------------------------------- Greedy Best First Search
 class GreedyBestFirst(Search):
     """Greedy Best First Search Algorithm"""
 
-    def __init__(self) -> None:
+    def __init__(self, structure=None) -> None:
         """Instance of the greedy best first search algorithm for pathfinding
         in node based environments
+
+        Args:
+            ``structure``: Optional array-backed structure to search in
         """
 
-        super().__init__(queue_type=PriorityQueue())
+        super().__init__(queue_type=PriorityFrontier, structure=structure)
 
+    @instrumented
     def find(self,
         start: Node,
         end: Node,
@@ -180,34 +298,37 @@ class GreedyBestFirst(Search):
             list: path to goal node or an empty list if goal was not reached
         """
 
-        start.info['priority'] = start.heuristic
-        self.frontier.put(start)
-        self.visited[start] = None
+        state = self._reset()
+        frontier, visited = state.frontier, state.visited
+        frontier.put(start, self._heuristic(start))
+        visited[start] = None
 
         # start node is goal node
         if start == end:
             return [start]
 
         # limit loops and stop if no more nodes available
-        while not self.frontier.empty():
+        while not frontier.empty():
             max_iters -= 1
-            node = self.frontier.get()
+            node = frontier.get()
+            self._step_callback(node, len(frontier) + 1)
 
             # check neighbors
-            for child in node.neighbors:
+            for child in self._neighbors(node):
                 # avoid infinite loops
-                if child in self.visited:
+                if child in visited:
                     continue
 
-                self.visited[child] = node
+                visited[child] = node
 
                 # goal node found
                 if child == end:
                     return self._backtrack(start, end)
 
                 # extend search
-                child.info['priority'] = child.heuristic
-                self.frontier.put(child)
+                priority = self._heuristic(child)
+                frontier.put(child, priority)
+                state.generated += 1
 
             # limit number of nodes explored
             if max_iters < 1:
@@ -216,25 +337,32 @@ class GreedyBestFirst(Search):
         # no goal found (within maximum iterations)
         return []
 
-    def show(self, start, end, max_iters=10000) -> None:
-        """TODO"""
+    def show(self, start, end, max_iters=10000, grid=None) -> List:
+        """Find a path from start to end, animating the expanded nodes in a
+        grid (see ``show_search``)
+        """
+
+        return show_search(self, start, end, max_iters, grid)
 
 
 # --------------------------------------------------------- Depth First Search
 class DepthFirst(Search):
     """Depth First Search Algorithm"""
 
-    def __init__(self, max_depth: int=MAX_INT) -> None:
+    def __init__(self, max_depth: int=MAX_INT, structure=None) -> None:
         """Instance of the depth first search algorithm for pathfinding in
         node based environments
 
         Args:
             ``max_depth``: Optional depth limit to do Depth Limited Search
+
+            ``structure``: Optional array-backed structure to search in
         """
 
-        super().__init__(queue_type=LifoQueue())
+        super().__init__(queue_type=LifoFrontier, structure=structure)
         self.max_depth = max_depth
 
+    @instrumented
     def find(self,
         start: Node,
         end: Node,
@@ -255,37 +383,43 @@ class DepthFirst(Search):
             list: path to goal node or an empty list if goal was not reached
         """
 
-        self.frontier.put(start)
-        self.visited[start] = None
+        depth = {start: 0}
+        state = self._reset()
+        frontier, visited = state.frontier, state.visited
+        frontier.put(start)
+        visited[start] = None
 
         # start node is goal node
         if start == end:
             return [start]
 
         # stop if no more nodes are available
-        while not self.frontier.empty():
+        while not frontier.empty():
             max_iters -= 1
-            node = self.frontier.get()
+            node = frontier.get()
 
             # only explore nodes up to the current max depth
-            if node.depth > self.max_depth:
+            if depth[node] > self.max_depth:
                 continue
 
+            self._step_callback(node, len(frontier) + 1)
+
             # check neighbors
-            for child in node.neighbors:
+            for child in self._neighbors(node):
                 # avoid infinite loops
-                if child in self.visited:
+                if child in visited:
                     continue
 
-                child.depth = node.depth + 1
-                self.visited[child] = node
+                depth[child] = depth[node] + 1
+                visited[child] = node
 
                 # goal node found
                 if child == end:
                     return self._backtrack(start, end)
 
                 # extend search
-                self.frontier.put(child)
+                frontier.put(child)
+                state.generated += 1
 
             # limit number of nodes explored
             if max_iters < 1:
@@ -294,33 +428,43 @@ class DepthFirst(Search):
         # no goal found (within maximum iterations)
         return []
 
-    def show(self, start, end, max_iters=10000) -> None:
-        """TODO"""
+    def show(self, start, end, max_iters=10000, grid=None) -> List:
+        """Find a path from start to end, animating the expanded nodes in a
+        grid (see ``show_search``)
+        """
 
+        return show_search(self, start, end, max_iters, grid)
 
-# ------------------------------------------------- Iterative Deepening Search
-class IterativeDeepening(Search):
-    """Iterative Deepening Search Algorithm"""
 
-    def __init__(self, max_depth: int=MAX_INT) -> None:
-        """Instance of the iterative deepening search algorithm for
-        pathfinding in node based environments
+# ------------------------------------------ Iterative Deepening A Star Search
+class IDAStar(Search):
+    """Iterative Deepening A Star Search Algorithm"""
+
+    def __init__(self, structure=None, max_cost: float=MAX_FLOAT) -> None:
+        """Instance of the iterative deepening A star search algorithm for
+        pathfinding in node based environments, only storing the current
+        path instead of all visited nodes
 
         Args:
-            ``max_depth``: Optional depth limit to do Depth Limited Search
+            ``structure``: Optional array-backed structure to search in
+
+            ``max_cost``: Optional limit of the path cost to search up to
         """
 
-        super().__init__(queue_type=LifoQueue())
-        self.max_depth = max_depth
+        super().__init__(queue_type=LifoFrontier, structure=structure)
+        self.max_cost = max_cost
+        self._prune = False
 
+    @instrumented
     def find(self,
         start: Node,
         end: Node,
         max_iters: int=10000
     ) -> List[Node]:
-        """Use the iterative deepening search algorithm to find the path from
-        a start node to the goal node, limited by a maximum number of nodes to
-        check
+        """Use the iterative deepening A star search algorithm to find the
+        path from a start node to the goal node, searching depth first up to
+        a threshold of path cost plus heuristic value raised after each
+        iteration and limited by a maximum number of nodes to check
 
         Args:
             ``start``: Initial node to start the search from
@@ -334,33 +478,136 @@ class IterativeDeepening(Search):
             list: path to goal node or an empty list if goal was not reached
         """
 
-        for depth in range(self.max_depth):
-            # perform depth first search at each max depth level
-            dfs = DepthFirst(max_depth=depth)
-            path = dfs.find(start, end, max_iters)
-            max_iters -= dfs.iterations
+        state = self._reset()
+        visited = state.visited
 
-            if path:
-                return path
+        # start node is goal node
+        if start == end:
+            return [start]
+
+        threshold = self._heuristic(start)
+        while threshold <= self.max_cost:
+            # cheapest cost of all nodes reached in this iteration (if pruned)
+            best = {start: 0} if self._prune else None
+
+            # nodes on the current path and their children left to check
+            visited[start] = None
+            stack = [(start, 0, iter(self._successors(start)))]
+            exceeded = MAX_FLOAT
+            max_iters -= 1
+            self._step_callback(start, 1)
+
+            while stack:
+                node, cost, children = stack[-1]
+                child, step_cost = next(children, (None, 0))
+
+                # all children checked
+                if child is None:
+                    stack.pop()
+                    del visited[node]
+                    continue
+
+                # avoid loops along the current path
+                if child in visited:
+                    continue
+
+                # beyond the threshold: candidate for the next one
+                new_cost = cost + step_cost
+                estimate = new_cost + self._heuristic(child)
+                if estimate > threshold:
+                    exceeded = min(exceeded, estimate)
+                    continue
+
+                # reached before in this iteration at no higher cost
+                if best is not None:
+                    if best.get(child, MAX_FLOAT) <= new_cost:
+                        continue
+                    best[child] = new_cost
+
+                visited[child] = node
+                state.generated += 1
+
+                # goal node found
+                if child == end:
+                    return self._backtrack(start, end)
+
+                # limit number of nodes explored
+                if max_iters < 1:
+                    return []
+
+                # extend search
+                max_iters -= 1
+                self._step_callback(child, len(stack) + 1)
+                stack.append((child, new_cost, iter(self._successors(child))))
+
+            # no node beyond the threshold left
+            if exceeded == MAX_FLOAT:
+                break
+
+            threshold = exceeded
 
         # no goal found (within maximum iterations)
         return []
 
-    def show(self, start, end, max_iters=10000) -> None:
-        """TODO"""
+    def show(self, start, end, max_iters=10000, grid=None) -> List:
+        """Find a path from start to end, animating the expanded nodes in a
+        grid (see ``show_search``)
+        """
+
+        return show_search(self, start, end, max_iters, grid)
+
+
+# ------------------------------------------------- Iterative Deepening Search
+class IterativeDeepening(IDAStar):
+    """Iterative Deepening Search Algorithm"""
+
+    def __init__(self, max_depth: int=MAX_INT, structure=None) -> None:
+        """Instance of the iterative deepening search algorithm for
+        pathfinding in node based environments, which skips nodes reached
+        again at the same or a greater depth within one iteration, so graphs
+        with many paths to a node are not searched along all of them
+
+        Args:
+            ``max_depth``: Optional depth limit to do Depth Limited Search
+
+            ``structure``: Optional array-backed structure to search in
+        """
+
+        super().__init__(structure=structure, max_cost=max_depth)
+        self.max_depth = max_depth
+        self._prune = True
+
+    def _successors(self, node) -> List[tuple]:
+        """Every step increases the depth by one"""
+        return [(child, 1) for child in self._neighbors(node)]
+
+    def _heuristic(self, node) -> float:
+        """Depth is not estimated"""
+        return 0
 
 
 # -------------------------------------------------------------- A Star Search
 class AStar(Search):
     """A Star Search Algorithm"""
 
-    def __init__(self) -> None:
+    def __init__(self, structure=None, bidirectional: bool=False) -> None:
         """Instance of the A star search algorithm for pathfinding in node
         based environments
+
+        Args:
+            ``structure``: Optional array-backed structure to search in
+
+            ``bidirectional``: Whether to search from start and goal node
+                simultaneously until both searches meet, searching backwards
+                needs a structure providing predecessors (e.g. a graph, grid
+                or implicit graph with a predecessors function) or node
+                objects connected in both directions
         """
 
-        super().__init__(queue_type=PriorityQueue())
+        super().__init__(queue_type=PriorityFrontier, structure=structure)
+        self.bidirectional = bidirectional
 
+    @instrumented
     def find(self,
         start: Node,
         end: Node,
@@ -382,41 +629,997 @@ class AStar(Search):
             list: path to goal node or an empty list if goal was not reached
         """
 
-        start.info['priority'] = start.cost + start.heuristic
-        self.frontier.put(start)
-        self.visited[start] = None
+        if self.bidirectional:
+            return self._find_bidirectional(start, end, max_iters)
+
+        state = self._reset()
+        frontier, visited = state.frontier, state.visited
+        cost = {start: 0.0}
+        frontier.put(start, self._heuristic(start))
+        visited[start] = None
 
         # start node is goal node
         if start == end:
             return [start]
 
         # limit loops and stop if no more nodes available
-        while not self.frontier.empty():
+        while not frontier.empty():
             max_iters -= 1
-            node = self.frontier.get()
+            node = frontier.get()
+            self._step_callback(node, len(frontier) + 1)
+
+            # goal node found
+            if node == end:
+                return self._backtrack(start, end)
 
             # check neighbors
-            for child in node.neighbors:
-                # avoid infinite loops
-                if child in self.visited:
+            node_cost = cost[node]
+            for child, step_cost in self._successors(node):
+                # only keep the cheapest known way to each node, expanded
+                # nodes are reopened if a cheaper way is found
+                new_cost = node_cost + step_cost
+                if new_cost >= cost.get(child, MAX_FLOAT):
                     continue
 
-                self.visited[child] = node
+                cost[child] = new_cost
+                visited[child] = node
 
-                # goal node found
-                if child == end:
-                    return self._backtrack(start, end)
+                # extend search
+                frontier.put(child, new_cost + self._heuristic(child))
+                state.generated += 1
+
+            # limit number of nodes explored
+            if max_iters < 1:
+                break
+
+        # no goal found (within maximum iterations)
+        return []
+
+    def _find_bidirectional(self,
+        start: Node,
+        end: Node,
+        max_iters: int
+    ) -> List[Node]:
+        """Expand nodes alternately from start and goal node, always growing
+        the smaller frontier (the less explored one on ties), until no path
+        cheaper than the best connection found so far can remain
+
+        The forward search is guided by the heuristic while the backward
+        search has no estimate towards the start (it uses zero). Path cost
+        is the sum of the weights of all used edges.
+        """
+
+        state = self._reset()
+        frontiers = (PriorityFrontier(), PriorityFrontier())
+        parents = ({start: None}, {end: None})
+        costs = ({start: 0}, {end: 0})
+        frontiers[0].put(start, self._heuristic(start))
+        frontiers[1].put(end, 0)
+        state.visited, state.backward = parents
+
+        # start node is goal node
+        if start == end:
+            return [start]
+
+        meet, best = None, MAX_FLOAT
+        while not frontiers[0].empty() and not frontiers[1].empty():
+            # no connection can be cheaper than the best one found
+            if best <= max(frontiers[0].peek()[1], frontiers[1].peek()[1]):
+                break
+
+            max_iters -= 1
+            sizes = [(len(frontiers[i]), len(costs[i])) for i in (0, 1)]
+            side = 0 if sizes[0] <= sizes[1] else 1
+            node = frontiers[side].get()
+            frontier_size = len(frontiers[0]) + len(frontiers[1]) + 1
+            self._step_callback(node, frontier_size)
+            cost, other_cost = costs[side], costs[1 - side]
+
+            # check neighbors (predecessors when searching backwards)
+            if side == 0:
+                steps = self._successors(node)
+            else:
+                steps = [(c, self._weight(c, node))
+                         for c in self._predecessors(node)]
+
+            for child, step_cost in steps:
+                new_cost = cost[node] + step_cost
+
+                # only keep the cheapest known way to each node
+                if new_cost >= cost.get(child, MAX_FLOAT):
+                    continue
+
+                cost[child] = new_cost
+                parents[side][child] = node
+
+                # both searches met
+                if child in other_cost and \
+                    new_cost + other_cost[child] < best:
+                    meet, best = child, new_cost + other_cost[child]
 
                 # extend search
-                child.info['priority'] = child.cost + child.heuristic
-                self.frontier.put(child)
+                priority = new_cost + self._heuristic(child) \
+                    if side == 0 else new_cost
+                frontiers[side].put(child, priority)
+                state.generated += 1
 
             # limit number of nodes explored
             if max_iters < 1:
                 break
 
+        if meet is not None:
+            return self._join(parents[0], parents[1], meet)
+
         # no goal found (within maximum iterations)
         return []
 
-    def show(self, start, end, max_iters=10000) -> None:
-        """TODO"""
+    def show(self, start, end, max_iters=10000, grid=None) -> List:
+        """Find a path from start to end, animating the expanded nodes in a
+        grid (see ``show_search``)
+        """
+
+        return show_search(self, start, end, max_iters, grid)
+
+
+# --------------------------------------------------- Anytime Repairing A Star
+class AnytimeAStar(Search):
+    """Anytime Repairing A Star Search Algorithm (ARA*)"""
+
+    def __init__(self,
+        structure=None,
+        weight: float=3.0,
+        step: float=0.5
+    ) -> None:
+        """Instance of the anytime repairing A star search algorithm for
+        pathfinding under a latency budget, quickly finding a path by
+        weighted A star with an inflated heuristic and improving it by
+        repeated searches with decreasing weights while time remains
+
+        Each search reuses the results of the previous one and only expands
+        nodes whose path cost improved. After each search, ``bound`` limits
+        how much more expensive the found path can be than a cheapest one.
+        The heuristic has to be consistent for this bound to hold.
+
+        Args:
+            ``structure``: Optional array-backed structure to search in
+
+            ``weight``: Initial inflation factor of the heuristic, at least
+                one (default: 3)
+
+            ``step``: Decrease of the weight after each search, the last
+                search uses weight one and finds a cheapest path (default:
+                0.5)
+        """
+
+        if weight < 1 or step <= 0:
+            raise ValueError("Weight must be at least 1 and step positive")
+
+        super().__init__(queue_type=PriorityFrontier, structure=structure)
+        self.weight = weight
+        self.step = step
+
+    @property
+    def bound(self) -> float:
+        """Return the suboptimality bound of the path found by the last
+        search, i.e. its cost is at most this factor times the cost of a
+        cheapest path (infinite if no path or no bound was found)
+        """
+
+        return getattr(self.state, 'bound', MAX_FLOAT)
+
+    @property
+    def stats(self) -> Dict[str, int | float]:
+        """Return statistics of the last search and its suboptimality bound"""
+
+        return {**super().stats, 'bound': self.bound}
+
+    @instrumented
+    def find(self,
+        start: Node,
+        end: Node,
+        max_iters: int=10000,
+        timeout: float | None=None
+    ) -> List[Node]:
+        """Use the anytime repairing A star search algorithm to find the path
+        from a start node to the goal node, improving it until it is a
+        cheapest path, the time runs out or the maximum number of nodes to
+        check is reached
+
+        Args:
+            ``start``: Initial node to start the search from
+
+            ``end``: Goal node to be searched for
+
+            ``max_iters``: Maximum number of nodes to be visited by all
+                searches (default: 10000)
+
+            ``timeout``: Optional wall time budget in seconds, checked before
+                each node expansion
+
+        Returns:
+            list: best path to the goal node found in time or an empty list if
+                goal was not reached, see ``bound`` for its quality
+        """
+
+        deadline = MAX_FLOAT if timeout is None else perf_counter() + timeout
+        state = self._reset()
+        state.bound = MAX_FLOAT
+        visited = state.visited
+        cost = {start: 0.0}
+        visited[start] = None
+
+        # start node is goal node
+        if start == end:
+            state.bound = 1.0
+            return [start]
+
+        weight, goal_heuristic = self.weight, self._heuristic(end)
+        frontier = state.frontier
+        frontier.put(start, weight * self._heuristic(start))
+        inconsistent: Dict = {}
+        path, lower = [], 0.0
+
+        while True:
+            closed = set()
+            interrupted = False
+
+            # search until the goal node is as cheap as any frontier node
+            while not frontier.empty():
+                goal_key = cost.get(end, MAX_FLOAT) + weight * goal_heuristic
+                if goal_key <= frontier.peek()[1]:
+                    break
+
+                # limit nodes explored and time spent
+                if max_iters < 1 or perf_counter() >= deadline:
+                    interrupted = True
+                    break
+
+                max_iters -= 1
+                node = frontier.get()
+                closed.add(node)
+                self._step_callback(node, len(frontier) + 1)
+
+                node_cost = cost[node]
+                for child, step_cost in self._successors(node):
+                    new_cost = node_cost + step_cost
+                    if new_cost >= cost.get(child, MAX_FLOAT):
+                        continue
+
+                    cost[child] = new_cost
+                    visited[child] = node
+
+                    # expanded nodes wait for the next search
+                    if child in closed:
+                        inconsistent[child] = None
+                        continue
+
+                    frontier.put(child, new_cost
+                                 + weight * self._heuristic(child))
+                    state.generated += 1
+
+            if end in cost:
+                path = self._backtrack(start, end)
+
+            # a cheapest path costs at least the lowest estimate of all nodes
+            # left after a complete search
+            if not interrupted:
+                lower = min((cost[n] + self._heuristic(n)
+                             for n in chain(frontier, inconsistent)),
+                            default=cost.get(end, MAX_FLOAT))
+            if path and lower > 0:
+                state.bound = max(1.0, min(state.bound, cost[end] / lower))
+
+            # a cheapest path is found or no time is left to improve it
+            if interrupted or not path or weight == 1 or state.bound == 1:
+                return path
+
+            # search again with a smaller weight from all improved nodes
+            weight = max(1.0, weight - self.step)
+            frontier = PriorityFrontier()
+            for node in chain(state.frontier, inconsistent):
+                frontier.put(node, cost[node] + weight * self._heuristic(node))
+            state.frontier, inconsistent = frontier, {}
+
+    def show(self, start, end, max_iters=10000, grid=None) -> List:
+        """Find a path from start to end, animating the expanded nodes in a
+        grid (see ``show_search``)
+        """
+
+        return show_search(self, start, end, max_iters, grid)
+
+
+# --------------------------------------------------- Simplified Memory A Star
+class SMAStar(Search):
+    """Simplified Memory-bounded A Star Search Algorithm"""
+
+    def __init__(self, max_nodes: int=10000, structure=None) -> None:
+        """Instance of the simplified memory-bounded A star search algorithm
+        for pathfinding in node based environments, forgetting the most
+        expensive leaves of its search tree to keep at most a maximum number
+        of nodes in memory
+
+        Args:
+            ``max_nodes``: Maximum number of nodes kept in memory, which is
+                also the maximum number of nodes of a path
+
+            ``structure``: Optional array-backed structure to search in
+        """
+
+        super().__init__(queue_type=PriorityFrontier, structure=structure)
+        self.max_nodes = max_nodes
+
+    @instrumented
+    def find(self,
+        start: Node,
+        end: Node,
+        max_iters: int=10000
+    ) -> List[Node]:
+        """Use the simplified memory-bounded A star search algorithm to find
+        the path from a start node to the goal node, prioritized by path cost
+        and heuristic value and limited by a maximum number of nodes to check
+
+        Args:
+            ``start``: Initial node to start the search from
+            
+            ``end``: Goal node to be searched for
+            
+            ``max_iters``: Maximum number of nodes to be visited
+                (default: 10000)
+
+        Returns:
+            list: path to goal node or an empty list if goal was not reached
+        """
+
+        state = self._reset()
+        frontier, memory = state.frontier, state.visited
+        leaves = []
+        root = _Record(start, None, 0, self._heuristic(start), 0)
+        memory[root] = start
+        self._open(root, leaves)
+
+        # start node is goal node
+        if start == end:
+            return [start]
+
+        # limit loops and stop if no more nodes available
+        while not frontier.empty():
+            record = frontier.peek()[0]
+
+            # no path fits into memory
+            if record.estimate == MAX_FLOAT:
+                break
+
+            max_iters -= 1
+            self._step_callback(record.node, len(frontier))
+
+            # goal node found
+            if record.node == end:
+                return self._trace(record)
+
+            # generate one more successor, forgotten ones keep their estimate
+            successor = self._successor(record)
+            if successor is not None:
+                child, cost, forgotten = successor
+                depth = record.depth + 1
+
+                # too deep to reach the goal within memory
+                estimate = MAX_FLOAT \
+                    if child != end and depth >= self.max_nodes - 1 \
+                    else max(record.estimate, forgotten,
+                             cost + self._heuristic(child))
+
+                node = _Record(child, record, cost, estimate, depth)
+                memory[node] = child
+                record.children[child] = node
+
+                # forget the most expensive leaves to make room
+                while len(memory) > self.max_nodes:
+                    leaf = self._worst_leaf(leaves)
+                    if leaf is None:
+                        break
+                    self._forget(leaf, memory, leaves)
+
+                # extend search
+                self._open(node, leaves)
+                state.generated += 1
+
+            # all successors generated (forgotten ones count as well)
+            if not record.pending:
+                if not record.forgotten:
+                    frontier.remove(record)
+                self._backup(record, leaves)
+
+            # drop outdated heap entries to bound memory
+            if len(leaves) > 4 * self.max_nodes:
+                leaves[:] = [e for e in leaves
+                             if e[-1].alive and e == e[-1].entry()]
+                heapify(leaves)
+                frontier.compact()
+
+            # limit number of nodes explored
+            if max_iters < 1:
+                break
+
+        # no goal found (within maximum iterations)
+        return []
+
+    def show(self, start, end, max_iters=10000, grid=None) -> List:
+        """Find a path from start to end, animating the expanded nodes in a
+        grid (see ``show_search``)
+        """
+
+        return show_search(self, start, end, max_iters, grid)
+
+    def _successor(self, record: '_Record') -> tuple | None:
+        """Return the next successor of a record with its path cost and its
+        estimate when it was forgotten, skipping nodes on the path to it
+        """
+
+        if record.pending is None:
+            record.pending = self._successors(record.node)[::-1]
+
+        while record.pending or record.forgotten:
+            if record.pending:
+                (child, step_cost), forgotten = record.pending.pop(), 0
+            else:
+                child = min(record.forgotten, key=record.forgotten.get)
+                forgotten = record.forgotten.pop(child)
+                step_cost = self._weight(record.node, child)
+
+            # avoid loops along the path to the record
+            ancestor = record
+            while ancestor is not None and ancestor.node != child:
+                ancestor = ancestor.parent
+
+            if ancestor is None:
+                return child, record.cost + step_cost, forgotten
+
+        return None
+
+    def _backup(self, record: '_Record', leaves: List) -> None:
+        """Raise the estimates of a completely generated record and its
+        ancestors to the cheapest estimate of their (forgotten) successors
+        """
+
+        while record is not None and record.pending == []:
+            estimate = min(
+                [c.estimate for c in record.children.values()]
+                + list(record.forgotten.values()), default=MAX_FLOAT
+            )
+            if estimate <= record.estimate:
+                break
+
+            record.estimate = estimate
+            if record in self.frontier:
+                self.frontier.remove(record)
+                self._open(record, leaves)
+            else:
+                heappush(leaves, record.entry())
+            record = record.parent
+
+    def _open(self, record: '_Record', leaves: List) -> None:
+        """Add a record to the frontier and to the candidates to forget"""
+
+        self.frontier.put(record, (record.estimate, -record.depth))
+        heappush(leaves, record.entry())
+
+    def _worst_leaf(self, leaves: List) -> '_Record | None':
+        """Return the shallowest leaf with the highest estimate other than
+        the start node
+        """
+
+        skipped, worst = [], None
+        while leaves:
+            entry = heappop(leaves)
+            leaf = entry[-1]
+
+            # outdated entry
+            if not leaf.alive or leaf.children or entry != leaf.entry():
+                continue
+
+            if leaf.parent is None:
+                skipped.append(entry)
+                continue
+
+            worst = leaf
+            break
+
+        for entry in skipped:
+            heappush(leaves, entry)
+
+        return worst
+
+    def _forget(self, record: '_Record', memory: Dict, leaves: List) -> None:
+        """Remove a leaf from memory, its parent remembers the estimate to
+        regenerate it once it is the cheapest option again
+        """
+
+        record.alive = False
+        del memory[record]
+        self.frontier.remove(record)
+
+        parent = record.parent
+        del parent.children[record.node]
+
+        if record.estimate < MAX_FLOAT:
+            parent.forgotten[record.node] = record.estimate
+            if parent not in self.frontier:
+                self._open(parent, leaves)
+
+        if not parent.children:
+            heappush(leaves, parent.entry())
+        if parent.pending == []:
+            self._backup(parent, leaves)
+
+    def _trace(self, record: '_Record') -> List[Node]:
+        """Follow the parents of a record back to the start node"""
+
+        self.path = [record.node]
+        while record.parent is not None:
+            record = record.parent
+            self.path.append(record.node)
+        self.path.reverse()
+
+        return self.path
+
+
+class _Record:
+    """Node in the search tree of a memory-bounded search"""
+
+    __slots__ = ('node', 'parent', 'cost', 'estimate', 'depth', 'children',
+                 'pending', 'forgotten', 'alive', 'serial')
+    _serials = count()
+
+    def __init__(self, node, parent, cost, estimate, depth) -> None:
+        self.node = node
+        self.parent = parent
+        self.cost = cost
+        self.estimate = estimate
+        self.depth = depth
+        self.children: Dict = {}
+        self.pending: List | None = None
+        self.forgotten: Dict = {}
+        self.alive = True
+        self.serial = next(self._serials)
+
+    def entry(self) -> tuple:
+        """Heap entry ordering the shallowest most expensive record first"""
+        return -self.estimate, self.depth, self.serial, self
+
+
+# ---------------------------------------------------------- Jump Point Search
+class JumpPoint(Search):
+    """Jump Point Search Algorithm"""
+
+    def __init__(self, structure) -> None:
+        """Instance of the jump point search algorithm for pathfinding on
+        8-connected grids with uniform cost, where every move costs one
+
+        Args:
+            ``structure``: Grid (node-based or compact) with diagonal movement
+        """
+
+        if not structure.diagonal:
+            raise ValueError("Jump point search requires diagonal movement")
+
+        super().__init__(queue_type=PriorityFrontier, structure=structure)
+        self._width = structure.size[1] + 2
+        self._free = bytearray()
+        self._version = None
+
+    @instrumented
+    def find(self,
+        start: Node | int,
+        end: Node | int,
+        max_iters: int=10000
+    ) -> List[Node | int]:
+        """Use the jump point search algorithm to find the path from a start
+        node to the goal node, only expanding jump points instead of all
+        symmetric neighbors and limited by a maximum number of jump points to
+        check
+
+        Args:
+            ``start``: Initial node (or index) to start the search from
+            
+            ``end``: Goal node (or index) to be searched for
+            
+            ``max_iters``: Maximum number of jump points to be expanded
+                (default: 10000)
+
+        Returns:
+            list: path to goal node or an empty list if goal was not reached
+        """
+
+        grid = self.structure
+        source, goal = self._pad(grid.index(start)), self._pad(grid.index(end))
+        free = self._free_cells()
+
+        state = self._reset()
+        frontier, visited = state.frontier, state.visited
+        cost = {source: 0}
+        frontier.put(source, self._distance(source, goal))
+        visited[source] = None
+
+        # start node is goal node
+        if source == goal:
+            return [start]
+
+        # limit loops and stop if no more nodes available
+        while not frontier.empty():
+            max_iters -= 1
+            node = frontier.get()
+            self._step_callback(self._unpad(node), len(frontier) + 1)
+
+            # goal node found
+            if node == goal:
+                return self._expand_path(goal)
+
+            # jump along all directions remaining after pruning
+            for direction in self._directions(node, free):
+                jump = self._jump(node, direction, goal, free)
+                if jump is None:
+                    continue
+
+                new_cost = cost[node] + self._distance(node, jump)
+                if new_cost >= cost.get(jump, MAX_FLOAT):
+                    continue
+
+                cost[jump] = new_cost
+                visited[jump] = node
+
+                # extend search
+                priority = new_cost + self._distance(jump, goal)
+                frontier.put(jump, priority)
+                state.generated += 1
+
+            # limit number of nodes explored
+            if max_iters < 1:
+                break
+
+        # no goal found (within maximum iterations)
+        return []
+
+    def show(self, start, end, max_iters=10000, grid=None) -> List:
+        """Find a path from start to end, animating the expanded nodes in a
+        grid (see ``show_search``)
+        """
+
+        return show_search(self, start, end, max_iters, grid)
+
+    def _free_cells(self) -> bytearray:
+        """Return free cells as flat bytes of the grid padded by a border of
+        blocked cells, so jumps need no bounds checks
+        """
+
+        grid = self.structure
+        if self._version != grid.version:
+            self._free = bytearray(np.pad(~grid.blocked, 1).tobytes())
+            self._version = grid.version
+
+        return self._free
+
+    def _pad(self, index: int) -> int:
+        row, col = divmod(index, self._width - 2)
+        return (row + 1) * self._width + col + 1
+
+    def _unpad(self, index: int) -> int:
+        row, col = divmod(index, self._width)
+        return (row - 1) * (self._width - 2) + col - 1
+
+    def _distance(self, a: int, b: int) -> int:
+        """Number of moves between two cells on an empty 8-connected grid"""
+
+        (row_a, col_a), (row_b, col_b) = \
+            divmod(a, self._width), divmod(b, self._width)
+
+        return max(abs(row_a - row_b), abs(col_a - col_b))
+
+    def _step(self, a: int, b: int) -> tuple[int, int]:
+        """Direction of a single move from cell a towards cell b"""
+
+        (row_a, col_a), (row_b, col_b) = \
+            divmod(a, self._width), divmod(b, self._width)
+
+        return (row_b > row_a) - (row_b < row_a), \
+            (col_b > col_a) - (col_b < col_a)
+
+    def _directions(self,
+        node: int,
+        free: bytearray
+    ) -> List[tuple[int, int]]:
+        """Return all directions to jump in from a node, pruning neighbors
+        reachable at no higher cost without passing the node
+        """
+
+        w = self._width
+        parent = self.visited[node]
+
+        # no parent: all directions
+        if parent is None:
+            return DIRECTIONS
+
+        d_row, d_col = self._step(parent, node)
+
+        # diagonal: natural neighbors plus forced ones behind blocked cells
+        if d_row and d_col:
+            steps = [(0, d_col), (d_row, 0), (d_row, d_col)]
+            if not free[node - d_col]:
+                steps.append((d_row, -d_col))
+            if not free[node - d_row * w]:
+                steps.append((-d_row, d_col))
+
+        # horizontal: straight on plus forced diagonals
+        elif d_col:
+            steps = [(0, d_col)]
+            if not free[node + w]:
+                steps.append((1, d_col))
+            if not free[node - w]:
+                steps.append((-1, d_col))
+
+        # vertical: straight on plus forced diagonals
+        else:
+            steps = [(d_row, 0)]
+            if not free[node + 1]:
+                steps.append((d_row, 1))
+            if not free[node - 1]:
+                steps.append((d_row, -1))
+
+        return steps
+
+    def _jump(self,
+        node: int,
+        direction: tuple[int, int],
+        goal: int,
+        free: bytearray
+    ) -> int | None:
+        """Move from a node in a direction until a jump point (the goal, a
+        node with forced neighbors or a diagonal node leading to one) is
+        found, returning None if a blocked cell is hit first
+        """
+
+        w = self._width
+        d_row, d_col = direction
+        vertical = d_row * w
+
+        while True:
+            node += vertical + d_col
+            if not free[node]:
+                return None
+
+            if node == goal:
+                return node
+
+            # diagonal: forced neighbors or straight jumps from here
+            if d_row and d_col:
+                if (not free[node - d_col] and free[node + vertical - d_col])\
+                    or (not free[node - vertical]
+                        and free[node - vertical + d_col]):
+                    return node
+
+                if self._jump(node, (0, d_col), goal, free) is not None \
+                    or self._jump(node, (d_row, 0), goal, free) is not None:
+                    return node
+
+            # horizontal: forced neighbors above or below
+            elif d_col:
+                if (not free[node + w] and free[node + w + d_col]) \
+                    or (not free[node - w] and free[node - w + d_col]):
+                    return node
+
+            # vertical: forced neighbors left or right
+            elif (not free[node + 1] and free[node + vertical + 1]) \
+                or (not free[node - 1] and free[node + vertical - 1]):
+                return node
+
+    def _expand_path(self, goal: int) -> List[Node | int]:
+        """Backtrack the jump points from the goal and fill in all cells
+        passed between consecutive jump points
+        """
+
+        jumps = [goal]
+        while self.visited[jumps[-1]] is not None:
+            jumps.append(self.visited[jumps[-1]])
+        jumps.reverse()
+
+        cells = [jumps[0]]
+        for a, b in zip(jumps, jumps[1:]):
+            d_row, d_col = self._step(a, b)
+            while cells[-1] != b:
+                cells.append(cells[-1] + d_row * self._width + d_col)
+
+        self.path = [self.structure.cell(self._unpad(c)) for c in cells]
+        return self.path
+
+
+# ------------------------------------------------------------- D* Lite Search
+class DStarLite(Search):
+    """D* Lite Incremental Search Algorithm"""
+
+    def __init__(self,
+        structure=None,
+        heuristic: Callable | None=None
+    ) -> None:
+        """Instance of the D* Lite algorithm for repeated pathfinding towards
+        the same goal in changing node based environments, keeping its
+        search results between calls to only repair affected parts
+
+        These results are shared by all threads, use one planner per agent.
+
+        Example:
+            ``path = planner.find(start, end)``
+
+            ``changed = grid.block((3, 4))``
+
+            ``planner.update(changed)``
+
+            ``path = planner.find(position, end)``
+
+        Args:
+            ``structure``: Optional array-backed structure to search in,
+                searched backwards from the goal node so it has to provide
+                predecessors (node objects have to be connected in both
+                directions)
+
+            ``heuristic``: Optional consistent estimate ``heuristic(a, b)`` of
+                the path cost between two nodes, or node indices if searching
+                through a structure (default: zero)
+        """
+
+        super().__init__(queue_type=PriorityFrontier, structure=structure)
+        self.heuristic = heuristic or (lambda a, b: 0)
+        self.g: Dict = {}
+        self.rhs: Dict = {}
+        self._queue = PriorityFrontier()
+        self._start = None
+        self._goal = None
+        self._offset = 0
+
+    @instrumented
+    def find(self,
+        start: Node,
+        end: Node,
+        max_iters: int=10000
+    ) -> List[Node]:
+        """Use the D* Lite algorithm to find the path from a start node to
+        the goal node, reusing all results of previous calls with the same
+        goal node and limited by a maximum number of nodes to check
+
+        Args:
+            ``start``: Initial node to start the search from (e.g. the
+                current position of an agent following a previous path)
+            
+            ``end``: Goal node to be searched for
+            
+            ``max_iters``: Maximum number of nodes to be visited
+                (default: 10000)
+
+        Returns:
+            list: path to goal node or an empty list if goal was not reached
+        """
+
+        # new goal node: search from scratch
+        if end != self._goal:
+            self.g, self.rhs = {}, {end: 0}
+            self._start, self._goal, self._offset = start, end, 0
+            self._queue = PriorityFrontier()
+            self._queue.put(end, self._key(end))
+
+        # moved start node: keep priorities valid by a growing offset
+        elif start != self._start:
+            self._offset += self.heuristic(self._start, start)
+            self._start = start
+
+        self.visited = self.g
+
+        # start node is goal node
+        if start == end:
+            return [start]
+
+        if not self._compute(max_iters):
+            return []
+
+        return self._extract(start, end)
+
+    def update(self, changed: List) -> None:
+        """Report nodes whose outgoing edges or cost changed, e.g. as returned
+        by ``Grid.block`` or ``Graph.add_edge``, the path is repaired on the
+        next call to ``find``
+
+        Args:
+            ``changed``: nodes (or indices) whose movement options changed
+        """
+
+        structure = self.structure
+        for node in changed:
+            # nodes of a structure are searched by index
+            if isinstance(node, Node) and hasattr(structure, 'cell'):
+                node = structure.index(node)
+            self._update_vertex(node)
+
+    def show(self, start, end, max_iters=10000, grid=None) -> List:
+        """Find a path from start to end, animating the expanded nodes in a
+        grid (see ``show_search``)
+        """
+
+        return show_search(self, start, end, max_iters, grid)
+
+    def _key(self, node) -> tuple[float, float]:
+        """Priority of a node, smaller values are expanded first"""
+
+        cost = min(self.g.get(node, MAX_FLOAT), self.rhs.get(node, MAX_FLOAT))
+
+        return cost + self.heuristic(self._start, node) + self._offset, cost
+
+    def _lookahead(self, node) -> float:
+        """Cheapest path cost over all successors of a node"""
+
+        return min((step_cost + self.g.get(child, MAX_FLOAT)
+                    for child, step_cost in self._successors(node)),
+                   default=MAX_FLOAT)
+
+    def _update_vertex(self, node) -> None:
+        """Recompute the lookahead cost of a node and queue it if it is
+        inconsistent
+        """
+
+        if node != self._goal:
+            self.rhs[node] = self._lookahead(node)
+
+        self._queue.remove(node)
+        if self.g.get(node, MAX_FLOAT) != self.rhs.get(node, MAX_FLOAT):
+            self._queue.put(node, self._key(node))
+            self.generated += 1
+
+    def _compute(self, max_iters: int) -> bool:
+        """Expand inconsistent nodes backwards from the goal node until the
+        cost of the start node is known
+        """
+
+        start = self._start
+        while not self._queue.empty():
+            node, key = self._queue.peek()
+            g_start = self.g.get(start, MAX_FLOAT)
+            if key >= self._key(start) and \
+                self.rhs.get(start, MAX_FLOAT) == g_start:
+                break
+
+            # outdated priority
+            new_key = self._key(node)
+            if key < new_key:
+                self._queue.remove(node)
+                self._queue.put(node, new_key)
+                continue
+
+            # limit number of nodes explored
+            max_iters -= 1
+            if max_iters < 0:
+                return False
+
+            self._step_callback(node, len(self._queue))
+            self._queue.get()
+            rhs = self.rhs.get(node, MAX_FLOAT)
+
+            # overconsistent: cost decreased
+            if self.g.get(node, MAX_FLOAT) > rhs:
+                self.g[node] = rhs
+                for parent in self._predecessors(node):
+                    self._update_vertex(parent)
+
+            # underconsistent: cost increased
+            else:
+                self.g[node] = MAX_FLOAT
+                for parent in self._predecessors(node) + [node]:
+                    self._update_vertex(parent)
+
+        return self.g.get(start, MAX_FLOAT) < MAX_FLOAT
+
+    def _extract(self, start, end) -> List[Node]:
+        """Follow the cheapest successors from start to goal node"""
+
+        self.path = [start]
+        while self.path[-1] != end:
+            node, _ = min(self._successors(self.path[-1]),
+                key=lambda c: c[1] + self.g.get(c[0], MAX_FLOAT))
+            self.path.append(node)
+
+        return self.path
@@ -0,0 +1,298 @@
+"""Cooperative pathfinding for asyncio applications
+
+Searches run in worker threads but only one of them at a time and only for
+a slice of node expansions, after which control returns to the event loop.
+Long searches therefore never block other coroutines and many queries share
+the loop fairly.
+"""
+
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from typing import Deque, List
+
+from mlpy.types import Node, Search
+
+
+class _Cancelled(Exception):
+    """Raised inside a worker thread to abort a cancelled search"""
+
+
+# --------------------------------------------------------------------- Query
+class _Query:
+    """Single pathfinding request and the handshake with its worker thread"""
+
+    def __init__(self,
+        start: Node | int,
+        end: Node | int,
+        max_iters: int,
+        every: int,
+        loop: asyncio.AbstractEventLoop
+    ) -> None:
+        self.start, self.end, self.max_iters = start, end, max_iters
+        self.every = every
+        self.loop = loop
+        self.future: asyncio.Future = loop.create_future()
+        self.slice: asyncio.Future | None = None
+        self.resume = Event()
+        self.started = self.finished = self.stopped = False
+        self._count = 0
+
+    def run(self, search: Search) -> None:
+        """Search the path in a worker thread, pausing every ``every``
+        expansions until the event loop grants the next slice
+        """
+
+        state = search.state
+        state.checkpoint = self.checkpoint
+        path, error = [], None
+        try:
+            self._wait()
+            path = search.find(self.start, self.end, self.max_iters)
+        except _Cancelled:
+            pass
+        except Exception as exc: # pylint: disable=broad-exception-caught
+            error = exc
+        finally:
+            state.checkpoint = None
+            self.loop.call_soon_threadsafe(self._finish, path, error)
+
+    def checkpoint(self) -> None:
+        """Count an expansion and hand control back after a full slice"""
+
+        self._count += 1
+        if self._count < self.every:
+            return
+
+        self._count = 0
+        self.loop.call_soon_threadsafe(self._pause)
+        self._wait()
+
+    def _wait(self) -> None:
+        """Block the worker thread until its next slice"""
+
+        self.resume.wait()
+        self.resume.clear()
+        if self.stopped:
+            raise _Cancelled
+
+    def _pause(self) -> None:
+        """End the current slice (in the event loop)"""
+
+        if self.slice is not None and not self.slice.done():
+            self.slice.set_result(None)
+
+    def _finish(self, path: List, error: Exception | None) -> None:
+        """Deliver the result and end the last slice (in the event loop)"""
+
+        self.finished = True
+        if not self.future.done():
+            if error is not None:
+                self.future.set_exception(error)
+            else:
+                self.future.set_result(path)
+        self._pause()
+
+
+# ------------------------------------------------------------ Search Service
+class SearchService:
+    """Request queue scheduling concurrent pathfinding queries of one search
+    algorithm fairly on an asyncio event loop
+    """
+
+    def __init__(self,
+        search: Search,
+        every: int=256,
+        concurrency: int=8
+    ) -> None:
+        """Serve queries round robin, each running for at most ``every``
+        node expansions before the next one (and any other coroutine) gets
+        its turn
+
+        Up to ``concurrency`` queries are in progress at once, each in its
+        own worker thread sharing the search instance (its results are kept
+        per thread), further queries wait in order of arrival.
+
+        Example:
+            ``async with SearchService(AStar(grid)) as service:``
+
+            ``    path = await service.find(start, end, timeout=0.05)``
+
+        Args:
+            ``search``: Search algorithm instance to answer all queries with
+
+            ``every``: Number of node expansions per time slice (default:
+                256)
+
+            ``concurrency``: Maximum number of queries in progress
+                (default: 8)
+        """
+
+        if every < 1 or concurrency < 1:
+            raise ValueError("Slices and concurrency must be positive")
+
+        self.search = search
+        self.every = every
+        self.concurrency = concurrency
+        self._pending: Deque[_Query] = deque()
+        self._active: Deque[_Query] = deque()
+        self._wakeup: asyncio.Event | None = None
+        self._runner: asyncio.Task | None = None
+        self._executor: ThreadPoolExecutor | None = None
+
+    async def __aenter__(self) -> 'SearchService':
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    def __len__(self) -> int:
+        return len(self._pending) + len(self._active)
+
+    async def find(self,
+        start: Node | int,
+        end: Node | int,
+        max_iters: int=10000,
+        timeout: float | None=None
+    ) -> List[Node | int]:
+        """Queue a query and wait for its path
+
+        Cancelling the awaiting task cancels the query, its search stops at
+        the end of its current slice.
+
+        Args:
+            ``start``: Initial node (or index) to start the search from
+
+            ``end``: Goal node (or index) to be searched for
+
+            ``max_iters``: Maximum number of nodes to be visited (default:
+                10000)
+
+            ``timeout``: Optional time in seconds for waiting and searching
+
+        Returns:
+            list: path to goal node or an empty list if goal was not reached
+
+        Raises:
+            TimeoutError: if the query took longer than ``timeout``
+        """
+
+        loop = asyncio.get_running_loop()
+        self._start(loop)
+
+        query = _Query(start, end, max_iters, self.every, loop)
+        self._pending.append(query)
+        self._wakeup.set()
+
+        # timeouts and cancellation of the caller cancel the query future
+        return await asyncio.wait_for(query.future, timeout)
+
+    async def close(self) -> None:
+        """Cancel all queries and stop the worker threads"""
+
+        for query in list(self._pending) + list(self._active):
+            query.future.cancel()
+
+        if self._runner is not None:
+            self._wakeup.set()
+            while self._active or self._pending:
+                await asyncio.sleep(0)
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Create the scheduler task and worker threads on first use"""
+
+        if self._runner is not None:
+            return
+
+        self._wakeup = asyncio.Event()
+        self._executor = ThreadPoolExecutor(self.concurrency,
+                                            thread_name_prefix='search')
+        self._runner = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        """Grant one slice to each query in progress in turn"""
+
+        loop = asyncio.get_running_loop()
+
+        while True:
+            # admit waiting queries, dropping cancelled ones
+            while self._pending and len(self._active) < self.concurrency:
+                query = self._pending.popleft()
+                if not query.future.done():
+                    self._active.append(query)
+
+            if not self._active:
+                self._pending.clear()
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            query = self._active.popleft()
+
+            # stop cancelled and timed out queries at their next slice
+            if query.future.done():
+                query.stopped = True
+
+            # stopped queries that never started need no thread
+            if query.stopped and not query.started:
+                continue
+
+            if not query.started:
+                query.started = True
+                loop.run_in_executor(self._executor, query.run, self.search)
+
+            query.slice = loop.create_future()
+            query.resume.set()
+            await query.slice
+
+            if not query.finished:
+                self._active.append(query)
+
+            # let other coroutines run between slices
+            await asyncio.sleep(0)
+
+
+async def find_async(search: Search,
+    start: Node | int,
+    end: Node | int,
+    max_iters: int=10000,
+    every: int=256,
+    timeout: float | None=None
+) -> List[Node | int]:
+    """Find a path with any search algorithm without blocking the event
+    loop, returning control to it every ``every`` node expansions
+
+    Args:
+        ``search``: Search algorithm to find the path with
+
+        ``start``: Initial node (or index) to start the search from
+
+        ``end``: Goal node (or index) to be searched for
+
+        ``max_iters``: Maximum number of nodes to be visited (default:
+            10000)
+
+        ``every``: Number of node expansions between pauses (default: 256)
+
+        ``timeout``: Optional time limit in seconds
+
+    Returns:
+        list: path to goal node or an empty list if goal was not reached
+
+    Raises:
+        TimeoutError: if the search took longer than ``timeout``
+    """
+
+    async with SearchService(search, every, concurrency=1) as service:
+        return await service.find(start, end, max_iters, timeout)
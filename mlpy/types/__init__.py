@@ -1,5 +1,5 @@
 """types"""
 
 from .abstracts import Dataset, Transform, Dataloader, Network, Layer, \
-    Loss, WeightInit, Node, Search
+    Loss, WeightInit, Node, SlotNode, Search, SearchState, instrumented
 from .constants import MAX_FLOAT, MIN_FLOAT, MAX_INT, MIN_INT
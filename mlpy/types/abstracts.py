@@ -1,7 +1,10 @@
 """Abstract base types to be implemented by concrete classes."""
 
 from abc import ABC, abstractmethod
-from typing import Any, List, Dict
+from functools import wraps
+from threading import local
+from time import perf_counter
+from typing import Any, Callable, List, Dict
 
 
 # -------------------------------------------------------------------- Dataset
@@ -124,40 +127,291 @@ class Node(ABC):
         self.heuristic: float = 1
         self.info: Dict = {}
 
-    def __lt__(self, other):
-        return self.info['priority'] < other.info['priority']
 
+@Node.register
+class SlotNode:
+    """Traversable node without attribute dictionary, identified by a dense
+    integer id
+    """
 
-# ----------------------------------------------------------------------- Node
-class Search(ABC):
-    """Abstract search algorithm"""
+    __slots__ = ('id', 'neighbors', 'depth', 'cost', 'heuristic', '_info')
+
+    def __init__(self, index: int=-1) -> None:
+        """Node with fixed attributes, taking a fraction of the memory of a
+        ``Node`` and counted as one by ``isinstance``
+
+        Args:
+            ``index``: Id of this node, e.g. its position in the node list of
+                a graph (or the flat index in a grid), used by structures to
+                look nodes up without hashing
+        """
+
+        self.id: int = index
+        self.neighbors: List = []
+        self.depth: int = 0
+        self.cost: float = 1
+        self.heuristic: float = 1
+        self._info: Dict | None = None
+
+    @property
+    def info(self) -> Dict:
+        """Return additional information of this node (e.g. its type),
+        created on first access
+        """
+
+        if self._info is None:
+            self._info = {}
+        return self._info
+
+    @property
+    def has_info(self) -> bool:
+        """Return whether additional information was stored for this node"""
+
+        return bool(self._info)
+
+
+# --------------------------------------------------------------- Search State
+class SearchState(local):
+    """Results of the last search of a search algorithm, kept separately for
+    each thread so one instance can search concurrently from many threads
+
+    An optional ``checkpoint()`` is called on every node expansion in this
+    thread, e.g. to pause or abort the search from outside.
+    """
 
     def __init__(self, queue_type) -> None:
-        """Instantiate search algorithm"""
+        self.checkpoint: Callable | None = None
         self.path: List = []
         self.visited: Dict = {}
-        self.frontier = queue_type
+        self.backward: Dict = {}
+        self.frontier = queue_type()
         self.iterations = 0
+        self.generated = 0
+        self.frontier_peak = 0
+        self.time = 0.0
+
+
+class _PerThread:
+    """Search attribute delegated to the search state of the current thread"""
+
+    def __init__(self) -> None:
+        self.name = ''
+
+    def __set_name__(self, owner, name: str) -> None:
+        self.name = name
+
+    def __get__(self, search, owner=None):
+        if search is None:
+            return self
+        return getattr(search.state, self.name)
+
+    def __set__(self, search, value) -> None:
+        setattr(search.state, self.name, value)
+
+
+# --------------------------------------------------------------------- Search
+class Search(ABC):
+    """Abstract search algorithm"""
+
+    def __init__(self, queue_type, structure=None) -> None:
+        """Instantiate search algorithm
+
+        Args:
+            ``queue_type``: Frontier class used to store nodes to be expanded,
+                a new frontier is created for each search
+
+            ``structure``: Optional array-backed structure (e.g. a compact
+                grid) providing ``neighbors``, ``cost`` and ``heuristic`` for
+                integer node indices, or an implicit graph generating the
+                ``successors`` of hashable states, used instead of node
+                objects (nodes of a graph or node-based grid given as
+                structure are searched by their indices)
+
+        After each search, ``iterations`` (expanded nodes), ``generated``
+        (nodes added to the frontier), ``frontier_peak`` (maximum frontier
+        size) and ``time`` (wall time in seconds) describe the last search,
+        see ``stats``. An optional ``callback(search, node)`` is called on
+        every node expansion.
+
+        Nodes and structures are only read, all results of a search (path,
+        visited nodes, frontier and statistics) are stored in the ``state``
+        of the calling thread. Threads may share one instance and structure.
+        """
+        self.queue_type = queue_type
+        self.structure = structure
+        self.callback: Callable | None = None
+        self.state = SearchState(queue_type)
+
+    path = _PerThread()
+    visited = _PerThread()
+    backward = _PerThread()
+    frontier = _PerThread()
+    iterations = _PerThread()
+    generated = _PerThread()
+    frontier_peak = _PerThread()
+    time = _PerThread()
+
+    @property
+    def stats(self) -> Dict[str, int | float]:
+        """Return statistics of the last search"""
+        return {
+            'expanded': self.iterations,
+            'generated': self.generated,
+            'frontier_peak': self.frontier_peak,
+            'visited': len(self.visited) + len(self.backward),
+            'time': self.time
+        }
 
     @abstractmethod
     def find(self, start, end, max_iters=10000) -> List[Node]:
         """Abstract method to find a path from start to end"""
 
     @abstractmethod
-    def show(self, start, end, max_iters=10000) -> List[Node]:
+    def show(self, start, end, max_iters=10000, grid=None) -> List[Node]:
         """Abstract method to find a path from start to end, visualizing the
         process
         """
 
-    def _step_callback(self):
-        """Callback function after each node expansion"""
+    def _reset(self) -> SearchState:
+        """Clear visited nodes and frontier of the calling thread left over
+        from a previous search and return its search state
+        """
+        state = self.state
+        state.visited = {}
+        state.backward = {}
+        state.frontier = self.queue_type()
+        return state
+
+    def _neighbors(self, node) -> List:
+        """Return all successors of a node (or node index)"""
+        if self.structure is None:
+            return node.neighbors
+        return self.structure.neighbors(node)
+
+    def _predecessors(self, node) -> List:
+        """Return all nodes (or node indices) with an edge to a node, from the
+        structure if it provides predecessors, else node objects must be
+        connected in both directions (checked for the returned nodes)
+        """
+        if hasattr(self.structure, 'predecessors'):
+            return self.structure.predecessors(node)
+        if self.structure is not None:
+            raise ValueError("Searching backwards needs a structure "
+                             "providing predecessors")
+        for child in node.neighbors:
+            if node not in child.neighbors:
+                raise ValueError("Searching backwards along directed edges "
+                                 "needs a structure providing predecessors, "
+                                 "e.g. a Graph")
+        return node.neighbors
+
+    def _successors(self, node) -> List[tuple]:
+        """Return all successors of a node (or node index) with the cost of
+        moving to them, generated by the structure if it provides
+        ``successors`` (e.g. an implicit graph), else the edge weight if the
+        structure has edge weights and the cost of the successor otherwise
+        """
+        weights = getattr(self.structure, 'weights', None)
+        if weights is None:
+            if hasattr(self.structure, 'successors'):
+                return self.structure.successors(node)
+            return [(child, self._cost(child))
+                    for child in self._neighbors(node)]
+        start, stop = self.structure.indptr[node:node + 2].tolist()
+        return list(zip(self.structure.indices[start:stop].tolist(),
+                        weights[start:stop].tolist()))
+
+    def _weight(self, node, child) -> float:
+        """Return the cost of moving from a node to one of its successors"""
+        weights = getattr(self.structure, 'weights', None)
+        if weights is None:
+            if hasattr(self.structure, 'successors'):
+                step = min((s for c, s in self.structure.successors(node)
+                            if c == child), default=None)
+                if step is None:
+                    raise ValueError(f"No move from {node} to {child}")
+                return step
+            return self._cost(child)
+        start, stop = self.structure.indptr[node:node + 2].tolist()
+        row = self.structure.indices[start:stop].tolist()
+        return weights.item(start + row.index(child))
+
+    def _cost(self, node) -> float:
+        """Return the cost of a node (or node index)"""
+        if self.structure is None:
+            return node.cost
+        return self.structure.cost.item(node)
+
+    def _heuristic(self, node) -> float:
+        """Return the heuristic value of a node (or node index)"""
+        if self.structure is None:
+            return node.heuristic
+        return self.structure.heuristic.item(node)
+
+    def _step_callback(self, node, frontier_size: int) -> None:
+        """Callback function on each node expansion"""
+        state = self.state
+        state.iterations += 1
+        if frontier_size > state.frontier_peak:
+            state.frontier_peak = frontier_size
+        if self.callback is not None:
+            self.callback(self, node)
+        if state.checkpoint is not None:
+            state.checkpoint()
+
+    def _join(self, forward: Dict, backward: Dict, meet) -> List[Node]:
+        """Join the parent maps of a forward and a backward search at the
+        node where both searches met
+        """
+        self.path = [meet]
+        while forward[self.path[-1]] is not None:
+            self.path.append(forward[self.path[-1]])
+        self.path.reverse()
+        while backward[self.path[-1]] is not None:
+            self.path.append(backward[self.path[-1]])
+        return self.path
 
     def _backtrack(self, start, end) -> List[Node]:
         """Backtrack from end to start after the goal node has been found"""
         self.path = [end]
-        previous = end
-        while start not in self.path:
-            self.path.append(self.visited[previous])
-            previous = self.visited[previous]
+        while self.path[-1] != start:
+            self.path.append(self.visited[self.path[-1]])
         self.path.reverse()
         return self.path
+
+
+def instrumented(find: Callable) -> Callable:
+    """Decorator for ``Search.find`` implementations, resetting the
+    statistics of the search and measuring its wall time
+
+    Node objects of a structure with ``index`` and ``cell`` (e.g. a graph or
+    a node-based grid) are searched by their indices, so the search reads
+    costs, heuristics and edge weights from the structure, and the path is
+    returned as nodes again.
+    """
+
+    @wraps(find)
+    def wrapper(self: Search, start, end, *args, **kwargs) -> List[Node]:
+        state = self.state
+        state.iterations = state.generated = state.frontier_peak = 0
+        state.visited, state.backward = {}, {}
+
+        # nodes of a structure (e.g. a weighted graph) are searched by index
+        structure = self.structure
+        by_index = isinstance(start, Node) and hasattr(structure, 'cell')
+        if by_index:
+            start, end = structure.index(start), structure.index(end)
+
+        tic = perf_counter()
+        try:
+            path = find(self, start, end, *args, **kwargs)
+        finally:
+            state.time = perf_counter() - tic
+
+        if by_index:
+            path = state.path = [node if isinstance(node, Node)
+                                 else structure.cell(node) for node in path]
+
+        return path
+
+    return wrapper
@@ -0,0 +1,63 @@
+"""Tests for animated search visualization"""
+
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from mlpy.search import Grid, AStar, BreadthFirst, JumpPoint, animate
+from mlpy.search.nodes import COLORS
+
+matplotlib.use('Agg')
+
+
+def test_animate(tmp_path):
+    """Animations color expanded cells and end with the found path"""
+
+    grid = Grid((8, 8), compact=True)
+    search = BreadthFirst(grid)
+    path, animation = animate(search, grid[0, 0], grid[7, 7], frames=5)
+
+    assert path == BreadthFirst(grid).find(grid[0, 0], grid[7, 7])
+    assert search.callback is None
+
+    animation.save(tmp_path / 'search.gif', writer='pillow')
+    image = np.asarray(plt.gcf().axes[0].images[0].get_array())
+    final = grid.raster(path)
+    expanded = image == list(COLORS).index('expanded')
+
+    assert np.array_equal(image[final > 0], final[final > 0])
+    assert np.all(expanded | (image == final))
+    assert 0 < expanded.sum() <= search.iterations
+
+
+def test_animate_nodes():
+    """Node-based searches are animated in a given grid"""
+
+    grid = Grid((4, 4))
+    path, _ = animate(AStar(), grid[0, 0], grid[3, 3], grid=grid)
+
+    assert path[-1] is grid[3, 3]
+    with pytest.raises(TypeError):
+        animate(AStar(), grid[0, 0], grid[3, 3])
+
+
+def test_animate_jump_point(tmp_path):
+    """Jump point searches animate the expanded jump points of the grid"""
+
+    grid = Grid((10, 10), diagonal=True, compact=True)
+    search = JumpPoint(grid)
+    expanded = []
+    search.callback = lambda _, node: expanded.append(node)
+    path = search.find(0, 99)
+    search.callback = None
+
+    assert expanded[0] == 0 and expanded[-1] == 99
+    assert all(0 <= node < 100 for node in expanded)
+
+    _, animation = animate(search, 0, 99, frames=5)
+    animation.save(tmp_path / 'search.gif', writer='pillow')
+    image = np.asarray(plt.gcf().axes[0].images[0].get_array())
+    final = grid.raster(path)
+
+    assert np.array_equal(image[final > 0], final[final > 0])
@@ -0,0 +1,39 @@
+"""Tests for batch pathfinding"""
+
+import numpy as np
+from mlpy.search import Grid, BreadthFirst, AStar, JumpPoint, find_many
+
+
+def test_find_many():
+    """Batch queries return the same paths as single searches in order"""
+
+    rng = np.random.default_rng(0)
+    blocked = rng.random((20, 20)) < 0.2
+    grid = Grid((20, 20), diagonal=True, blocked=blocked, compact=True)
+    free = np.flatnonzero(~blocked)
+    pairs = [tuple(int(c) for c in rng.choice(free, 2)) for _ in range(12)]
+
+    paths, stats = find_many(grid, pairs, algorithm=BreadthFirst, workers=2,
+                             chunksize=5)
+    bfs = BreadthFirst(structure=grid)
+
+    assert paths == [bfs.find(start, end) for start, end in pairs]
+    assert [s['length'] for s in stats] == [len(p) for p in paths]
+    assert all(s['time'] >= 0 and s['visited'] > 0 for s in stats)
+
+    local, _ = find_many(grid, pairs, algorithm=JumpPoint, workers=1)
+
+    assert [len(p) for p in local] == [len(p) for p in paths]
+
+
+def test_find_many_nodes():
+    """Batch queries on node-based grids return paths of nodes"""
+
+    grid = Grid((5, 6))
+    pairs = [(grid[0, 0], grid[4, 5]), (grid[2, 3], grid[2, 3])]
+
+    paths, _ = find_many(grid, pairs, algorithm=AStar, workers=2)
+
+    assert paths[0][0] is grid[0, 0] and paths[0][-1] is grid[4, 5]
+    assert len(paths[0]) == 10
+    assert paths[1] == [grid[2, 3]]
@@ -0,0 +1,80 @@
+"""Tests for the path cache"""
+
+from mlpy.types import Node
+from mlpy.search import Graph, Grid, BreadthFirst, UniformCost, AStar, \
+    FlowField, PathCache
+
+
+def test_path_cache():
+    """Paths are cached per algorithm class and evicted least recently used
+    first
+    """
+
+    grid = Grid((4, 4), compact=True)
+    cache = PathCache(grid, maxsize=2)
+    bfs, ast = BreadthFirst(structure=grid), AStar(structure=grid)
+
+    path = cache.find(bfs, grid[0, 0], grid[3, 3])
+
+    assert cache.find(bfs, grid[0, 0], grid[3, 3]) == path
+    assert cache.find(ast, grid[0, 0], grid[3, 3])
+    assert cache.stats == {'hits': 1, 'misses': 2, 'size': 2, 'maxsize': 2}
+
+    cache.find(bfs, grid[0, 0], grid[3, 3])
+    cache.find(bfs, grid[1, 1], grid[2, 2])
+
+    assert len(cache) == 2
+    assert cache.find(bfs, grid[0, 0], grid[3, 3]) == path
+    assert cache.hits == 3
+    assert not cache.find(bfs, grid[0, 0], grid[3, 2], max_iters=1)
+    assert len(cache) == 2
+
+
+def test_path_cache_invalidation():
+    """Blocking cells or changing edges invalidates cached paths"""
+
+    grid = Grid((3, 3))
+    cache = PathCache(grid)
+    bfs = BreadthFirst()
+    start, end = grid[0, 0], grid[0, 2]
+
+    assert cache.find(bfs, start, end) == [start, grid[0, 1], end]
+
+    grid.block((0, 1))
+
+    assert grid.version == 1
+    assert grid[0, 1] not in start.neighbors
+    assert cache.find(bfs, start, end)[1] is grid[1, 0]
+    assert cache.misses == 2
+
+    grid.unblock((0, 1))
+
+    assert cache.find(bfs, start, end) == [start, grid[0, 1], end]
+
+    nodes = [Node() for _ in range(3)]
+    graph = Graph(nodes, [], directed=False)
+    cache = PathCache(graph)
+    graph.add_edge(nodes[0], nodes[1])
+
+    assert not cache.find(bfs, nodes[0], nodes[2])
+
+    graph.add_edge(nodes[1], nodes[2])
+
+    assert cache.find(bfs, nodes[0], nodes[2]) == nodes
+    assert cache.find(bfs, nodes[2], nodes[0]) == nodes[::-1]
+
+    graph.remove_edge(nodes[2], nodes[1])
+
+    assert not cache.find(bfs, nodes[0], nodes[2])
+
+    # new cell costs change the cheapest paths
+    grid = Grid((3, 3), compact=True)
+    cache, ucs = PathCache(grid), UniformCost(grid)
+    field = FlowField(grid, grid[0, 2])
+
+    assert grid[0, 1] in cache.find(ucs, grid[0, 0], grid[0, 2])
+
+    grid.set_array('cost', [[1, 9, 1], [1, 1, 1], [1, 1, 1]])
+
+    assert not field.is_current
+    assert grid[0, 1] not in cache.find(ucs, grid[0, 0], grid[0, 2])
@@ -0,0 +1,75 @@
+"""Tests for contraction hierarchies"""
+
+import numpy as np
+import pytest
+
+from mlpy.types import Node
+from mlpy.search import Graph, UniformCost, FlowField, ContractionHierarchy
+
+
+def _road(seed, side=12, directed=False):
+    """Sparse grid-like graph with random node costs and a few long edges"""
+
+    rng = np.random.default_rng(seed)
+    nodes = [Node() for _ in range(side * side)]
+    for node in nodes:
+        node.cost = float(rng.integers(1, 10))
+
+    graph = Graph(nodes, [], directed)
+    for i in range(side * side):
+        if i % side + 1 < side and rng.random() < 0.8:
+            graph.add_edge(nodes[i], nodes[i + 1])
+        if i + side < side * side and rng.random() < 0.8:
+            graph.add_edge(nodes[i], nodes[i + side])
+    for a, b in rng.integers(0, side * side, (side, 2)):
+        graph.add_edge(nodes[a], nodes[b])
+
+    return graph, rng
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_contraction_hierarchy(seed):
+    """Queries find cheapest paths of original edges"""
+
+    graph, rng = _road(seed, directed=seed % 2 == 1)
+    hierarchy = ContractionHierarchy(graph)
+
+    for start, end in rng.integers(0, len(graph.nodes), (20, 2)):
+        expected = FlowField(graph, int(end)).cost(int(start))
+        path = hierarchy.find(graph.nodes[start], graph.nodes[end])
+
+        if not np.isfinite(expected):
+            assert not path
+            continue
+
+        cells = [graph.index(node) for node in path]
+        assert cells[0] == start and cells[-1] == end
+        assert all(b in graph.neighbors(a) for a, b in zip(cells, cells[1:]))
+        assert sum(node.cost for node in path[1:]) == pytest.approx(expected)
+
+
+def test_contraction_expansions(tmp_path):
+    """Queries expand fewer nodes than uniform cost search, saved hierarchies
+    give the same paths
+    """
+
+    graph, rng = _road(0, side=30)
+    hierarchy = ContractionHierarchy(graph)
+    hierarchy.save(tmp_path / 'hierarchy.npz')
+    loaded = ContractionHierarchy.load(tmp_path / 'hierarchy.npz', graph)
+    search = UniformCost()
+    expansions = [0, 0]
+
+    for start, end in rng.integers(0, len(graph.nodes), (20, 2)):
+        start, end = graph.nodes[start], graph.nodes[end]
+        path = hierarchy.find(start, end)
+        expansions[0] += hierarchy.iterations
+        search.find(start, end)
+        expansions[1] += search.iterations
+
+        assert loaded.find(start, end) == path
+
+    assert 3 * expansions[0] < expansions[1]
+    with pytest.raises(ValueError):
+        ContractionHierarchy.load(tmp_path / 'hierarchy.npz',
+                                  Graph([Node()], []))
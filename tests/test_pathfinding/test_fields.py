@@ -0,0 +1,89 @@
+"""Tests for distance and flow fields"""
+
+import numpy as np
+import pytest
+
+from mlpy.types import Node
+from mlpy.search import Graph, Grid, BreadthFirst, FlowField
+from mlpy.search.nodes import DIRECTIONS
+from mlpy.search.heuristics import _dijkstra
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_flow_field(seed):
+    """Every agent follows a cheapest path to the goal"""
+
+    rng = np.random.default_rng(seed)
+    grid = Grid((12, 15), diagonal=seed % 2 == 1,
+                blocked=rng.random((12, 15)) < 0.25, compact=True)
+    if seed % 4 > 1:
+        grid.cost[:] = rng.integers(1, 5, (12, 15))
+    goal = int(rng.choice(np.flatnonzero(~grid.blocked)))
+    field = FlowField(grid, goal)
+
+    # reversed path costs from the goal to every cell
+    cost = grid.cost.ravel()
+    expected = _dijkstra(grid.indptr, grid.indices, cost[grid.indices],
+                         goal) - cost + cost[goal]
+    expected[goal] = 0
+
+    assert np.allclose(field.distance.ravel(), expected)
+
+    for start in np.flatnonzero(~grid.blocked):
+        path = field.path(int(start))
+        if not np.isfinite(expected[start]):
+            assert not path and field.next(int(start)) is None
+            continue
+
+        assert path[0] == start and path[-1] == goal
+        assert all(b in grid.neighbors(a) for a, b in zip(path, path[1:]))
+        assert sum(cost[path[1:]]) == pytest.approx(field.cost(int(start)))
+
+
+def test_flow_field_directions():
+    """Directions point to the next cell in node-based grids"""
+
+    blocked = np.zeros((5, 5), dtype=bool)
+    blocked[2] = True
+    grid = Grid((5, 5), diagonal=True, blocked=blocked)
+    field = FlowField(grid, (0, 0))
+    direction = field.direction
+
+    assert field.next((1, 1)) is grid[0, 0]
+    assert direction[1, 1] == DIRECTIONS.index((-1, -1))
+    assert direction[0, 0] == -1 and np.all(direction[2:] == -1)
+    assert len(field.path(grid[3, 3])) == 0
+    assert len(field.path(grid[0, 3])) \
+        == len(BreadthFirst().find(grid[0, 3], grid[0, 0]))
+
+
+def test_flow_field_graph(tmp_path):
+    """Directed edges are followed in their direction only, saved fields are
+    loaded for the same graph
+    """
+
+    nodes = [Node() for _ in range(5)]
+    edges = [(nodes[0], nodes[1]), (nodes[1], nodes[2]), (nodes[2], nodes[0]),
+             (nodes[3], nodes[2])]
+    for a, b in edges:
+        a.neighbors.append(b)
+    nodes[2].cost = 3
+    graph = Graph(nodes, edges)
+    field = FlowField(graph, nodes[0])
+
+    assert field.distance.tolist() == [0, 4, 1, 4, np.inf]
+    assert field.path(nodes[3]) == [nodes[3], nodes[2], nodes[0]]
+    assert field.path(nodes[4]) == []
+
+    field.save(tmp_path / 'field.npz')
+    loaded = FlowField.load(tmp_path / 'field.npz', graph)
+
+    assert loaded.path(nodes[1]) == [nodes[1], nodes[2], nodes[0]]
+    assert np.array_equal(loaded.parent, field.parent)
+    assert loaded.is_current
+
+    graph.add_edge(nodes[4], nodes[0])
+
+    assert not loaded.is_current
+    with pytest.raises(ValueError):
+        FlowField.load(tmp_path / 'field.npz', Grid((2, 2)))
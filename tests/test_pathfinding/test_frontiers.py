@@ -0,0 +1,33 @@
+"""Tests for the lock-free search frontiers"""
+
+from mlpy.search import FifoFrontier, LifoFrontier, PriorityFrontier
+
+
+def test_fifo_lifo():
+    """Deque-based frontiers return nodes in insertion / reverse order"""
+
+    fifo, lifo = FifoFrontier(), LifoFrontier()
+    for node in range(3):
+        fifo.put(node)
+        lifo.put(node)
+
+    assert len(fifo) == len(lifo) == 3
+    assert [fifo.get() for _ in range(3)] == [0, 1, 2]
+    assert [lifo.get() for _ in range(3)] == [2, 1, 0]
+    assert fifo.empty() and lifo.empty()
+
+
+def test_priority():
+    """Heap-based frontier supports ties, decrease-key and lazy deletion"""
+
+    frontier = PriorityFrontier()
+    frontier.put('a', 3)
+    frontier.put('b', 1)
+    frontier.put('c', 1)
+    frontier.put('a', 0)
+    frontier.put('b', 5)
+
+    assert len(frontier) == 3
+    assert 'a' in frontier
+    assert [frontier.get() for _ in range(3)] == ['a', 'b', 'c']
+    assert frontier.empty()
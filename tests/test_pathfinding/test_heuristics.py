@@ -0,0 +1,119 @@
+"""Tests for heuristic fields and landmarks"""
+
+import numpy as np
+import pytest
+
+from mlpy.search import Grid, AStar, heuristic_field, Landmarks
+from mlpy.search.heuristics import _dijkstra, _edge_costs, _transpose
+
+
+def _maze(seed, size=(15, 15)):
+    """Random compact grid with random cell costs or edge weights"""
+
+    rng = np.random.default_rng(seed)
+    grid = Grid(size, diagonal=seed % 2 == 1,
+                blocked=rng.random(size) < 0.3, compact=True)
+    if seed % 4 > 1:
+        grid.cost[:] = rng.integers(1, 5, size)
+    if seed > 7:
+        grid.set_weights(rng.integers(2, 9, len(grid.indices)))
+
+    return grid, rng
+
+
+def test_heuristic_field():
+    """Fields match the distance formulas scaled by the lowest cost"""
+
+    grid = Grid((4, 6), compact=True)
+    grid.cost[:] = 2
+    rows, cols = np.indices((4, 6))
+
+    assert np.array_equal(heuristic_field(grid, (1, 2), 'manhattan'),
+                          2 * (abs(rows - 1) + abs(cols - 2)))
+    assert np.array_equal(heuristic_field(grid, (1, 2), 'chebyshev', 1),
+                          np.maximum(abs(rows - 1), abs(cols - 2)))
+    assert np.allclose(heuristic_field(grid, (1, 2), 'euclidean', 1),
+                       np.hypot(rows - 1, cols - 2))
+    assert heuristic_field(grid, (1, 2), 'octile', 1)[3, 5] \
+        == pytest.approx(3 + 2 * (np.sqrt(2) - 1))
+
+    with pytest.raises(ValueError):
+        heuristic_field(grid, 0, 'taxicab')
+
+    # weighted grids: lowest edge weight per move
+    grid.set_weights(np.arange(3, 3 + len(grid.indices)))
+
+    assert heuristic_field(grid, (1, 2))[3, 5] == 3 * 5
+
+
+@pytest.mark.parametrize('seed', range(12))
+def test_admissible(seed):
+    """Automatic fields and landmark bounds never overestimate path costs"""
+
+    grid, rng = _maze(seed)
+    landmarks = Landmarks(grid, count=3)
+    free = np.flatnonzero(~grid.blocked)
+
+    for goal in rng.choice(free, 3):
+        # path costs from every cell to the goal along reversed edges
+        to_goal = _dijkstra(*_transpose(*_edge_costs(grid)), int(goal))
+        reachable = np.isfinite(to_goal)
+
+        for field in (heuristic_field(grid, int(goal)),
+                      landmarks.heuristic(int(goal))):
+            assert np.all(np.isfinite(field))
+            assert np.all(field.flat[reachable] <= to_goal[reachable] + 1e-4)
+
+
+def test_landmarks_maze():
+    """Landmark bounds are tighter than distances in a maze and save
+    expansions of A star
+    """
+
+    # wall between start and end with a gap at the bottom
+    grid = Grid((21, 21), compact=True)
+    grid.block([grid[row, 10] for row in range(20)])
+    start, end = grid[0, 0], grid[0, 20]
+
+    landmarks = Landmarks(grid, count=2)
+    alt, manhattan = landmarks.heuristic(end), heuristic_field(grid, end)
+
+    assert landmarks.distances.dtype == np.float32
+    assert np.all(alt[~grid.blocked] >= manhattan[~grid.blocked])
+
+    search = AStar(grid)
+    grid.set_array('heuristic', manhattan)
+    path = search.find(start, end)
+
+    grid.set_array('heuristic', alt)
+
+    assert search.find(start, end) == path
+
+    # every cell lies on a cheapest path between the corners, so A star
+    # expands all of them with any heuristic, unlike next to the wall
+    start = grid[0, 9]
+    grid.set_array('heuristic', manhattan)
+    path = search.find(start, end)
+    expanded = search.iterations
+
+    grid.set_array('heuristic', alt)
+
+    assert len(search.find(start, end)) == len(path)
+    assert search.iterations < expanded
+
+
+def test_set_array():
+    """Arrays are written to cells of both grid modes"""
+
+    values = np.arange(12.).reshape(3, 4)
+    for compact in (True, False):
+        grid = Grid((3, 4), compact=compact)
+        heuristic = grid.as_array('heuristic')
+        grid.set_array('heuristic', values)
+
+        assert np.array_equal(grid.as_array('heuristic'), values)
+        assert grid[1, 2] is not None
+        if compact:
+            assert grid.heuristic is heuristic
+        else:
+            assert grid[1, 2].heuristic == 6
@@ -0,0 +1,94 @@
+"""Tests for hierarchical pathfinding"""
+
+import numpy as np
+import pytest
+
+from mlpy.search import Grid, BreadthFirst, FlowField, HierarchicalAStar
+
+
+def _is_path(grid, path, start, end):
+    """Whether a path leads from start to end along neighboring cells"""
+
+    cells = [grid.index(node) for node in path]
+    return cells[0] == grid.index(start) and cells[-1] == grid.index(end) \
+        and all(b in grid.neighbors(a) for a, b in zip(cells, cells[1:]))
+
+
+def test_hierarchical():
+    """Hierarchical paths exist exactly when a path exists in the grid"""
+
+    rng = np.random.default_rng(0)
+    for trial in range(40):
+        size = tuple(rng.integers(5, 30, 2))
+        blocked = rng.random(size) < 0.3
+        grid = Grid(size, diagonal=trial % 2 == 0, blocked=blocked,
+                    compact=trial % 4 < 2)
+        start, end = (grid.cell(i) for i in
+                      rng.choice(np.flatnonzero(~blocked), 2))
+
+        search = HierarchicalAStar(grid, cluster_size=int(rng.integers(3, 8)))
+        structure = grid if grid.compact else None
+        path = search.find(start, end, max_iters=10**6)
+        optimal = BreadthFirst(structure).find(start, end, max_iters=10**6)
+
+        assert bool(path) == bool(optimal)
+        if path:
+            assert _is_path(grid, path, start, end)
+            assert len(optimal) <= len(path)
+
+
+def test_hierarchical_update():
+    """Blocking cells only rebuilds the touched clusters"""
+
+    grid = Grid((20, 20), compact=True)
+    search = HierarchicalAStar(grid, cluster_size=4)
+    start, end = grid[0, 0], grid[19, 0]
+    far = {n: dict(e) for n, e in search.edges.items() if n >= grid[12, 0]}
+
+    assert _is_path(grid, search.find(start, end), start, end)
+
+    # wall with a single gap at the right border
+    search.update(grid.block([grid[5, col] for col in range(19)]))
+    path = search.find(start, end)
+
+    assert grid[5, 19] in path
+    assert _is_path(grid, path, start, end)
+    assert all(search.edges[n] == e for n, e in far.items())
+    assert search.edges == HierarchicalAStar(grid, cluster_size=4).edges
+
+    search.update(grid.block([grid[5, 19]]))
+
+    assert not search.find(start, end)
+
+
+def test_hierarchical_weights():
+    """Abstract edges follow the edge weights of weighted grids"""
+
+    rng = np.random.default_rng(1)
+    for trial in range(10):
+        blocked = rng.random((12, 12)) < 0.2
+        grid = Grid((12, 12), diagonal=trial % 2 == 0, blocked=blocked,
+                    compact=True)
+        grid.set_weights(rng.integers(1, 9, len(grid.indices)))
+        start, end = (int(i) for i in rng.choice(np.flatnonzero(~blocked), 2))
+        expected = FlowField(grid, end).cost(start)
+
+        # a single cluster is searched exactly
+        search = HierarchicalAStar(grid, cluster_size=12)
+        path = search.find(start, end, max_iters=10**6)
+        weights = [search._step(a, b) for a, b in zip(path, path[1:])]
+
+        assert bool(path) == np.isfinite(expected)
+        if path:
+            assert _is_path(grid, path, start, end)
+            assert sum(weights) == pytest.approx(expected)
+
+        # abstract edges cost as much as the refined paths
+        search = HierarchicalAStar(grid, cluster_size=4)
+        for a, edges in search.edges.items():
+            for b, cost in edges.items():
+                cluster = int(search._cluster[a])
+                if int(search._cluster[b]) == cluster:
+                    assert search._local(a, cluster)[0][b] == cost
+                else:
+                    assert search._step(a, b) == cost
@@ -1,7 +1,11 @@
 """TODO"""
 
 import pytest
-from mlpy.search import Graph, Tree, Grid
+import numpy as np
+from mlpy.types import Node, SlotNode
+from mlpy.search import Graph, Tree, Grid, ImplicitGraph, BreadthFirst, \
+    UniformCost
+from mlpy.search.nodes import COLORS
 
 
 @pytest.fixture(scope='session')
@@ -21,6 +25,115 @@ def test_graph():
 
     assert graph
 
+def _graph(pairs, size, directed=True):
+    """Graph of new nodes connected by index pairs"""
+
+    nodes = [Node() for _ in range(size)]
+    edges = [(nodes[a], nodes[b]) for a, b in pairs]
+
+    return Graph(nodes, edges, directed), nodes
+
+
+def test_graph_adjacency():
+    """Undirected edges are stored once and indexed in both directions"""
+
+    graph, nodes = _graph([(0, 1), (1, 2)], 4, directed=False)
+
+    assert len(graph.edges) == 2
+    assert graph.indptr.tolist() == [0, 1, 3, 4, 4]
+    assert graph.neighbors(1) == [0, 2]
+    assert graph.index(nodes[2]) == 2 and graph.cell(2) is nodes[2]
+
+    graph.add_edge(nodes[3], nodes[0])
+
+    assert graph.neighbors(0) == [1, 3]
+    assert nodes[0].neighbors == [nodes[3]]
+
+    graph.remove_edge(nodes[1], nodes[0])
+
+    assert graph.neighbors(0) == [3] and len(graph.edges) == 2
+
+    with pytest.raises(ValueError):
+        Graph(nodes[:1], [(nodes[0], Node())]).neighbors(0)
+
+
+def test_graph_components():
+    """Components and cycles are found in directed and undirected graphs"""
+
+    pairs = [(0, 1), (2, 1), (3, 4), (5, 5)]
+    graph, _ = _graph(pairs, 7)
+
+    assert graph.connected_components().tolist() == [0, 0, 0, 1, 1, 2, 3]
+    assert not graph.is_connected
+    assert not graph.is_loop_free
+    assert _graph(pairs[:3], 5)[0].is_loop_free
+    assert not _graph(pairs[:3] + [(1, 0)], 5)[0].is_loop_free
+    assert _graph(pairs[:3] + [(1, 0)], 5, directed=False)[0].is_loop_free
+    assert not _graph([(0, 1), (1, 2), (2, 0)], 3, directed=False)[0] \
+        .is_loop_free
+
+    # long chain in reverse order needs many hooks
+    chain, _ = _graph([(i + 1, i) for i in range(9999)], 10000)
+
+    assert chain.is_connected and chain.is_loop_free
+    assert _graph([], 0)[0].is_connected
+
+
+def test_graph_as_tree():
+    """Connected loop free graphs become trees rooted at their source"""
+
+    graph, nodes = _graph([(2, 0), (2, 1), (1, 3)], 4)
+    nodes[3].cost = 5
+    tree = graph.as_tree()
+
+    assert len(tree.root.neighbors) == 2
+    assert tree.root.neighbors[1].neighbors[0].cost == 5
+    assert tree.root.neighbors[1].neighbors[0].depth == 2
+    assert graph.as_tree(nodes[0]) is None
+    assert _graph([(0, 1), (2, 1)], 3)[0].as_tree() is None
+    assert _graph([(0, 1)], 3)[0].as_tree() is None
+
+    graph, nodes = _graph([(2, 0), (2, 1), (1, 3)], 4, directed=False)
+    tree = graph.as_tree(nodes[3])
+
+    assert len(tree.root.neighbors) == 1
+    assert len(tree.root.neighbors[0].neighbors[0].neighbors) == 1
+
+
+def test_graph_save(tmp_path):
+    """Saved graphs load with the same nodes, edges and adjacency"""
+
+    graph, nodes = _graph([(0, 1), (1, 2), (3, 1)], 4, directed=False)
+    nodes[2].cost = 4
+    graph.add_edge(nodes[0], nodes[3], 2.5)
+    graph.save(tmp_path / 'graph')
+    loaded = Graph.load(tmp_path / 'graph')
+    path = UniformCost(loaded).find(loaded.nodes[3], loaded.nodes[2])
+
+    # searches run on the mapped arrays, only creating the nodes they return
+    assert [loaded.index(n) for n in path] == \
+        [graph.index(n) for n in UniformCost(graph).find(nodes[3], nodes[2])]
+    assert len(loaded.nodes._nodes) == 3 and loaded._saved is not None
+    with pytest.raises(ValueError):
+        loaded.nodes[2].cost = 1
+
+    assert not loaded.directed and len(loaded.edges) == 4
+    assert loaded.edge_weights == graph.edge_weights
+    assert isinstance(loaded.indices, np.memmap)
+    assert np.array_equal(loaded.indptr, graph.indptr)
+    assert np.array_equal(loaded.weights, graph.weights)
+    assert loaded.nodes[2].cost == 4
+    assert [loaded.index(n) for n in loaded.nodes[1].neighbors] == \
+        graph.neighbors(1)
+
+    # edge changes rebuild the adjacency in memory
+    loaded.remove_edge(loaded.nodes[1], loaded.nodes[2])
+
+    assert loaded.neighbors(1) == [0, 3]
+    with pytest.raises(ValueError):
+        Tree.load(tmp_path / 'graph')
+
+
 # ----------------------------------------------------------------------- Tree
 def test_tree():
     """TODO"""
@@ -32,6 +145,98 @@ def test_tree():
 
     assert tree
 
+
+def test_tree_traversal():
+    """Traversals yield every node once in their order without recursion"""
+
+    nodes = [Node() for _ in range(7)]
+    for i, node in enumerate(nodes[:3]):
+        node.neighbors = [nodes[2 * i + 1], nodes[2 * i + 2]]
+    tree = Tree(nodes[0])
+    order = {node: i for i, node in enumerate(nodes)}
+
+    assert [order[n] for n in tree.preorder()] == [0, 1, 3, 4, 2, 5, 6]
+    assert [order[n] for n in tree.level_order()] == list(range(7))
+    assert tree.max_depth == 2
+    assert tree.effective_branching_factor == pytest.approx(2)
+
+    graph = tree.as_graph()
+
+    assert graph.nodes[0] is nodes[0] and len(graph.edges) == 6
+    assert graph.as_tree().max_depth == 2
+
+    # chain deeper than the recursion limit
+    chain = [Node() for _ in range(5000)]
+    for parent, child in zip(chain, chain[1:]):
+        parent.neighbors = [child]
+    tree = Tree(chain[0])
+
+    assert tree.max_depth == 4999
+    assert tree.effective_branching_factor == pytest.approx(1)
+    assert sum(1 for _ in tree.preorder()) == 5000
+    assert Tree(Node()).max_depth == 0
+
+
+def test_tree_save(tmp_path):
+    """Saved trees load with their shape and node values in level order"""
+
+    nodes = [Node() for _ in range(6)]
+    nodes[0].neighbors = nodes[1:3]
+    nodes[1].neighbors = nodes[3:5]
+    nodes[2].neighbors = [nodes[5]]
+    for i, node in enumerate(nodes):
+        node.cost = i
+    Tree(nodes[0]).save(tmp_path / 'tree')
+    tree = Tree.load(tmp_path / 'tree', mmap_mode=None)
+
+    assert [n.cost for n in tree.level_order()] == list(range(6))
+    assert [n.cost for n in tree.preorder()] == [0, 1, 3, 4, 2, 5]
+    assert [n.depth for n in tree.level_order()] == [0, 1, 1, 2, 2, 2]
+    assert tree.root.neighbors[1].neighbors[0] is \
+        list(tree.level_order())[-1]
+
+    # nodes read their cost from the loaded arrays
+    tree.root.neighbors[0].cost = 7
+
+    assert [n.cost for n in tree.preorder()] == [0, 7, 3, 4, 2, 5]
+
+
+def test_implicit_graph():
+    """Successors are generated on demand and kept in a bounded table of the
+    most recently used states
+    """
+
+    calls = []
+
+    def successors(state):
+        calls.append(state)
+        return [state + 1, state * 2]
+
+    graph = ImplicitGraph(successors, cost=lambda a, b: b - a, maxsize=2)
+
+    assert graph.successors(3) == [(4, 1.0), (6, 3.0)]
+    assert graph.neighbors(3) == [4, 6]
+    assert graph.heuristic.item(3) == 0
+    with pytest.raises(ValueError):
+        graph.predecessors(3)
+
+    graph.successors(4)
+    graph.successors(5)
+
+    assert len(graph) == 2 and calls == [3, 4, 5]
+    assert graph.stats == {'hits': 1, 'misses': 3, 'size': 2, 'maxsize': 2}
+
+    graph.successors(3)
+
+    assert calls == [3, 4, 5, 3]
+
+    graph.clear()
+
+    assert len(graph) == 0 and graph.version == 1
+    assert len(ImplicitGraph(successors, maxsize=0).successors(1)) == 2
+    assert ImplicitGraph(successors, maxsize=0).stats['size'] == 0
+
+
 # ----------------------------------------------------------------------- Grid
 def test_grid():
     """TODO"""
@@ -42,3 +247,220 @@ def test_grid():
     grid = Grid(size)
 
     assert grid
+
+
+def test_slot_node():
+    """Slotted nodes count as nodes without an attribute dictionary"""
+
+    node = SlotNode(3)
+
+    assert isinstance(node, Node) and node.id == 3
+    assert not hasattr(node, '__dict__')
+    assert not node.has_info
+    node.info['type'] = 'start'
+    assert node.has_info and node.info == {'type': 'start'}
+    with pytest.raises(AttributeError):
+        node.color = 'red'
+
+    nodes = [SlotNode(i) for i in range(3)]
+    graph = Graph(nodes, [(nodes[0], nodes[1]), (nodes[1], nodes[2])])
+    other = SlotNode(1)
+    graph.nodes.append(other)
+
+    assert graph.index(nodes[2]) == 2 and graph._ids is None
+    assert graph.index(other) == 3
+    assert graph.neighbors(1) == [2]
+
+
+def test_slot_grid():
+    """Grids of slotted nodes find nodes by id and search like node grids"""
+
+    blocked = np.zeros((5, 6), dtype=bool)
+    blocked[1:4, 2] = True
+    grid = Grid((5, 6), blocked=blocked, slots=True)
+    expected = Grid((5, 6), blocked=blocked)
+    path = BreadthFirst().find(grid[0, 0], grid[4, 5])
+
+    assert all(isinstance(n, SlotNode) for n in grid.nodes.flat)
+    assert grid.index(grid[2, 3]) == 15
+    assert [grid.index(n) for n in path] == \
+        [expected.index(n) for n in
+         BreadthFirst().find(expected[0, 0], expected[4, 5])]
+    assert grid._ids is None
+    assert np.array_equal(grid.raster(path), expected.raster(
+        [expected.cell(grid.index(n)) for n in path]))
+    assert not grid[0, 0].has_info
+
+    # neighbors are read from the patched adjacency
+    assert grid[0, 0].neighbors == [grid[0, 1], grid[1, 0]]
+    grid.block(grid[0, 1])
+    assert grid[0, 0].neighbors == [grid[1, 0]]
+    assert grid[0, 1].neighbors == []
+
+
+def test_compact_grid():
+    """Compact grids store adjacency as CSR arrays instead of nodes"""
+
+    blocked = np.zeros((3, 3), dtype=bool)
+    blocked[1, 1] = True
+
+    grid = Grid((3, 3), blocked=blocked, compact=True)
+
+    assert grid.nodes is None
+    assert grid.size == (3, 3)
+    assert grid[1, 2] == 5
+    assert grid.neighbors(grid[0, 1]) == [grid[0, 2], grid[0, 0]]
+    assert grid.neighbors(grid[1, 1]) == []
+    assert grid.cost.shape == grid.heuristic.shape == (3, 3)
+
+    diagonal = Grid((3, 3), diagonal=True, compact=True)
+
+    assert diagonal.neighbors(diagonal[1, 1]) == [1, 5, 7, 3, 2, 8, 6, 0]
+
+
+@pytest.mark.parametrize('diagonal', [False, True])
+def test_grid_adjacency(diagonal):
+    """Vectorized construction keeps the neighbor order of a per-cell loop on
+    non-square grids
+    """
+
+    rows, cols = 6, 9
+    blocked = np.random.default_rng(0).random((rows, cols)) < 0.3
+    directions = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+    if diagonal:
+        directions += [(-1, 1), (1, 1), (1, -1), (-1, -1)]
+
+    grid = Grid((rows, cols), diagonal=diagonal, blocked=blocked)
+    compact = Grid((rows, cols), diagonal=diagonal, blocked=blocked,
+                   compact=True)
+
+    assert grid.size == compact.size == (rows, cols)
+
+    for i in range(rows):
+        for j in range(cols):
+            expected = [] if blocked[i, j] else [
+                (i + di, j + dj) for di, dj in directions
+                if 0 <= i + di < rows and 0 <= j + dj < cols
+                and not blocked[i + di, j + dj]
+            ]
+
+            assert grid[i, j].neighbors == [grid[k] for k in expected]
+            assert compact.neighbors(compact[i, j]) == \
+                [compact[k] for k in expected]
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_grid_block(compact):
+    """Blocking and unblocking cells updates the adjacency and version"""
+
+    grid = Grid((4, 5), diagonal=True, compact=compact)
+    grid.block([(1, 1), (2, 3)])
+    grid.unblock((2, 3))
+    expected = Grid((4, 5), diagonal=True, blocked=grid.blocked)
+
+    assert grid.version == 2
+    assert np.array_equal(grid.indptr, expected.indptr)
+    assert np.array_equal(grid.indices, expected.indices)
+
+    if not compact:
+        for node, other in zip(grid.nodes.flat, expected.nodes.flat):
+            assert [grid.index(n) for n in node.neighbors] == \
+                [expected.index(n) for n in other.neighbors]
+
+
+@pytest.mark.parametrize('diagonal', [False, True])
+def test_grid_patch(diagonal):
+    """Patched adjacency rows match a rebuilt adjacency, keep the weights of
+    kept edges and leave the previous arrays and mask untouched
+    """
+
+    rng = np.random.default_rng(int(diagonal))
+    grid = Grid((9, 7), diagonal=diagonal, blocked=rng.random((9, 7)) < 0.3,
+                compact=True)
+    grid.cost[:] = 5
+    grid.set_weights(rng.random(len(grid.indices)))
+
+    for _ in range(20):
+        arrays = grid.blocked, grid.indptr, grid.indices, grid.weights
+        before = [array.copy() for array in arrays]
+        rows = np.repeat(np.arange(63), np.diff(grid.indptr))
+        edges = dict(zip(zip(rows.tolist(), grid.indices.tolist()),
+                         grid.weights.tolist()))
+
+        cells = rng.choice(63, int(rng.integers(1, 4)), replace=False)
+        if rng.random() < 0.5:
+            grid.block(cells.tolist())
+        else:
+            grid.unblock(cells.tolist())
+        expected = Grid((9, 7), diagonal=diagonal, blocked=grid.blocked)
+
+        assert np.array_equal(grid.indptr, expected.indptr)
+        assert np.array_equal(grid.indices, expected.indices)
+        assert all(np.array_equal(a, b) for a, b in zip(before, arrays))
+        for a in range(63):
+            start, stop = grid.indptr[a], grid.indptr[a + 1]
+            for b, w in zip(grid.indices[start:stop].tolist(),
+                            grid.weights[start:stop].tolist()):
+                assert w == edges.get((a, b), 5)
+
+
+def test_grid_raster():
+    """Cell types and path cells are color indices of a single image"""
+
+    codes = list(COLORS)
+    for compact in (True, False):
+        blocked = np.zeros((3, 4), dtype=bool)
+        blocked[1, 1] = True
+        grid = Grid((3, 4), blocked=blocked, compact=compact)
+        grid.set_start((0, 0))
+        grid.set_end((2, 3))
+        path = [grid[0, 0], grid[0, 1], grid[0, 2]]
+        raster = grid.raster(path)
+
+        assert raster.shape == (3, 4)
+        assert raster[1, 1] == codes.index('blocked')
+        assert raster[0, 0] == codes.index('path_start')
+        assert raster[0, 2] == codes.index('path_')
+        assert raster[2, 3] == codes.index('end')
+        assert raster[2, 2] == codes.index('')
+
+
+@pytest.mark.parametrize('compact', [True, False])
+def test_grid_save(tmp_path, compact):
+    """Saved grids load memory-mapped in either mode"""
+
+    grid = Grid((4, 5), diagonal=True, compact=compact)
+    grid.block([(1, 1), (2, 3)])
+    grid.set_array('cost', np.arange(20).reshape(4, 5))
+    grid.set_weights(np.full(grid.indices.shape, 3.0))
+    grid.set_start((0, 0))
+    grid.set_end((3, 4))
+    grid.save(tmp_path / 'grid')
+
+    for mode in (True, False):
+        loaded = Grid.load(tmp_path / 'grid', compact=mode)
+
+        assert loaded.compact == mode and loaded.diagonal
+        assert np.array_equal(loaded.blocked, grid.blocked)
+        assert np.array_equal(loaded.indices, grid.indices)
+        assert np.array_equal(loaded.weights, grid.weights)
+        assert np.array_equal(loaded.as_array('cost'), grid.as_array('cost'))
+        assert np.array_equal(loaded.raster(), grid.raster())
+
+    loaded = Grid.load(tmp_path / 'grid', compact=True)
+
+    assert isinstance(loaded.cost, np.memmap)
+    with pytest.raises(ValueError):
+        loaded.set_array('cost', 1)
+
+    # blocking changes a copy of the read-only mask
+    loaded.unblock((1, 1))
+
+    assert not loaded.blocked[1, 1] and loaded.neighbors(loaded[1, 1])
+    assert Grid.load(tmp_path / 'grid').blocked[1, 1]
+
+    # copy on write keeps the file unchanged
+    loaded = Grid.load(tmp_path / 'grid', mmap_mode='c', compact=True)
+    loaded.set_array('cost', 1)
+
+    assert Grid.load(tmp_path / 'grid').as_array('cost')[0, 1] == 1
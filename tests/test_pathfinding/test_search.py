@@ -1,29 +1,45 @@
 """TODO"""
 
+from concurrent.futures import ThreadPoolExecutor
+from time import sleep
+
 import pytest
-from mlpy.search import BreadthFirst, UniformCost, GreedyBestFirst, \
-    DepthFirst, IterativeDeepening, AStar
+import numpy as np
+from mlpy.types import Node
+from mlpy.search import Graph, Tree, Grid, BreadthFirst, UniformCost, \
+    GreedyBestFirst, DepthFirst, IterativeDeepening, IDAStar, AStar, \
+    AnytimeAStar, SMAStar, JumpPoint, DStarLite, FlowField, ImplicitGraph, \
+    heuristic_field
 
 
 @pytest.fixture(scope='session')
 def node_structures():
-    """TODO"""
-
-    # TODO
-    graph = None
-    graph_start = None
-    graph_end = None
-    tree = None
-    tree_start = None
-    tree_end = None
-    grid = None
-    grid_start = None
-    grid_end = None
+    """Chain-like graph, small tree and empty grid with start and goal nodes
+    further than three expansions apart
+    """
+
+    # graph: chain of ten nodes with a dead end branch and a loop back
+    nodes = [Node() for _ in range(12)]
+    edges = list(zip(nodes[:10], nodes[1:10]))
+    edges += [(nodes[2], nodes[10]), (nodes[10], nodes[11]),
+              (nodes[11], nodes[0])]
+    for a, b in edges:
+        a.neighbors.append(b)
+    graph = Graph(nodes, edges)
+
+    # tree: binary tree of depth three
+    tree_nodes = [Node() for _ in range(15)]
+    for i, node in enumerate(tree_nodes[:7]):
+        node.neighbors = [tree_nodes[2 * i + 1], tree_nodes[2 * i + 2]]
+    tree = Tree(tree_nodes[0])
+
+    # grid: empty 5x5 grid from one corner to the opposite one
+    grid = Grid((5, 5))
 
     return \
-        (graph, graph_start, graph_end), \
-        (tree, tree_start, tree_end), \
-        (grid, grid_start, grid_end)
+        (graph, nodes[0], nodes[9]), \
+        (tree, tree_nodes[0], tree_nodes[13]), \
+        (grid, grid[0, 0], grid[4, 4])
 
 
 # ------------------------------------------------------- Breadth First Search
@@ -186,3 +202,565 @@ def test_a_star(node_structures):
     assert tree_path1
 
     assert grid_path1
+
+
+# ------------------------------------------------------ Memory-bounded Search
+def _weighted_grid(seed):
+    """Random compact grid with random cell costs and no heuristic"""
+
+    rng = np.random.default_rng(seed)
+    grid = Grid((6, 6), diagonal=seed % 2 == 1,
+                blocked=rng.random((6, 6)) < 0.2, compact=True)
+    grid.cost[:] = rng.integers(1, 5, (6, 6))
+    grid.heuristic[:] = 0
+    start, end = (int(i) for i in
+                  rng.choice(np.flatnonzero(~grid.blocked), 2))
+
+    return grid, start, end
+
+
+def _path_cost(grid, path):
+    """Sum of the costs of all entered cells"""
+
+    return sum(grid.cost.flat[cell] for cell in path[1:])
+
+
+def _step(structure, a, b):
+    """Cost of the cheapest move from index a to index b, its edge weight or
+    the cost of the entered cell
+    """
+
+    if structure.weights is None:
+        return structure.cost.item(b)
+
+    start, stop = structure.indptr[a:a + 2].tolist()
+    return min(w for t, w in zip(structure.indices[start:stop].tolist(),
+                                 structure.weights[start:stop].tolist())
+               if t == b)
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_ida_star(seed):
+    """IDA* finds cheapest paths while only storing the current path"""
+
+    grid, start, end = _weighted_grid(seed)
+    depths = []
+
+    ida = IDAStar(structure=grid)
+    ida.callback = lambda s, node: depths.append(len(s.visited))
+    path = ida.find(start, end, max_iters=10**6)
+    reachable = BreadthFirst(structure=grid).find(start, end)
+
+    assert bool(path) == bool(reachable)
+    if path:
+        cheapest = SMAStar(max_nodes=10**6, structure=grid)
+        assert _path_cost(grid, path) == \
+            _path_cost(grid, cheapest.find(start, end, max_iters=10**6))
+        assert max(depths) <= 36
+
+
+def test_iterative_deepening_depth():
+    """Iterative deepening finds shortest paths within its depth limit"""
+
+    grid = Grid((5, 5), compact=True)
+
+    assert len(IterativeDeepening(structure=grid).find(0, 24)) == 9
+    assert not IterativeDeepening(7, structure=grid).find(0, 24)
+    assert IterativeDeepening(8, structure=grid).find(0, 24)
+
+
+def test_iterative_deepening_grid():
+    """Nodes reached again within an iteration are not searched again, so
+    grids with many equally long paths stay within the default budget
+    """
+
+    grid = Grid((8, 8))
+    search = IterativeDeepening()
+
+    assert len(search.find(grid[0, 0], grid[7, 7])) == 15
+    assert search.iterations < 2000
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_sma_star(seed):
+    """SMA* keeps at most its node budget in memory and finds the cheapest
+    path fitting into it
+    """
+
+    grid, start, end = _weighted_grid(seed)
+    optimal = IDAStar(structure=grid).find(start, end, max_iters=10**6)
+    memory = []
+
+    sma = SMAStar(max_nodes=len(optimal) + 4, structure=grid)
+    sma.callback = lambda s, node: memory.append(s.stats['visited'])
+    path = sma.find(start, end, max_iters=10**6)
+
+    assert max(memory) <= sma.max_nodes
+    assert _path_cost(grid, path) == _path_cost(grid, optimal)
+
+    # only paths fitting into memory
+    if len(optimal) > 2:
+        small = SMAStar(max_nodes=len(optimal) - 1, structure=grid)
+        assert len(small.find(start, end, max_iters=10**6)) < len(optimal)
+
+
+# --------------------------------------------------------------- Compact Grid
+@pytest.mark.parametrize('algorithm', [
+    BreadthFirst, UniformCost, GreedyBestFirst, DepthFirst,
+    IterativeDeepening, IDAStar, AStar, SMAStar
+])
+def test_compact_grid(algorithm):
+    """All search algorithms accept compact grids using flat cell indices"""
+
+    blocked = np.zeros((4, 5), dtype=bool)
+    blocked[1:, 2] = True
+    grid = Grid((4, 5), blocked=blocked, compact=True)
+
+    path = algorithm(structure=grid).find(grid[3, 0], grid[3, 4])
+
+    assert path[0] == grid[3, 0]
+    assert path[-1] == grid[3, 4]
+    assert grid[0, 2] in path
+    assert all(isinstance(cell, int) for cell in path)
+    assert all(b in grid.neighbors(a) for a, b in zip(path, path[1:]))
+
+
+# -------------------------------------------------------------- Bidirectional
+@pytest.mark.parametrize('algorithm', [BreadthFirst, AStar])
+def test_bidirectional(algorithm):
+    """Bidirectional searches meet in the middle of a corridor and honor the
+    maximum number of iterations
+    """
+
+    blocked = np.ones((3, 40), dtype=bool)
+    blocked[1] = False
+    grid = Grid((3, 40), blocked=blocked, compact=True)
+    grid.heuristic[1] = np.arange(39, -1, -1)
+    start, end = grid[1, 0], grid[1, 39]
+
+    search = algorithm(structure=grid, bidirectional=True)
+    path = search.find(start, end)
+
+    assert path == list(range(start, end + 1))
+    assert len(search.visited) < 30
+    assert not search.find(start, end, max_iters=10)
+
+
+def test_bidirectional_optimal():
+    """Bidirectional searches find paths as short / cheap as a dijkstra
+    search on a weighted grid
+    """
+
+    rng = np.random.default_rng(1)
+    blocked = rng.random((12, 15)) < 0.25
+    blocked[0, 0] = blocked[11, 14] = False
+    grid = Grid((12, 15), diagonal=True, blocked=blocked, compact=True)
+    grid.cost[...] = rng.integers(1, 10, size=grid.size)
+    grid.heuristic[...] = 0
+    start, end = grid[0, 0], grid[11, 14]
+
+    # reference path costs by exhaustive relaxation
+    costs = {start: 0}
+    changed = True
+    while changed:
+        changed = False
+        for node, cost in list(costs.items()):
+            for child in grid.neighbors(node):
+                new_cost = cost + grid.cost.item(child)
+                if new_cost < costs.get(child, np.inf):
+                    costs[child], changed = new_cost, True
+
+    bfs = BreadthFirst(structure=grid).find(start, end)
+    bibfs = BreadthFirst(structure=grid, bidirectional=True).find(start, end)
+    biast = AStar(structure=grid, bidirectional=True).find(start, end)
+
+    assert len(bibfs) == len(bfs)
+    assert biast[0] == start and biast[-1] == end
+    assert sum(grid.cost.item(n) for n in biast[1:]) == costs[end]
+
+
+@pytest.mark.parametrize('algorithm', [BreadthFirst, AStar])
+def test_bidirectional_directed(algorithm):
+    """Bidirectional searches follow directed edges backwards only through
+    structures providing predecessors
+    """
+
+    # directed cycle, the last node is no neighbor of the first one
+    nodes = [Node() for _ in range(4)]
+    edges = list(zip(nodes, nodes[1:] + nodes[:1]))
+    for a, b in edges:
+        a.neighbors.append(b)
+        a.heuristic = 0
+
+    search = algorithm(Graph(nodes, edges), bidirectional=True)
+
+    assert search.find(nodes[0], nodes[3]) == nodes
+    with pytest.raises(ValueError):
+        algorithm(bidirectional=True).find(nodes[0], nodes[3])
+
+    # one way moves of implicit graphs
+    def moves(x):
+        return [x + 1] if x < 5 else []
+
+    graph = ImplicitGraph(moves)
+    with pytest.raises(ValueError):
+        algorithm(graph, bidirectional=True).find(0, 5)
+
+    graph = ImplicitGraph(moves, predecessors=lambda x: [x - 1] if x else [])
+
+    assert algorithm(graph, bidirectional=True).find(0, 5) == list(range(6))
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_weighted_optimal(seed):
+    """Uniform cost and A star search find the cheapest paths on weighted
+    grids, using edge weights where given
+    """
+
+    grid, start, end = _weighted_grid(seed)
+    if seed % 4 > 1:
+        rng = np.random.default_rng(seed)
+        grid.set_weights(rng.integers(1, 9, len(grid.indices)))
+    expected = FlowField(grid, end).cost(start)
+    scale = None if grid.weights is None else grid.weights.min()
+    grid.set_array('heuristic', heuristic_field(grid, end, scale=scale))
+
+    for search in (UniformCost(grid), AStar(grid),
+                   AStar(grid, bidirectional=True)):
+        path = search.find(start, end, max_iters=10**6)
+        if not np.isfinite(expected):
+            assert not path
+            continue
+
+        weights = [_step(grid, a, b) for a, b in zip(path, path[1:])]
+        assert path[0] == start and path[-1] == end
+        assert sum(weights) == pytest.approx(expected)
+
+
+def test_a_star_reopen():
+    """Expanded nodes are reopened when a cheaper path to them is found"""
+
+    nodes = start, a, b, c, end = [Node() for _ in range(5)]
+    for parent, child in [(start, a), (start, b), (a, c), (b, c), (c, end)]:
+        parent.neighbors.append(child)
+    a.cost, b.cost, c.cost, end.cost = 4, 1, 1, 5
+    for node, heuristic in zip(nodes, [0, 0, 6, 0, 0]):
+        node.heuristic = heuristic
+
+    search = AStar()
+
+    assert search.find(start, end) == [start, b, c, end]
+    assert search.iterations == 6
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_anytime_optimal(seed):
+    """Anytime A star ends with a cheapest path and a bound of one when it
+    has enough time
+    """
+
+    grid, start, end = _weighted_grid(seed)
+    expected = FlowField(grid, end).cost(start)
+    grid.set_array('heuristic', heuristic_field(grid, end))
+    search = AnytimeAStar(grid, weight=5, step=2)
+    path = search.find(start, end, max_iters=10**6)
+
+    if not np.isfinite(expected):
+        assert not path and search.bound == float('inf')
+        return
+
+    assert path[0] == start and path[-1] == end
+    assert _path_cost(grid, path) == pytest.approx(expected)
+    assert search.stats['bound'] == 1
+
+
+def test_anytime_deadline():
+    """Interrupted anytime searches return their best path within the
+    reported bound of the cheapest one
+    """
+
+    rng = np.random.default_rng(0)
+    blocked = rng.random((60, 60)) < 0.3
+    blocked[0, 0] = blocked[-1, -1] = False
+    grid = Grid((60, 60), blocked=blocked, compact=True)
+    grid.cost[:] = rng.integers(1, 4, (60, 60))
+    start, end = grid[0, 0], grid[59, 59]
+    expected = FlowField(grid, end).cost(start)
+    grid.set_array('heuristic', heuristic_field(grid, end))
+
+    search = AnytimeAStar(grid, weight=3, step=0.5)
+    full = search.find(start, end, max_iters=10**6)
+
+    assert _path_cost(grid, full) == pytest.approx(expected)
+    assert search.bound == 1
+
+    # stop within the second search
+    budget = AnytimeAStar(grid, weight=3, step=0.5)
+    first = AnytimeAStar(grid, weight=3, step=5)
+    first.find(start, end, max_iters=10**6)
+    path = budget.find(start, end, max_iters=first.iterations + 10)
+
+    assert path and path[0] == start and path[-1] == end
+    assert 1 <= budget.bound <= 3
+    assert _path_cost(grid, path) <= budget.bound * expected + 1e-9
+
+    assert budget.find(start, end, timeout=0) == []
+    assert budget.bound == float('inf')
+
+
+def test_grid_weights():
+    """Edge weights stay with their edges when cells are blocked"""
+
+    grid = Grid((3, 3), compact=True)
+    grid.cost[:] = 2
+    grid.set_weights(np.arange(len(grid.indices)))
+    weight = _step(grid, grid[2, 0], grid[2, 1])
+    grid.block([grid[1, 1]])
+
+    assert _step(grid, grid[2, 0], grid[2, 1]) == weight
+    grid.unblock([grid[1, 1]])
+
+    assert _step(grid, grid[1, 1], grid[1, 2]) == 2
+    with pytest.raises(ValueError):
+        grid.set_weights(np.ones(3))
+
+
+def test_graph_weights():
+    """Nodes of a weighted graph are searched through the graph, along the
+    cheapest edges
+    """
+
+    rng = np.random.default_rng(0)
+    nodes = [Node() for _ in range(30)]
+    pairs = {tuple(sorted(p)) for p in rng.integers(30, size=(90, 2)).tolist()
+             if p[0] != p[1]}
+    edges = [(nodes[a], nodes[b]) for a, b in sorted(pairs)]
+    for a, b in edges:
+        a.neighbors.append(b)
+        b.neighbors.append(a)
+    for node in nodes:
+        node.heuristic = 0
+    graph = Graph(nodes, edges, directed=False,
+                  edge_weights=rng.integers(1, 9, len(edges)).tolist())
+    start, end = nodes[0], nodes[29]
+    expected = FlowField(graph, end).cost(start)
+
+    for search in (UniformCost(graph), AStar(graph), GreedyBestFirst(graph)):
+        path = search.find(start, end)
+        steps = [_step(graph, graph.index(a), graph.index(b))
+                 for a, b in zip(path, path[1:])]
+
+        assert path[0] is start and path[-1] is end
+        assert all(isinstance(node, Node) for node in path)
+        if not isinstance(search, GreedyBestFirst):
+            assert sum(steps) == pytest.approx(expected)
+
+    # replaced weights are used by the next search
+    graph.edge_weights = [1] * len(edges)
+
+    assert np.all(graph.weights == 1)
+    assert len(UniformCost(graph).find(start, end)) \
+        == len(BreadthFirst().find(start, end))
+
+    # without weights moves cost the node they enter
+    graph.edge_weights = None
+    nodes[5].cost = 3
+
+    assert UniformCost(graph).find(start, end) \
+        == UniformCost().find(start, end)
+
+
+# ---------------------------------------------------------- Jump Point Search
+@pytest.mark.parametrize('compact', [False, True])
+def test_jump_point(compact):
+    """Jump point search finds shortest paths while expanding fewer nodes"""
+
+    rng = np.random.default_rng(2)
+    for _ in range(20):
+        blocked = rng.random((15, 20)) < 0.3
+        blocked[0, 0] = blocked[14, 19] = False
+        grid = Grid((15, 20), diagonal=True, blocked=blocked, compact=compact)
+        start, end = grid[0, 0], grid[14, 19]
+
+        bfs = BreadthFirst(structure=grid if compact else None)
+        jps = JumpPoint(grid)
+        bfs_path = bfs.find(start, end)
+        jps_path = jps.find(start, end)
+
+        assert len(jps_path) == len(bfs_path)
+        assert len(jps.visited) <= len(bfs.visited)
+        if jps_path:
+            assert jps_path[0] == start and jps_path[-1] == end
+            assert all(grid.index(b) in grid.neighbors(grid.index(a))
+                       for a, b in zip(jps_path, jps_path[1:]))
+
+    with pytest.raises(ValueError):
+        JumpPoint(Grid((3, 3)))
+
+
+# ------------------------------------------------------------ Instrumentation
+@pytest.mark.parametrize('algorithm', [
+    BreadthFirst, UniformCost, GreedyBestFirst, DepthFirst,
+    IterativeDeepening, IDAStar, AStar
+])
+def test_instrumentation(algorithm, node_structures):
+    """Searches count expansions, generated nodes and frontier sizes and
+    call the expansion callback
+    """
+
+    _, _, (_, grid_start, grid_end) = node_structures
+    expanded = []
+
+    search = algorithm()
+    search.callback = lambda s, node: expanded.append(node)
+    path = search.find(grid_start, grid_end)
+    stats = search.stats
+
+    assert path
+    assert stats['expanded'] == search.iterations == len(expanded) > 0
+    assert stats['generated'] >= stats['frontier_peak'] > 0
+    assert 0 < stats['visited'] <= 25
+    assert stats['time'] > 0
+
+    search.find(grid_start, grid_end, max_iters=2)
+
+    assert search.iterations <= 2
+
+
+# ------------------------------------------------------------ Implicit Graphs
+DIRECTIONS_4 = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+
+
+def _puzzle():
+    """Sliding puzzle on two rows of three tiles as implicit graph with the
+    Manhattan distance of all tiles as heuristic
+    """
+
+    goal = (1, 2, 3, 4, 5, 0)
+
+    def moves(state):
+        row, col = divmod(state.index(0), 3)
+        for d_row, d_col in DIRECTIONS_4:
+            if 0 <= row + d_row < 2 and 0 <= col + d_col < 3:
+                tiles = list(state)
+                i, j = row * 3 + col, (row + d_row) * 3 + col + d_col
+                tiles[i], tiles[j] = tiles[j], tiles[i]
+                yield tuple(tiles)
+
+    def distance(state):
+        return sum(abs(i // 3 - goal.index(v) // 3)
+                   + abs(i % 3 - goal.index(v) % 3)
+                   for i, v in enumerate(state) if v)
+
+    graph = ImplicitGraph(moves, heuristic=distance, predecessors=moves)
+
+    return graph, (4, 1, 3, 0, 2, 5), goal
+
+
+@pytest.mark.parametrize('search', [
+    BreadthFirst, lambda g: BreadthFirst(g, bidirectional=True),
+    UniformCost, GreedyBestFirst,
+    lambda g: DepthFirst(max_depth=12, structure=g),
+    lambda g: IterativeDeepening(structure=g), IDAStar,
+    AStar, lambda g: AStar(g, bidirectional=True),
+    AnytimeAStar, lambda g: SMAStar(200, structure=g),
+    DStarLite
+])
+def test_implicit_graph(search):
+    """All search algorithms find paths of valid moves in implicit graphs"""
+
+    graph, start, end = _puzzle()
+    search = search(graph)
+    path = search.find(start, end, max_iters=10**5)
+
+    assert path[0] == start and path[-1] == end
+    assert all(b in graph.neighbors(a) for a, b in zip(path, path[1:]))
+    if not isinstance(search, (GreedyBestFirst, DepthFirst)):
+        assert len(path) == 5
+
+
+def test_implicit_graph_lazy():
+    """Searches only generate the states they reach in huge state spaces"""
+
+    def moves(state):
+        x, y = state
+        return [(x + dx, y + dy) for dx, dy in DIRECTIONS_4
+                if 0 <= x + dx < 10**9 and 0 <= y + dy < 10**9]
+
+    graph = ImplicitGraph(moves, heuristic=lambda s: abs(s[0] - 40)
+                          + abs(s[1] - 30), maxsize=1000)
+    search = AStar(graph)
+    path = search.find((0, 0), (40, 30))
+
+    assert len(path) == 71
+    assert graph.misses <= search.stats['visited'] and len(graph) <= 1000
+
+
+# ---------------------------------------------------------- Concurrent Search
+@pytest.mark.parametrize('algorithm', [
+    BreadthFirst, UniformCost, GreedyBestFirst, DepthFirst, AStar
+])
+def test_concurrent(algorithm):
+    """One search instance finds paths in many threads over a shared grid
+    without touching the nodes, each thread keeping its own results
+    """
+
+    rng = np.random.default_rng(0)
+    grid = Grid((20, 20), diagonal=True, blocked=rng.random((20, 20)) < 0.25)
+    free = [grid.cell(i) for i in np.flatnonzero(~grid.blocked)]
+    queries = [tuple(rng.choice(len(free), 2)) for _ in range(64)]
+    infos = [dict(node.info) for node in grid.nodes.flat]
+
+    search = algorithm()
+    expected = [search.find(free[a], free[b], 10**6) for a, b in queries]
+
+    # switch threads on every expansion
+    search.callback = lambda s, node: sleep(0)
+
+    def solve(query):
+        path = search.find(free[query[0]], free[query[1]], 10**6)
+        return path, search.path if path else [], set(search.visited)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(solve, queries))
+
+    for (path, own_path, visited), reference in zip(results, expected):
+        assert path == own_path == reference
+        assert set(path) <= visited
+    assert infos == [node.info for node in grid.nodes.flat]
+
+
+# ------------------------------------------------------------- D* Lite Search
+@pytest.mark.parametrize('compact', [False, True])
+def test_d_star_lite(compact):
+    """D* Lite repairs paths after cells are blocked mid-route with less
+    effort than searching from scratch
+    """
+
+    rng = np.random.default_rng(4)
+    blocked = rng.random((30, 30)) < 0.2
+    blocked[0, 0] = blocked[29, 29] = False
+    grid = Grid((30, 30), diagonal=True, blocked=blocked, compact=compact)
+    start, end = grid[0, 0], grid[29, 29]
+
+    planner = DStarLite(structure=grid if compact else None)
+    bfs = BreadthFirst(structure=grid if compact else None)
+    path = planner.find(start, end)
+    initial = planner.iterations
+
+    assert len(path) == len(bfs.find(start, end))
+
+    # agent moves along the path until cells ahead get blocked
+    position = path[5]
+    changed = grid.block([grid.index(c) for c in path[10:12]])
+    planner.update(changed)
+    repaired = planner.find(position, end)
+
+    assert repaired[0] == position and repaired[-1] == end
+    assert len(repaired) == len(bfs.find(position, end))
+    assert planner.iterations < initial
+
+    # cells become free again
+    planner.update(grid.unblock([grid.index(c) for c in path[10:12]]))
+
+    assert len(planner.find(position, end)) == len(path) - 5
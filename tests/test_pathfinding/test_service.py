@@ -0,0 +1,75 @@
+"""Tests for cooperative searches on an asyncio event loop"""
+
+import asyncio
+
+import pytest
+from mlpy.search import Grid, BreadthFirst, AStar, SearchService, find_async
+
+
+def test_find_async():
+    """Asynchronous searches find the same paths while other coroutines
+    keep running
+    """
+
+    grid = Grid((60, 60), compact=True)
+    start, end = grid[0, 0], grid[59, 59]
+    expected = BreadthFirst(grid).find(start, end, max_iters=10**6)
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0)
+
+    async def main():
+        task = asyncio.create_task(ticker())
+        path = await find_async(BreadthFirst(grid), start, end,
+                                max_iters=10**6, every=64)
+        task.cancel()
+        return path
+
+    assert asyncio.run(main()) == expected
+    assert len(ticks) >= 3600 // 64
+
+
+def test_search_service():
+    """Queries share the loop round robin and can be cancelled or time out"""
+
+    grid = Grid((80, 80), compact=True)
+    search = AStar(grid)
+    short = (grid[0, 0], grid[0, 5])
+    long = (grid[0, 0], grid[79, 79])
+    order = []
+
+    async def query(service, pair, name):
+        path = await service.find(*pair, max_iters=10**6)
+        order.append(name)
+        return path
+
+    async def main():
+        async with SearchService(search, every=16, concurrency=2) as service:
+            paths = await asyncio.gather(query(service, long, 'long'),
+                                         query(service, short, 'short'))
+
+            task = asyncio.create_task(service.find(*long, max_iters=10**6))
+            await asyncio.sleep(0.001)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+            with pytest.raises(TimeoutError):
+                await service.find(*long, max_iters=10**6, timeout=0)
+
+            paths.append(await service.find(*short))
+            assert len(service) == 0
+
+        return paths
+
+    paths = asyncio.run(main())
+
+    assert order == ['short', 'long']
+    assert paths[0] == AStar(grid).find(*long, max_iters=10**6)
+    assert paths[1] == paths[2] == AStar(grid).find(*short)
+
+    with pytest.raises(ValueError):
+        SearchService(search, every=0)